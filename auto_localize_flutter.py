@@ -5,89 +5,2701 @@ Erstellt von Claude - Keine manuelle Nacharbeit nötig!
 
 Features:
 ✅ Extrahiert alle Texte automatisch
-✅ Erstellt en.json & de.json
+✅ Erstellt en.json & eine JSON-Datei pro Zielsprache (--locales)
+✅ Schreibt zusätzlich ARB-Dateien für gen-l10n, wenn l10n.yaml existiert (--no-arb)
+✅ Teilt Locale-Dateien pro Key-Präfix auf, Shards lädt die App erst bei Bedarf (--split-locales, Guards per --rewrite)
 ✅ Aktualisiert pubspec.yaml
 ✅ Erstellt language_provider.dart
 ✅ Modifiziert main.dart
 ✅ Fügt Sprach-Button zur AppBar hinzu
-✅ Integriert Algolia-Index-Wechsel (cards ↔ cards_de)
+✅ Integriert Algolia-Index-Wechsel (cards ↔ cards_<sprache>)
 ✅ Speichert Sprache in SharedPreferences
 ✅ Ersetzt ALLE Algolia-Index-Referenzen
-✅ Aktualisiert app_providers.dart
+✅ Aktualisiert app_providers.dart: eine CardData pro Algolia-Index, Suchergebnisse im LRU-Cache (geprüft auch von verify)
+✅ Ersetzt Texte im Quellcode durch 'key'.tr() (--rewrite)
+✅ Watch-Modus: aktualisiert die Locale-Dateien beim Speichern (--watch)
+✅ Backup jeder geänderten Datei, wiederherstellbar per `restore`
+✅ Eigene Glossare als TSV/JSON: glossaries/{project,domain,locale}/<locale>.tsv (--glossary ORDNER)
+✅ Karten-Dump -> übersetzte NDJSON-Datei pro Algolia-Index, optional gleich hochgeladen (`cards`)
+✅ KI-Requests im Rate-Limit des Accounts, mit Kosten-/Token-Obergrenze (--ai-rpm, --ai-tpm, --ai-budget-usd)
 
 Verwendung:
-    python auto_localize_flutter.py
+    python auto_localize_flutter.py [apply] [projekt-pfad] [--jobs N] [--no-cache] [--locales de,fr] [--dry-run] [--rewrite]
+    python auto_localize_flutter.py extract [projekt-pfad]      # nur en.json
+    python auto_localize_flutter.py extract [projekt-pfad] --list   # Fundstellen mit Quelltextzeile
+    python auto_localize_flutter.py translate [projekt-pfad]    # alle Locale-Dateien, Dart-Code unverändert
+    python auto_localize_flutter.py verify [projekt-pfad]       # Exit-Code 1 bei fehlenden Keys
+    python auto_localize_flutter.py verify [projekt-pfad] --prune   # ungenutzte Keys entfernen
+    python auto_localize_flutter.py translate [projekt-pfad] --watch
+    python auto_localize_flutter.py translate [projekt-pfad] --no-arb   # nur JSON, auch mit l10n.yaml
+    python auto_localize_flutter.py apply [projekt-pfad] --split-locales   # Kern + <sprache>/<präfix>.json
+    python auto_localize_flutter.py restore [projekt-pfad] [--list] [--run ID]   # Backup wiederherstellen
+    python auto_localize_flutter.py translate [projekt-pfad] --ai-rpm 50 --ai-tpm 40000 --ai-budget-usd 2
+    python auto_localize_flutter.py translate [projekt-pfad] --ai-base-url http://127.0.0.1:8080   # z.B. Fake-Server
+    python auto_localize_flutter.py cards [projekt-pfad] --dump karten.json [--upload] [--algolia-url URL]
+    python auto_localize_flutter.py [befehl] [projekt-pfad] --metrics metrics.json [--profile]
+
+Benchmarks (Ordner benchmarks/, aus dem Repo-Root):
+    python -m benchmarks [--only startup|ratelimit|cards|memory|suite]
+    python -m benchmarks --only suite --files 2000 --density 0.5 --duplicates 0.4
+
+Tests (Ordner tests/, mit Offline-Fakes der Anthropic- und Algolia-APIs):
+    python -m pytest tests
 """
 
-import os
-import re
-import json
-from pathlib import Path
-from typing import Dict, List, Tuple
-import anthropic
+import os
+import re
+import shutil
+import json
+import marshal
+import time
+import random
+import hashlib
+import threading
+import tempfile
+from bisect import bisect_left
+from contextlib import contextmanager
+from itertools import chain
+from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+# anthropic, asyncio, http, difflib und concurrent.futures werden erst dort importiert,
+# wo sie gebraucht werden (Start ohne KI bleibt schnell)
+
+# Übersetzbare Texte für den Lexer: erstes Positionsargument dieser Aufrufe
+# bzw. Wert dieser benannten Argumente, jeweils als komplettes Argument
+UI_TEXT_CALLS = ('Text', 'SelectableText', 'Exception')
+UI_NAMED_ARGS = ('hintText', 'labelText', 'helperText', 'errorText', 'tooltip')
+
+# Lexer: Tokens sind nur Kommentare und String-Anfänge (einzeilige Strings ohne
+# Escapes und $ komplett), alles dazwischen überspringt search() in C; der
+# Lookahead gibt der Regex-Engine ein Startzeichen-Set zum Vorspulen. Klammern
+# sind nur innerhalb von ${...} Tokens (für das schließende }), sonst liest sie
+# ein zweiter, enger Durchlauf über den Code zwischen Strings und Kommentaren.
+DART_STRING_TOKEN = r'''(r?(?:'(?!'')[^'\\$\n]*'|"(?!"")[^"\\$\n]*"))|(r?(?:\'\'\'|"""|'|"))'''
+DART_TOKEN = re.compile(r'''(?=[/"'r])(?:(//|/\*)|''' + DART_STRING_TOKEN + ')')
+DART_INTERPOLATION_TOKEN = re.compile(r'''(?=[/"'r(\[{)\]}])(?:(//|/\*)|''' + DART_STRING_TOKEN + r'''|([(\[{])|([)\]}]))''')
+DART_BRACKET = re.compile(r'[(\[{)\]}]')
+DART_STRING_BODY = {
+    ("'", False): re.compile(r"[^'\\$\n]*"),
+    ('"', False): re.compile(r'[^"\\$\n]*'),
+    ("'''", False): re.compile(r"(?:[^'\\$]+|'(?!''))*"),
+    ('"""', False): re.compile(r'(?:[^"\\$]+|"(?!""))*'),
+    ("'", True): re.compile(r"[^'\n]*"),
+    ('"', True): re.compile(r'[^"\n]*'),
+    ("'''", True): re.compile(r"(?:[^']+|'(?!''))*"),
+    ('"""', True): re.compile(r'(?:[^"]+|"(?!""))*'),
+}
+DART_GAP = r'(?:\s|//[^\n]*\n|/\*(?:[^*]|\*(?!/))*\*/)*'
+DART_GAP_MATCH = re.compile(DART_GAP).match
+DART_LOOKBACK = 160
+DART_TR_CALLS = ('.tr(', '.plural(')
+# Funktionsform von easy_localization: tr('key'), plural('key', n)
+DART_TR_FUNCTIONS = ('tr', 'plural')
+DART_IDENT_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$')
+DART_NAMED_ARG_BEFORE = re.compile(r'[(,{]' + DART_GAP + r'([A-Za-z_$][\w$]*)' + DART_GAP + ':' + DART_GAP + r'\Z')
+DART_CALL_BEFORE = re.compile(r'(?<![\w$])([A-Za-z_$][\w$]*)(?:\s*<[^()]*>)?' + DART_GAP + r'\(' + DART_GAP + r'\Z')
+DART_ESCAPE = re.compile(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|[^$])')
+DART_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', 'b': '\b', 'f': '\f', 'v': '\v'}
+
+
+def _skip_back(content: str, pos: int, chars: str = ' \t\n') -> int:
+    while pos and content[pos - 1] in chars:
+        pos -= 1
+    return pos
+
+
+def _argument_context(content: str, start: int) -> Tuple[Optional[str], Optional[str]]:
+    """(aufruf, benanntes argument) vor einem Literal, rückwärts gelesen
+    
+    Schneller Weg ohne Regex; Kommentare oder Generics davor gehen über
+    die Lookback-Regexes.
+    """
+    # Läuft für jedes Literal: _skip_back hier von Hand (ohne Funktionsaufrufe)
+    pos = start
+    while pos and content[pos - 1] in ' \t\n':
+        pos -= 1
+    char = content[pos - 1:pos]
+    if char in ('(', ':'):
+        name_end = pos - 1
+        while name_end and content[name_end - 1] in ' \t\n':
+            name_end -= 1
+        name_start = name_end
+        while name_start and content[name_start - 1] in DART_IDENT_CHARS:
+            name_start -= 1
+        if char == '(':
+            before = content[name_end - 1:name_end]
+        else:
+            before_name = _skip_back(content, name_start)
+            before = content[before_name - 1:before_name]
+        if before not in ('>', '/'):
+            name = content[name_start:name_end]
+            if not name or name[0].isdigit():
+                return None, None
+            if char == '(':
+                return name, None
+            return (None, name) if before in ('(', ',', '{') else (None, None)
+    elif char != '/':
+        return None, None
+    
+    window = max(0, start - DART_LOOKBACK)
+    match = DART_CALL_BEFORE.search(content, window, start)
+    if match:
+        return match.group(1), None
+    match = DART_NAMED_ARG_BEFORE.search(content, window, start)
+    return None, match.group(1) if match else None
+
+
+def _unescape_dart(match) -> str:
+    escape = match.group(1)
+    if escape[0] in 'ux' and len(escape) > 1:
+        return chr(int(escape[1:].strip('{}'), 16))
+    return DART_ESCAPES.get(escape, escape)
+
+
+# $x bzw. ${...} (zwei Klammerebenen reichen für Texte); nur für die Buchstaben-Prüfung
+DART_INTERPOLATION = re.compile(r'\$(?:\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}|[A-Za-z_]\w*)')
+
+
+class DartString(NamedTuple):
+    """Ein String-Literal (benachbarte Literale 'a' 'b' zusammengefasst)"""
+    start: int               # inklusive Präfix r und Anführungszeichen
+    end: int
+    value: str               # Escapes aufgelöst, $x / ${...} / \$ wie im Quelltext
+    interpolated: bool
+    opens: Tuple[int, ...]   # umschließende offene Klammern ( [ {
+    call: Optional[str]      # Aufruf, dessen erstes Positionsargument der String ist
+    named: Optional[str]     # benanntes Argument, dessen Wert der String ist
+    whole: bool              # String ist das komplette Argument (danach , oder ))
+    tr: bool                 # 'key'.tr(...) bzw. 'key'.plural(...)
+
+
+def lex_dart_strings(content: str) -> List[DartString]:
+    """Tokenisiert eine Dart-Datei einmal (linear) und liefert alle String-Literale
+    
+    Kommentare (auch verschachtelte /* */), rohe und dreifache Strings, Escapes
+    und Interpolation ($x, ${...} mit beliebig tiefen Klammern) werden beachtet.
+    Strings innerhalb einer Interpolation werden nicht geliefert.
+    """
+    groups = []   # benachbarte Literale: [start, ende, teile, interpoliert, folgt]
+    skips = []    # (start, ende) von Strings und Kommentaren außerhalb von ${...}
+    modes = []    # offene Strings [quote, raw, start, body_start, interpoliert] bzw. Klammertiefe in ${...}
+    group = None
+    pos = 0
+    n = len(content)
+    search = DART_TOKEN.search
+    search_interpolation = DART_INTERPOLATION_TOKEN.search
+    
+    def add_literal(start, end, body, interpolated):
+        nonlocal group
+        if group is not None:
+            follow = DART_GAP_MATCH(content, group[1]).end()
+            if follow == start:
+                group[1] = end
+                group[2].append(body)
+                group[3] = group[3] or interpolated
+                return
+            group.append(follow)
+            groups.append(group)
+        group = [start, end, [body], interpolated]
+    
+    while pos < n:
+        frame = modes[-1] if modes else None
+        if type(frame) is not list:
+            match = (search_interpolation if modes else search)(content, pos)
+            if match is None:
+                break
+            kind = match.lastindex
+            pos = match.end()
+            if kind == 2:
+                # Einzeiliger String ohne Escapes und $: komplett im Token
+                if not modes:
+                    simple = match.group(2)
+                    add_literal(match.start(), pos, simple[2:-1] if simple[0] == 'r' else simple[1:-1], False)
+                    skips.append((match.start(), pos))
+                continue
+            if kind == 3:
+                quote = match.group(3)
+                raw = quote[0] == 'r'
+                frame = [quote[1:] if raw else quote, raw, match.start(), pos, False]
+                modes.append(frame)
+                # ohne neue Runde direkt in den String
+            elif kind == 1:
+                start = match.start()
+                if match.group(1) == '//':
+                    end = content.find('\n', pos)
+                    pos = n if end == -1 else end
+                else:
+                    # Verschachtelte /* */ per find überspringen
+                    depth = 1
+                    while depth:
+                        close = content.find('*/', pos)
+                        if close == -1:
+                            pos = n
+                            break
+                        nested = content.find('/*', pos, close + 1)
+                        if nested == -1:
+                            depth -= 1
+                            pos = close + 2
+                        else:
+                            depth += 1
+                            pos = nested + 2
+                if not modes:
+                    skips.append((start, pos))
+                continue
+            elif kind == 4:
+                modes[-1] += 1
+                continue
+            else:
+                if modes[-1]:
+                    modes[-1] -= 1
+                elif match.group(5) == '}':
+                    modes.pop()  # Ende von ${...}, zurück in den String
+                continue
+        
+        # Im String: Text bis zum nächsten Sonderzeichen überspringen
+        quote, raw = frame[0], frame[1]
+        pos = DART_STRING_BODY[quote, raw].match(content, pos).end()
+        if pos >= n:
+            break
+        if content.startswith(quote, pos):
+            pos += len(quote)
+            modes.pop()
+            if modes:
+                continue  # String innerhalb einer Interpolation
+            skips.append((frame[2], pos))
+            body = content[frame[3]:pos - len(quote)]
+            if not raw and '\\' in body:
+                body = DART_ESCAPE.sub(_unescape_dart, body)
+            add_literal(frame[2], pos, body, frame[4])
+            continue
+        char = content[pos]
+        if char == '\\':
+            pos += 2
+        elif char == '$':
+            frame[4] = True
+            if content.startswith('${', pos):
+                modes.append(0)
+                pos += 2
+            else:
+                pos += 1
+        else:
+            # Zeilenende in einfachem String: fehlertolerant beenden
+            modes.pop()
+            pos += 1
+            if not modes:
+                skips.append((frame[2], pos))
+    if modes:
+        skips.append((modes[0][2], n))  # offener String bis zum Dateiende
+    
+    if group is not None:
+        group.append(DART_GAP_MATCH(content, group[1]).end())
+        groups.append(group)
+    
+    # Offene Klammern vor jedem Literal: nur Code zwischen Strings und Kommentaren
+    opens_at = {}
+    stack = []
+    code_start = 0
+    for skip_start, skip_end in skips:
+        for bracket in DART_BRACKET.finditer(content, code_start, skip_start):
+            if bracket.group() in '([{':
+                stack.append(bracket.start())
+            elif stack:
+                stack.pop()
+        opens_at[skip_start] = tuple(stack)
+        code_start = skip_end
+    
+    strings = []
+    for start, end, parts, interpolated, follow in groups:
+        call, named = _argument_context(content, start)
+        strings.append(DartString(
+            start, end, ''.join(parts), interpolated, opens_at[start], call, named,
+            content[follow:follow + 1] in (',', ')'), content.startswith(DART_TR_CALLS, follow)
+        ))
+    return strings
+
+
+class DartStringScanner:
+    """Findet übersetzbare Texte mit dem Dart-Lexer (ein Durchlauf pro Datei)"""
+    # v4: tr-Keys mit Zeilennummern, v5: Treffer ohne Quelltextzeile, v6: '$x ...'-Texte,
+    # v7: Treffer mit umschließenden Klammern (für --rewrite), v8: überzählige
+    # schließende Klammern in ${...} beenden die Interpolation nicht mehr
+    VERSION = "8"
+    
+    def __init__(self, calls=UI_TEXT_CALLS, named_args=UI_NAMED_ARGS):
+        self.calls = frozenset(calls)
+        self.named_args = frozenset(named_args)
+        self.has_letter = re.compile(r'[a-zA-Z]')
+        # Ändert sich die Konfiguration oder die Trefferlogik, wird der Extraktions-Cache ungültig
+        self.fingerprint = hashlib.sha1('\n'.join(
+            (self.VERSION,) + tuple(sorted(self.calls)) + tuple(sorted(self.named_args))
+        ).encode('utf-8')).hexdigest()
+    
+    def is_ui_text(self, string: DartString) -> bool:
+        return string.whole and (string.call in self.calls or string.named in self.named_args)
+    
+    def scan(self, content: str) -> Tuple[List[Tuple[str, int, int, int, Tuple[int, ...]]], List[Tuple[str, int]]]:
+        """Liefert ([(text, zeilennummer, start, ende, klammern)], [(tr-key, zeilennummer)])
+        
+        Treffer in Quelltext-Reihenfolge; start/ende umfassen das Literal
+        inklusive Anführungszeichen, klammern sind die Positionen der
+        umschließenden offenen Klammern. Bereits übersetzte Literale
+        ('key'.tr(), tr('key')) landen stattdessen in den tr-keys.
+        """
+        results = []
+        tr_refs = []
+        # Zeilennummern inkrementell (Strings kommen in Quelltext-Reihenfolge)
+        line_num, counted = 1, 0
+        for string in lex_dart_strings(content):
+            if string.tr or string.call in DART_TR_FUNCTIONS:
+                if not string.interpolated:
+                    line_num += content.count('\n', counted, string.start)
+                    counted = string.start
+                    tr_refs.append((string.value, line_num))
+                continue
+            text = string.value
+            # Nur Interpolation ('$name', '${a.b}') ist kein Text
+            visible = DART_INTERPOLATION.sub('', text) if string.interpolated else text
+            if not self.is_ui_text(string) or not self.has_letter.search(visible):
+                continue
+            line_num += content.count('\n', counted, string.start)
+            counted = string.start
+            results.append((text, line_num, string.start, string.end, string.opens))
+        return results, tr_refs
+
+
+_worker_scanner = None
+
+
+def scan_dart_file(path: str, known_digest: str = None):
+    """Scannt eine Datei (auch im Worker-Prozess) und liefert kompakte Treffer
+    
+    Rückgabe: (pfad, inhalts-hash, [treffer, tr-refs]). Stimmt der Hash mit known_digest
+    überein, wird nicht gescannt und treffer ist None.
+    """
+    global _worker_scanner
+    if _worker_scanner is None:
+        _worker_scanner = DartStringScanner()
+    
+    digest, content = read_dart_source(path, known_digest)
+    if content is None:
+        return path, digest, None
+    return path, digest, list(_worker_scanner.scan(content))
+
+
+def read_dart_source(path, known_digest: str = None) -> Tuple[str, Optional[str]]:
+    """(inhalts-hash, inhalt); der Inhalt ist None, wenn der Hash known_digest ist
+    
+    Die Offsets der Extraktion beziehen sich auf diesen Inhalt.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha1(data).hexdigest()
+    if digest == known_digest:
+        return digest, None
+    # Wie open(..., 'r'): Universal Newlines
+    return digest, data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+class ExtractionCache:
+    """Persistenter Extraktions-Cache (.localize_cache/)
+    
+    extract.json enthält pro Datei nur [mtime_ns, größe, sha1]; die Treffer
+    liegen inhaltsadressiert unter hits/<scanner>/<sha1>.json und werden
+    erst beim Zugriff gelesen. Unveränderte Dateien werden gar nicht erst
+    gelesen, und der Speicherbedarf wächst nicht mit der Zahl der Treffer.
+    read_only=True (Dry-Run) nutzt vorhandene Einträge, schreibt aber nichts.
+    """
+    VERSION = 3
+    
+    def __init__(self, cache_dir: Path, fingerprint: str, read_only: bool = False):
+        self.read_only = read_only
+        self.path = cache_dir / "extract.json"
+        self.fingerprint = fingerprint
+        self.hits_root = cache_dir / "hits"
+        self.hits_path = self.hits_root / fingerprint[:16]
+        self.files = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+    
+    def load(self):
+        """Lädt den Index, verwirft ihn bei anderem Scanner oder Format"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == self.VERSION and data.get("fingerprint") == self.fingerprint:
+            self.files = data.get("files", {})
+        else:
+            self.dirty = True
+    
+    def read_hits(self, digest: str):
+        """Treffer zu einem Inhalts-Hash (None, wenn nicht vorhanden)"""
+        try:
+            with open(self.hits_path / f"{digest}.json", 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def lookup(self, rel_path: str, stat: os.stat_result) -> Tuple[Optional[str], bool]:
+        """Liefert (hash, aktuell): aktuell, wenn mtime und Größe passen und Treffer vorliegen"""
+        entry = self.files.get(rel_path)
+        if entry is None:
+            return None, False
+        mtime_ns, size, digest = entry
+        fresh = (mtime_ns == stat.st_mtime_ns and size == stat.st_size
+                 and os.path.exists(self.hits_path / f"{digest}.json"))
+        return digest, fresh
+    
+    def store(self, rel_path: str, stat: os.stat_result, digest: str, hits):
+        """Merkt Metadaten; die Treffer werden sofort (einmal pro Inhalt) geschrieben"""
+        if self.read_only:
+            return
+        self.files[rel_path] = [stat.st_mtime_ns, stat.st_size, digest]
+        self.dirty = True
+        hits_file = self.hits_path / f"{digest}.json"
+        if hits_file.exists():
+            return
+        self.hits_path.mkdir(parents=True, exist_ok=True)
+        tmp_path = hits_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(hits, ensure_ascii=False, separators=(',', ':')))
+        os.replace(tmp_path, hits_file)
+    
+    def save(self, keep: set):
+        """Schreibt den Index (nur bei Änderungen); gelöschte Dateien fliegen raus"""
+        if self.read_only:
+            return
+        if self.files.keys() - keep:
+            self.files = {k: v for k, v in self.files.items() if k in keep}
+            self.dirty = True
+        if not self.dirty:
+            return
+        
+        # json.dumps ohne indent nutzt den C-Encoder
+        data = json.dumps({
+            "version": self.VERSION,
+            "fingerprint": self.fingerprint,
+            "files": self.files,
+        }, ensure_ascii=False, separators=(',', ':'))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+        
+        # Treffer ohne Datei und Treffer älterer Scanner-Versionen aufräumen
+        used = {entry[2] for entry in self.files.values()}
+        if self.hits_root.is_dir():
+            for folder in self.hits_root.iterdir():
+                if folder != self.hits_path:
+                    shutil.rmtree(folder, ignore_errors=True)
+        if self.hits_path.is_dir():
+            for hits_file in self.hits_path.iterdir():
+                if hits_file.stem not in used:
+                    hits_file.unlink()
+
+
+class BackupStore:
+    """Inhaltsadressierte Sicherung (localization_backup/)
+    
+    objects/<sha1>: Originalinhalt jeder überschriebenen Datei, über alle
+    Läufe dedupliziert. runs/<id>.json: pro Lauf die gesicherten Dateien
+    (relativer Pfad -> sha1, null = vom Lauf neu angelegt).
+    """
+    
+    def __init__(self, root: Path, project_root: Path, command: str = None):
+        self.root = root
+        self.project_root = project_root
+        self.objects = root / "objects"
+        self.runs = root / "runs"
+        self.command = command
+        self.run_id = None
+        self.files = {}
+        self.dirty = False
+    
+    def save(self, path: Path):
+        """Sichert den Inhalt von path vor dem ersten Überschreiben in diesem Lauf"""
+        rel_path = os.path.relpath(path, self.project_root).replace(os.sep, '/')
+        if rel_path in self.files:
+            return
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = None
+        digest = None
+        if data is not None:
+            digest = hashlib.sha1(data).hexdigest()
+            blob = self.objects / digest[:2] / digest
+            # Schon gesichert (auch aus früheren Läufen): kein weiteres Schreiben
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = blob.with_name(f".{digest}.{os.getpid()}.tmp")
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, blob)
+        self.files[rel_path] = digest
+        self.dirty = True
+    
+    def flush(self):
+        """Schreibt das Manifest des Laufs (nur wenn etwas gesichert wurde)"""
+        if not self.dirty:
+            return
+        self.runs.mkdir(parents=True, exist_ok=True)
+        if self.run_id is None:
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            self.run_id, suffix = stamp, 1
+            while (self.runs / f"{self.run_id}.json").exists():
+                suffix += 1
+                self.run_id = f"{stamp}-{suffix}"
+        manifest = {
+            "id": self.run_id,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "command": self.command,
+            "files": dict(sorted(self.files.items())),
+        }
+        tmp_path = self.runs / f".{self.run_id}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        os.replace(tmp_path, self.runs / f"{self.run_id}.json")
+        self.dirty = False
+    
+    def list_runs(self) -> List[dict]:
+        """Alle Läufe, ältester zuerst"""
+        manifests = []
+        for path in sorted(self.runs.glob("*.json")) if self.runs.is_dir() else []:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    manifests.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return manifests
+    
+    def load_run(self, run_id: str = None) -> Optional[dict]:
+        """Manifest eines Laufs (ohne run_id: der letzte)"""
+        runs = self.list_runs()
+        if run_id is None:
+            return runs[-1] if runs else None
+        return next((manifest for manifest in runs if manifest.get("id") == run_id), None)
+    
+    def read_blob(self, digest: str) -> bytes:
+        with open(self.objects / digest[:2] / digest, 'rb') as f:
+            return f.read()
+
+
+class TranslationMemory:
+    """Translation Memory als Append-only-JSONL
+    
+    Schlüssel ist (Originaltext, Ziel-Locale, Modell). Einträge aus den
+    vorhandenen Locale-Dateien laufen unter dem Modell SEED_MODEL und
+    gelten für jedes Modell.
+    """
+    SEED_MODEL = "assets"
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def load(self):
+        """Liest alle Einträge; kaputte Zeilen (z.B. abgebrochener Schreibvorgang) werden übersprungen"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self.entries[(entry["source"], entry["locale"], entry["model"])] = entry["target"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except OSError:
+            pass
+    
+    def seed(self, source: Dict[str, str], target: Dict[str, str], locale: str):
+        """Übernimmt vorhandene Übersetzungen (gleicher Key, Text != Original)"""
+        seeded = 0
+        for key, text in source.items():
+            translated = target.get(key)
+            if isinstance(text, str) and isinstance(translated, str) and translated != text:
+                self.entries.setdefault((text, locale, self.SEED_MODEL), translated)
+                seeded += 1
+        return seeded
+    
+    def get(self, source: str, locale: str, model: str) -> Optional[str]:
+        translated = self.entries.get((source, locale, model))
+        if translated is None:
+            translated = self.entries.get((source, locale, self.SEED_MODEL))
+        if translated is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return translated
+    
+    def add(self, translations: Dict[str, str], locale: str, model: str):
+        """Speichert neue Übersetzungen sofort (Append)"""
+        if not translations:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for source, target in translations.items():
+                self.entries[(source, locale, model)] = target
+                f.write(json.dumps({
+                    "source": source, "locale": locale, "model": model, "target": target,
+                }, ensure_ascii=False) + '\n')
+
+
+def iter_locale_json(translations: Dict[str, str], nested: bool = False, minify: bool = False):
+    """Erzeugt eine Locale-Datei stückweise mit sortierten Keys (stabile Diffs)
+    
+    nested=True schreibt "login.email" als {"login": {"email": ...}},
+    minify=True ohne Einrückung und Zeilenumbrüche.
+    """
+    newline = '' if minify else '\n'
+    colon = ':' if minify else ': '
+    
+    def indent(depth: int) -> str:
+        return '' if minify else '  ' * depth
+    
+    # Nach Key-Teilen sortiert liegen alle Keys einer Gruppe direkt hintereinander
+    keys = sorted(translations, key=(lambda k: k.split('.')) if nested else None)
+    
+    yield '{'
+    open_groups = []   # aktuell geöffnete Gruppen
+    first = [True]     # pro Tiefe: noch kein Eintrag geschrieben
+    last_leaf = [None]  # pro Tiefe: zuletzt geschriebener Text-Key
+    for key in keys:
+        parts = key.split('.') if nested else [key]
+        path, leaf = parts[:-1], parts[-1]
+        
+        common = 0
+        while common < min(len(open_groups), len(path)) and open_groups[common] == path[common]:
+            common += 1
+        while len(open_groups) > common:
+            open_groups.pop()
+            first.pop()
+            last_leaf.pop()
+            yield newline + indent(len(open_groups) + 1) + '}'
+        
+        for name in path[common:]:
+            depth = len(open_groups)
+            if last_leaf[depth] == name:
+                raise ValueError(f"Nested JSON nicht möglich: '{name}' ist Text und Gruppe zugleich ({key})")
+            yield ('' if first[depth] else ',') + newline + indent(depth + 1) \
+                + json.dumps(name, ensure_ascii=False) + colon + '{'
+            first[depth] = False
+            open_groups.append(name)
+            first.append(True)
+            last_leaf.append(None)
+        
+        depth = len(open_groups)
+        yield ('' if first[depth] else ',') + newline + indent(depth + 1) \
+            + json.dumps(leaf, ensure_ascii=False) + colon + json.dumps(translations[key], ensure_ascii=False)
+        first[depth] = False
+        last_leaf[depth] = leaf
+    
+    while open_groups:
+        open_groups.pop()
+        yield newline + indent(len(open_groups) + 1) + '}'
+    yield '}' if first[0] else newline + '}'
+
+
+class LocaleLines:
+    """Flache Locale-Datei als sortierte, fertig kodierte Zeilen
+    
+    Für den Watch-Modus: ein geänderter Key kostet ein bisect und eine Zeile
+    json.dumps statt die ganze Datei neu zu kodieren. text() ist identisch
+    mit iter_locale_json(nested=False).
+    """
+    
+    def __init__(self, translations: Dict[str, str], minify: bool = False):
+        self.minify = minify
+        self.keys = sorted(translations)
+        self.lines = [self._encode(key, translations[key]) for key in self.keys]
+    
+    def _encode(self, key: str, value: str) -> str:
+        if self.minify:
+            return json.dumps(key, ensure_ascii=False) + ':' + json.dumps(value, ensure_ascii=False)
+        return '  ' + json.dumps(key, ensure_ascii=False) + ': ' + json.dumps(value, ensure_ascii=False)
+    
+    def set(self, key: str, value: str):
+        index = bisect_left(self.keys, key)
+        line = self._encode(key, value)
+        if index < len(self.keys) and self.keys[index] == key:
+            self.lines[index] = line
+        else:
+            self.keys.insert(index, key)
+            self.lines.insert(index, line)
+    
+    def remove(self, key: str):
+        index = bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            del self.keys[index]
+            del self.lines[index]
+    
+    def text(self) -> str:
+        if not self.lines:
+            return '{}'
+        if self.minify:
+            return '{' + ','.join(self.lines) + '}'
+        return '{\n' + ',\n'.join(self.lines) + '\n}'
+
+
+def flatten_locale_json(data: dict, prefix: str = "") -> Dict[str, str]:
+    """Macht aus verschachteltem Locale-JSON wieder flache "a.b"-Keys"""
+    flat = {}
+    for key, value in data.items():
+        full_key = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_locale_json(value, f"{full_key}."))
+        else:
+            flat[full_key] = value
+    return flat
+
+
+# Aufgeteilte Locale-Dateien (--split-locales): diese Präfixe braucht schon der
+# erste Frame (AppBar, Sprachwechsel, allgemeine Texte) und bleiben in <locale>.json;
+# jedes andere Präfix aus generate_key wird zu <locale>/<präfix>.json
+LOCALE_CORE_PREFIXES = frozenset(("general", "app", "button", "label", "hint", "error", "language"))
+LOCALE_SHARD_NAME = re.compile(r'[a-z][a-z0-9_]*')
+LOCALE_MANIFEST = "manifest.json"
+
+
+def locale_shard(key: str) -> Optional[str]:
+    """Shard eines Keys (sein Präfix) oder None für den Kern"""
+    prefix, dot, _ = key.partition('.')
+    if not dot or prefix in LOCALE_CORE_PREFIXES or not LOCALE_SHARD_NAME.fullmatch(prefix):
+        return None
+    return prefix
+
+
+def split_locale(translations: Dict[str, str],
+                 pinned: Iterable[str] = ()) -> Tuple[Dict[str, str], Dict[str, Dict[str, str]]]:
+    """Teilt Locale-Einträge in (Kern, shard -> Einträge); pinned-Keys bleiben im Kern"""
+    pinned = set(pinned)
+    core, shards = {}, {}
+    for key, value in translations.items():
+        shard = locale_shard(key)
+        if shard is None or key in pinned:
+            core[key] = value
+        else:
+            shards.setdefault(shard, {})[key] = value
+    return core, shards
+
+
+# gen-l10n (Flutter): l10n.yaml im Projekt oder wie hier unter lib/
+L10N_CONFIG_FILES = ("l10n.yaml", "lib/l10n.yaml")
+# Namen, die als Getter/Methode in AppLocalizations nicht gehen
+ARB_RESERVED = frozenset("""
+    abstract as assert async await break case catch class const continue covariant default deferred do
+    dynamic else enum export extends extension external factory false final finally for Function get hide
+    if implements import in interface is late library mixin new null of on operator part required rethrow
+    return set show static super switch sync this throw true try typedef var void when while with yield
+    delegate localeName localizationsDelegates supportedLocales
+""".split())
+DART_IDENTIFIER = re.compile(r'[A-Za-z_]\w*')
+DART_MEMBER_CHAIN = re.compile(r'[A-Za-z_]\w*(?:\??\.[A-Za-z_]\w*)*')
+
+
+def read_l10n_config(project_root: Path) -> Optional[Dict[str, str]]:
+    """Liest die flachen "key: value"-Einträge der l10n.yaml (None: kein gen-l10n)"""
+    for name in L10N_CONFIG_FILES:
+        try:
+            with open(project_root / name, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            continue
+        config = {}
+        for line in lines:
+            key, sep, value = line.split('#', 1)[0].partition(':')
+            if sep and key.strip() and not key.startswith((' ', '\t')):
+                config[key.strip()] = value.strip().strip('\'"')
+        return config
+    return None
+
+
+def dart_identifier(words: List[str], fallback: str = "key") -> str:
+    """lowerCamelCase-Bezeichner aus Wörtern (ohne Ziffer am Anfang, ohne reservierte Namen)"""
+    words = [w for w in words if w]
+    if not words:
+        return fallback
+    name = words[0][:1].lower() + words[0][1:] + ''.join(w[:1].upper() + w[1:] for w in words[1:])
+    if name[0].isdigit():
+        name = fallback + name
+    return name + "Text" if name in ARB_RESERVED else name
+
+
+def arb_identifiers(keys: Iterable[str]) -> Dict[str, str]:
+    """Eindeutige ARB-Namen für Locale-Keys: "login.email_address" -> "loginEmailAddress"
+    
+    Kollisionen bekommen in Key-Reihenfolge die Endungen 2, 3, ...
+    """
+    names = {}
+    used = set()
+    for key in sorted(keys):
+        base = dart_identifier(re.split(r'[^A-Za-z0-9]+', key))
+        name, n = base, 2
+        while name in used:
+            name, n = f"{base}{n}", n + 1
+        used.add(name)
+        names[key] = name
+    return names
+
+
+def dart_to_icu(text: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    """Text mit Dart-Interpolation als ICU-Nachricht: "Hi ${user.name}" -> ("Hi {userName}", {userName: user.name})
+    
+    Gleiche Ausdrücke teilen sich einen Platzhalter. None, wenn der Text
+    geschweifte Klammern außerhalb einer Interpolation enthält (ohne
+    use-escaping in l10n.yaml nicht darstellbar).
+    """
+    parts = []
+    placeholders = {}  # name -> Dart-Ausdruck
+    names = {}         # Dart-Ausdruck -> name
+    pos, n = 0, len(text)
+    while pos < n:
+        char = text[pos]
+        if text.startswith('\\$', pos):
+            parts.append('$')
+            pos += 2
+            continue
+        if char in '{}':
+            return None
+        if char != '$':
+            parts.append(char)
+            pos += 1
+            continue
+        if text.startswith('${', pos):
+            depth, end = 1, pos + 2
+            while end < n and depth:
+                depth += {'{': 1, '}': -1}.get(text[end], 0)
+                end += 1
+            if depth:
+                return None
+            expression = text[pos + 2:end - 1].strip()
+        else:
+            match = DART_IDENTIFIER.match(text, pos + 1)
+            if match is None:
+                parts.append('$')
+                pos += 1
+                continue
+            expression, end = match.group(), match.end()
+        pos = end
+        name = names.get(expression)
+        if name is None:
+            words = re.split(r'\??\.', expression) if DART_MEMBER_CHAIN.fullmatch(expression) else []
+            if words[:1] in (["widget"], ["this"]) and len(words) > 1:
+                words = words[1:]
+            base = dart_identifier([w.strip('_') for w in words], fallback="value")
+            name, count = base, 2
+            while name in placeholders:
+                name, count = f"{base}{count}", count + 1
+            names[expression] = name
+            placeholders[name] = expression
+        parts.append('{' + name + '}')
+    return ''.join(parts), placeholders
+
+
+def arb_file_name(template: str, locale: str) -> str:
+    """Dateiname pro Sprache nach dem Muster der Vorlage (app_en.arb -> app_de.arb)"""
+    stem = template[:-len(".arb")] if template.endswith(".arb") else template
+    prefix = stem[:-len(SOURCE_LOCALE)] if stem.endswith(SOURCE_LOCALE) else stem + "_"
+    return f"{prefix}{locale}.arb"
+
+
+def build_arb(translations: Dict[str, Dict[str, str]], locales: List[str],
+              names: Dict[str, str]) -> Tuple[Dict[str, dict], List[str]]:
+    """ARB-Inhalte pro Sprache aus den Locale-Einträgen (key -> text)
+    
+    Die Quellsprache ist die Vorlage mit "@<name>"-Metadaten für Platzhalter.
+    Übersetzungen, deren Platzhalter nicht zur Vorlage passen, fehlen in
+    ihrer Datei (gen-l10n nimmt dann den Text der Vorlage). Liefert
+    (sprache -> ARB, Keys ohne ICU-Darstellung).
+    """
+    source = translations[SOURCE_LOCALE]
+    template = {"@@locale": SOURCE_LOCALE}
+    messages = {}  # key -> (name, platzhalter)
+    skipped = []
+    for key in sorted(source, key=names.get):
+        converted = dart_to_icu(source[key])
+        if converted is None:
+            skipped.append(key)
+            continue
+        message, placeholders = converted
+        name = names[key]
+        template[name] = message
+        if placeholders:
+            template["@" + name] = {
+                "description": f"Dart: {source[key]}",
+                "placeholders": {placeholder: {"type": "Object"} for placeholder in placeholders},
+            }
+        messages[key] = (name, set(placeholders))
+    
+    arbs = {SOURCE_LOCALE: template}
+    for locale in locales:
+        if locale == SOURCE_LOCALE:
+            continue
+        arb = {"@@locale": locale}
+        for key, (name, placeholders) in messages.items():
+            converted = dart_to_icu(translations[locale].get(key, source[key]))
+            if converted is not None and set(converted[1]) == placeholders:
+                arb[name] = converted[0]
+        arbs[locale] = arb
+    return arbs, skipped
+
+
+def unique_texts(hits: Iterable[Tuple]) -> Iterator[Tuple[str, str]]:
+    """Dedup-Stufe: (text, kontext) jedes Texts einmal, Kontext vom ersten Vorkommen
+    
+    Gemerkt werden nur 16-Byte-Hashes der Texte, nicht die Treffer selbst.
+    """
+    seen = set()
+    for hit in hits:
+        digest = hashlib.blake2b(hit[1].encode('utf-8'), digest_size=16).digest()
+        if digest not in seen:
+            seen.add(digest)
+            yield hit[1], hit[0].stem
+
+
+class KeyIndex:
+    """Key-Vergabe mit Hash-Index in beide Richtungen
+    
+    Bestehende Keys (aus en.json) werden wiederverwendet. Bei Kollisionen
+    bekommt der Key einen kurzen Inhalts-Hash als Suffix, damit das
+    Ergebnis nicht von der Scan-Reihenfolge abhängt.
+    """
+    
+    def __init__(self):
+        self.key_to_text = {}
+        self.text_to_key = {}
+        self.existing = {}  # text -> key aus dem letzten Lauf
+    
+    def load_existing(self, translations: Dict[str, str], skip=()):
+        """Merkt sich Keys des letzten Laufs; bei mehreren Keys pro Text gewinnt der kleinste"""
+        for key in sorted(translations):
+            text = translations[key]
+            if key not in skip and isinstance(text, str):
+                self.existing.setdefault(text, key)
+    
+    def reserve(self, key: str, text: str):
+        """Belegt einen Key fest (z.B. spezielle Keys), ohne den Text zu binden"""
+        self.key_to_text[key] = text
+    
+    def reuse(self, text: str) -> Optional[str]:
+        """Vergibt den Key aus dem letzten Lauf, falls er noch frei ist"""
+        key = self.existing.get(text)
+        if key is None or key in self.key_to_text:
+            return None
+        self.key_to_text[key] = text
+        self.text_to_key[text] = key
+        return key
+    
+    def assign(self, text: str, base_key: str) -> str:
+        """Vergibt base_key oder bei Kollision base_key_<hash>"""
+        key = self.text_to_key.get(text)
+        if key is not None:
+            return key
+        
+        key = base_key
+        digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        length = 6
+        while self.key_to_text.get(key, text) != text:
+            key = f"{base_key}_{digest[:length]}"
+            length += 2
+        self.key_to_text[key] = text
+        self.text_to_key[text] = key
+        return key
+
+
+# Rewrite: const vor einem Konstruktor / einer Literal-Klammer bzw. in einer
+# const-Deklaration ("static const x = [" / "const title = Text(")
+CONST_BEFORE_OPEN = re.compile(
+    r'\bconst(\s+)(?:[A-Za-z_$][\w$]*(?:\s*\.\s*[A-Za-z_$][\w$]*)*)?\s*(?:<[^;{}()]*>)?\s*\Z'
+)
+CONST_DECLARATION = re.compile(
+    r'\b(const)\s+(?:[\w$<>?,]+\s+)*?[A-Za-z_$][\w$]*\s*=\s*'
+    r'(?:[A-Za-z_$][\w$]*(?:\s*\.\s*[A-Za-z_$][\w$]*)*)?\s*(?:<[^;{}()]*>)?\s*\Z'
+)
+CONST_LOOKBEHIND = 300
+
+
+def const_edits(content: str, opens: List[int], memo: Dict[int, tuple]) -> List[Tuple[int, int, str]]:
+    """Edits, die jedes const entfernen, das eine dieser Klammern umschließt"""
+    edits = []
+    for open_pos in opens:
+        if open_pos not in memo:
+            window_start = max(0, open_pos - CONST_LOOKBEHIND)
+            window = content[window_start:open_pos]
+            edit = None
+            match = CONST_BEFORE_OPEN.search(window)
+            if match:
+                # "const " entfernen
+                edit = (window_start + match.start(), window_start + match.end(1), '')
+            else:
+                match = CONST_DECLARATION.search(window)
+                if match:
+                    # const-Variable wird final
+                    edit = (window_start + match.start(1), window_start + match.end(1), 'final')
+            memo[open_pos] = edit
+        if memo[open_pos] is not None:
+            edits.append(memo[open_pos])
+    return edits
+
+
+def splice(content: str, edits: List[Tuple[int, int, str]]) -> str:
+    """Wendet alle Edits (start, ende, ersatz) in einem Durchlauf an"""
+    parts = []
+    pos = 0
+    for start, end, replacement in sorted(set(edits)):
+        if start < pos:
+            continue  # überlappend: erster Edit gewinnt
+        parts.append(content[pos:start])
+        parts.append(replacement)
+        pos = end
+    parts.append(content[pos:])
+    return ''.join(parts)
+
+
+EASY_LOCALIZATION_IMPORT = "import 'package:easy_localization/easy_localization.dart';"
+LOCALE_SHARDS_IMPORT = "import 'package:tcg_app/class/locale_shards.dart';"
+
+# Anforderung eines Shards im Dart-Code: Guard in build() oder LocaleShards-Widget.
+# Keys eines Shards dürfen nur aus <locale>.json heraus, wenn jede Klasse, die sie
+# nutzt, den Shard in ihrer build() anfordert (bzw. die Datei per LocaleShards) -
+# sonst zeigt der erste Frame den Key statt des Texts
+LOCALE_SHARD_REQUEST = re.compile(r'\b(?:localeShardsReady\(\s*\w+\s*,|LocaleShards\(\s*shards:)\s*const\s*\[([^\]]*)\]')
+BUILD_METHOD = re.compile(
+    r'^([ \t]*)Widget build\(\s*BuildContext (\w+)[^)]*\)\s*\{'
+    r'(?P<guard>\n[ \t]*if \(!localeShardsReady\(\w+, const \[(?P<shards>[^\]]*)\]\)\) return const SizedBox\.shrink\(\);)?',
+    re.MULTILINE)
+# Kopf einer Klasse am Zeilenanfang bis zur { des Rumpfs. Dart kennt keine
+# verschachtelten Klassen: eine Methode gehört zum letzten Kopf davor
+CLASS_DECLARATION = re.compile(
+    r'^(?:(?:abstract|base|final|sealed|interface|mixin)[ \t]+)*(?:class|mixin|extension)[ \t]+\w+[^{;]*\{',
+    re.MULTILINE)
+
+
+def dart_import_edit(content: str, line: str) -> Optional[Tuple[int, int, str]]:
+    """Edit, der line nach dem letzten Import einfügt (None: schon da oder part-Datei)"""
+    if line in content or re.search(r'^part of\b', content, re.MULTILINE):
+        return None
+    imports = list(re.finditer(r'^import .*?;$', content, re.MULTILINE))
+    if imports:
+        return imports[-1].end(), imports[-1].end(), '\n' + line
+    return 0, 0, line + '\n\n'
+
+
+def class_bodies(content: str) -> List[int]:
+    """Positionen der { aller Klassenrümpfe, aufsteigend"""
+    return [match.end() - 1 for match in CLASS_DECLARATION.finditer(content)]
+
+
+def enclosing_class(bodies: List[int], pos: int) -> Optional[int]:
+    """Rumpf (Position der {) der Klasse, in der pos liegt (None: vor der ersten Klasse)"""
+    index = bisect_left(bodies, pos)
+    return bodies[index - 1] if index else None
+
+
+def class_key_usages(content: str, keys: Iterable[str]) -> Dict[Optional[int], Set[str]]:
+    """Klassenrumpf -> dort per 'key'.tr() bzw. tr('key') genutzte Keys aus keys
+    
+    Die äußerste umschließende Klammer eines Strings ist der Rumpf seiner
+    Klasse; None sammelt Keys außerhalb von Klassen (z.B. Top-Level-Funktionen).
+    """
+    keys = set(keys)
+    bodies = set(class_bodies(content))
+    usages = {}
+    for string in lex_dart_strings(content):
+        if (string.tr or string.call in DART_TR_FUNCTIONS) and string.value in keys:
+            body = string.opens[0] if string.opens and string.opens[0] in bodies else None
+            usages.setdefault(body, set()).add(string.value)
+    return usages
+
+
+def unrequested_shard_keys(content: str, keys: Iterable[str]) -> Set[str]:
+    """Keys mit Shard, die nicht überall ein Guard in build() ihrer Klasse oder ein LocaleShards der Datei lädt
+    
+    Keys, die im Inhalt nicht per .tr() vorkommen, gelten als nicht angefordert.
+    """
+    keys = {key for key in keys if locale_shard(key) is not None}
+    bodies = class_bodies(content)
+    widget = set()   # LocaleShards(...) deckt die ganze Datei ab
+    guarded = {}     # klassenrumpf -> shards aus localeShardsReady()
+    for match in LOCALE_SHARD_REQUEST.finditer(content):
+        names = set(re.findall(r'''['"]([^'"]*)['"]''', match.group(1)))
+        if match.group().startswith('LocaleShards'):
+            widget |= names
+        else:
+            guarded.setdefault(enclosing_class(bodies, match.start()), set()).update(names)
+    usages = class_key_usages(content, keys)
+    missing = keys - set().union(*usages.values())
+    for body, used in usages.items():
+        requested = widget | guarded.get(body, set())
+        missing.update(key for key in used if locale_shard(key) not in requested)
+    return missing
+
+
+def guard_build_methods(content: str, keys: Iterable[str]) -> Tuple[str, int]:
+    """Setzt an den Anfang von build() jeder Klasse, die Keys mit Shard nutzt, einen Guard
+    
+    Der Guard lädt die Shards genau dieser Keys; bis sie geladen sind, baut
+    das Widget nichts (SizedBox.shrink), danach neu. Ein vorhandener Guard
+    wird um fehlende Shards ergänzt; Klassen ohne solche Keys, Pfeil-Methoden
+    und part-Dateien (Import gehört in die Bibliothek) bleiben unverändert.
+    Liefert (neuer Inhalt, Anzahl build()-Methoden mit Guard).
+    """
+    if re.search(r'^part of\b', content, re.MULTILINE):
+        return content, 0
+    usages = class_key_usages(content, keys)
+    bodies = class_bodies(content)
+    edits = []
+    count = 0
+    for match in BUILD_METHOD.finditer(content):
+        names = {locale_shard(key) for key in usages.get(enclosing_class(bodies, match.start()), ())} - {None}
+        if not names:
+            continue
+        if match.group('guard'):
+            names.update(re.findall(r"'([^']*)'", match.group('shards')))
+        listed = ", ".join(f"'{name}'" for name in sorted(names))
+        guard = (f"\n{match.group(1)}  if (!localeShardsReady({match.group(2)}, const [{listed}])) "
+                 f"return const SizedBox.shrink();")
+        start = match.start('guard') if match.group('guard') else match.end()
+        edits.append((start, match.end(), guard))
+        count += 1
+    if not count:
+        return content, 0
+    edit = dart_import_edit(content, LOCALE_SHARDS_IMPORT)
+    if edit:
+        edits.append(edit)
+    return splice(content, edits), count
+
+
+def rewrite_dart_source(content: str, sites: Dict[Tuple[int, int, Tuple[int, ...]], str],
+                        keys: Dict[str, str]) -> Tuple[str, int]:
+    """Ersetzt Literale durch 'key'.tr() und entfernt ungültig gewordene consts
+    
+    sites: (start, ende, klammern) -> text aus der Extraktion genau dieses
+    Inhalts (der Aufrufer prüft den Hash); gelext wird nicht noch einmal.
+    Liefert (neuer Inhalt, Anzahl).
+    """
+    edits = []
+    memo = {}
+    count = 0
+    for (start, end, opens), text in sorted(sites.items()):
+        key = keys.get(text)
+        # Interpolierte Strings ($x) bleiben stehen
+        if key is None or '$' in text:
+            continue
+        edits.append((start, end, f"'{key}'.tr()"))
+        edits.extend(const_edits(content, opens, memo))
+        count += 1
+    if not count:
+        return content, 0
+    
+    edit = dart_import_edit(content, EASY_LOCALIZATION_IMPORT)
+    if edit:
+        edits.append(edit)
+    
+    return splice(content, edits), count
+
+
+# CardData-Verdrahtung in app_providers.dart: Algolia-Suchen, deren Ergebnisse
+# pro Index im LRU-Cache landen (language_provider.dart), und dessen Größe
+CARD_SEARCH_METHODS = ("searchWithQueryAndFilters", "searchWithFilters", "ergebniseAnzeigen")
+CARD_SEARCH_CACHE_SIZE = 32
+# Caches in CardData, deren Inhalt vom Index (also der Sprache) abhängt, und der
+# Zeitstempel, mit dem clearAllCaches() sie invalidiert
+CARD_DATA_INDEX_CACHES = ("_searchResultsCache", "_filterResultsCache", "_facetValuesCache",
+                          "_tcgBannlistCache", "_ocgBannlistCache", "_lastCacheClear")
+CARD_SEARCH_CALL = re.compile(r'await cardData\.(' + '|'.join(CARD_SEARCH_METHODS) + r')(\()')
+CACHED_CARD_SEARCH = re.compile(r'await cachedCardSearch(\()')
+CARD_DATA_PROVIDER = re.compile(r'final cardDataProvider = Provider<CardData>(\()')
+CARD_DATA_PROVIDER_CODE = """final cardDataProvider = Provider<CardData>((ref) {
+  final algoliaIndex = ref.watch(algoliaIndexProvider);
+  return ref.watch(cardDataForIndexProvider(algoliaIndex));
+});"""
+LANGUAGE_PROVIDER_IMPORT = "import 'package:tcg_app/providers/language_provider.dart';"
+
+
+def dart_call_arguments(content: str, open_pos: int,
+                        string_ends: Dict[int, int] = None) -> Optional[Tuple[int, List[str]]]:
+    """Argumente des Aufrufs ab der Klammer bei open_pos: (ende hinter der schließenden, [argument, ...])
+    
+    string_ends: start -> ende aller String-Literale, deren Klammern und
+    Kommas nicht zählen (Standard: content wird dafür gelext).
+    """
+    if string_ends is None:
+        string_ends = {string.start: string.end for string in lex_dart_strings(content)}
+    arguments = []
+    start = pos = open_pos + 1
+    depth = 1
+    while pos < len(content):
+        if pos in string_ends:
+            pos = string_ends[pos]
+            continue
+        char = content[pos]
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+            if depth == 0:
+                arguments.append(content[start:pos])
+                return pos + 1, [argument.strip() for argument in arguments if argument.strip()]
+        elif char == ',' and depth == 1:
+            arguments.append(content[start:pos])
+            start = pos + 1
+        pos += 1
+    return None
+
+
+def card_search_key(method: str, arguments: List[str]) -> List[str]:
+    """Cache-Key einer Suche: Methodenname + alle Argument-Ausdrücke (ohne Namen)"""
+    values = [re.sub(r'^[A-Za-z_]\w*\s*:(?!:)\s*', '', argument, count=1) for argument in arguments]
+    return [f"'{method}'"] + [' '.join(value.split()) for value in values]
+
+
+def cache_card_searches(content: str) -> Tuple[str, int]:
+    """Leitet jede Algolia-Suche über cachedCardSearch (Key aus denselben Argumenten)"""
+    string_ends = {string.start: string.end for string in lex_dart_strings(content)}
+    edits = []
+    for match in CARD_SEARCH_CALL.finditer(content):
+        call = dart_call_arguments(content, match.start(2), string_ends)
+        if call is None:
+            continue
+        end, arguments = call
+        line_start = content.rfind('\n', 0, match.start()) + 1
+        indent = re.match(r' *', content[line_start:]).group() + '  '
+        key = ''.join(f"\n{indent}{value}," for value in card_search_key(match.group(1), arguments))
+        edits.append((match.start(), match.start(2) - len(f"cardData.{match.group(1)}"),
+                      f"await cachedCardSearch(ref, [{key}\n{indent[:-2]}], () => "))
+        edits.append((end, end, ")"))
+    return splice(content, edits), len(edits) // 2
+
+
+def check_app_providers(content: str) -> List[str]:
+    """Statische Prüfung der generierten CardData-Verdrahtung in app_providers.dart
+    
+    Liefert die Probleme (leer = in Ordnung): CardData nur über
+    cardDataForIndexProvider, jede Algolia-Suche über cachedCardSearch und
+    deren Key aus genau den Argumenten der Suche (sonst teilen sich
+    verschiedene Suchen ein Ergebnis).
+    """
+    def line(pos: int) -> int:
+        return content.count('\n', 0, pos) + 1
+    
+    problems = []
+    string_ends = {string.start: string.end for string in lex_dart_strings(content)}
+    if LANGUAGE_PROVIDER_IMPORT not in content:
+        problems.append((0, "Import von language_provider.dart fehlt"))
+    provider = CARD_DATA_PROVIDER.search(content)
+    definition = provider and dart_call_arguments(content, provider.start(1), string_ends)
+    if not definition:
+        problems.append((0, "cardDataProvider nicht gefunden"))
+    elif not all(part in ''.join(definition[1]) for part in
+                 ("ref.watch(algoliaIndexProvider)", "ref.watch(cardDataForIndexProvider(")):
+        problems.append((line(provider.start()), "cardDataProvider nutzt nicht cardDataForIndexProvider(algoliaIndex)"))
+    for match in re.finditer(r'(?<![\w.])CardData\(', content):
+        problems.append((line(match.start()), "neue CardData-Instanz (pro Sprachwechsel neu)"))
+    for match in CARD_SEARCH_CALL.finditer(content):
+        problems.append((line(match.start()), f"{match.group(1)} ohne cachedCardSearch"))
+    
+    for match in CACHED_CARD_SEARCH.finditer(content):
+        call = dart_call_arguments(content, match.start(1), string_ends)
+        search = call and len(call[1]) == 3 and re.match(
+            r'\(\) => cardData\.(\w+)\(', call[1][2])
+        if not search or not call[1][1].startswith('['):
+            problems.append((line(match.start()), "cachedCardSearch(ref, [key], () => cardData.…) erwartet"))
+            continue
+        _, search_arguments = dart_call_arguments(call[1][2], search.end() - 1)
+        _, key = dart_call_arguments(call[1][1], 0)
+        if [' '.join(value.split()) for value in key] != card_search_key(search.group(1), search_arguments):
+            problems.append((line(match.start()), f"Cache-Key passt nicht zu den Argumenten von {search.group(1)}"))
+    return [f"Zeile {number}: {problem}" if number else problem for number, problem in sorted(problems)]
+
+
+# KI-Übersetzung: Batches begrenzen Requests, das Semaphor die Parallelität
+AI_MODEL = "claude-3-5-sonnet-20241022"
+AI_BATCH_SIZE = 40
+AI_BATCH_CHARS = 4000
+AI_CONCURRENCY = 4
+AI_RETRIES = 3
+AI_BACKOFF = 1.0
+# Account-Limits (Requests/Tokens pro Minute); Bursts höchstens eine Sekunde
+AI_REQUESTS_PER_MINUTE = 50
+AI_TOKENS_PER_MINUTE = 40000
+# Aufeinanderfolgende Fehlschläge, nach denen nur noch Glossar/Memory übersetzen
+AI_BREAKER_THRESHOLD = 5
+# Sekunden, nach denen ein offener Breaker einen einzelnen Probe-Request durchlässt
+AI_BREAKER_COOLDOWN = 60.0
+# USD pro Million Tokens (Eingabe, Ausgabe) für AI_MODEL
+AI_PRICE_PER_MTOK = (3.0, 15.0)
+
+
+def make_batches(texts: List[str], max_items: int = AI_BATCH_SIZE,
+                 max_chars: int = AI_BATCH_CHARS) -> List[List[str]]:
+    """Packt Texte in Batches mit höchstens max_items Einträgen / max_chars Zeichen"""
+    batches = []
+    batch = []
+    chars = 0
+    for text in texts:
+        if batch and (len(batch) >= max_items or chars + len(text) > max_chars):
+            batches.append(batch)
+            batch = []
+            chars = 0
+        batch.append(text)
+        chars += len(text)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def parse_batch_response(raw: str, batch: List[str]) -> Dict[str, str]:
+    """Liest das JSON-Objekt aus der Modellantwort; nur Keys aus dem Batch zählen"""
+    start = raw.find('{')
+    end = raw.rfind('}')
+    if start == -1 or end < start:
+        raise ValueError("Antwort enthält kein JSON-Objekt")
+    data = json.loads(raw[start:end + 1])
+    if not isinstance(data, dict):
+        raise ValueError("Antwort ist kein JSON-Objekt")
+    wanted = set(batch)
+    return {k: v.strip() for k, v in data.items()
+            if k in wanted and isinstance(v, str) and v.strip()}
+
+
+def ai_cost(input_tokens: int, output_tokens: int) -> float:
+    """Kosten in USD für AI_MODEL"""
+    return (input_tokens * AI_PRICE_PER_MTOK[0] + output_tokens * AI_PRICE_PER_MTOK[1]) / 1e6
+
+
+class TokenBucket:
+    """Token-Bucket: per_minute Einheiten pro Minute, Burst bis capacity
+    
+    Nicht threadsicher; wird nur aus der asyncio-Schleife benutzt.
+    """
+    
+    def __init__(self, per_minute: float, capacity: float = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def delay(self, amount: float) -> float:
+        """Sekunden, bis amount verfügbar ist (mehr als capacity: bis der Bucket voll ist)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+    
+    def take(self, amount: float):
+        """Verbraucht amount; der Bucket darf dabei negativ werden"""
+        self._refill()
+        self.tokens -= amount
+    
+    def drain(self):
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class HttpStatusError(Exception):
+    """HTTP-Fehler einer API (Messages-API, Algolia), wie anthropic.APIStatusError"""
+    
+    def __init__(self, status_code: int, message: str, retry_after: str = None):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def post_json(url: str, data: bytes, headers: Dict[str, str] = None, timeout: float = 60.0):
+    """POST mit JSON-Body (bereits kodiert); liefert die JSON-Antwort, HTTP-Fehler als HttpStatusError"""
+    import urllib.error
+    import urllib.request
+    request = urllib.request.Request(url, data=data, headers={"content-type": "application/json", **(headers or {})})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        raise HttpStatusError(e.code, e.read().decode('utf-8', 'replace')[:200],
+                              e.headers.get("retry-after")) from None
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Retry-After aus HttpStatusError oder einer anthropic-Exception (Header der Antwort)"""
+    value = getattr(error, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        value = headers.get("retry-after") if headers is not None else None
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class AIScheduler:
+    """Plant die KI-Requests eines Laufs: Rate-Limits, Backoff, Circuit Breaker, Budget
+    
+    Vor jedem Request reserviert acquire() einen Request und die geschätzten
+    Tokens; ein 429 pausiert alle Worker bis Retry-After. Nach
+    breaker_threshold Fehlschlägen in Folge ist der Scheduler offen: es gehen
+    keine Requests mehr raus, übersetzt wird nur noch per Glossar und
+    Translation Memory. Nach breaker_cooldown Sekunden ist er halb offen und
+    lässt einen Probe-Request durch; Erfolg schließt ihn, ein Fehlschlag
+    öffnet ihn erneut. Bei 401/403 und erschöpftem Budget bleibt er offen.
+    """
+    
+    def __init__(self, requests_per_minute: float = AI_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = AI_TOKENS_PER_MINUTE,
+                 breaker_threshold: int = AI_BREAKER_THRESHOLD,
+                 breaker_cooldown: float = AI_BREAKER_COOLDOWN,
+                 budget_usd: float = None, max_tokens: int = None):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.breaker_threshold = max(1, breaker_threshold)
+        self.breaker_cooldown = breaker_cooldown
+        self.budget_usd = budget_usd
+        self.max_tokens = max_tokens
+        self.open_reason = None  # gesetzt: keine KI-Requests mehr
+        self.reopen_at = None    # monotonic; Probe-Request ab dann (None: bleibt offen)
+        self.probing = False     # halb offen: nur der Probe-Request läuft
+        self.failures = 0        # Fehlschläge in Folge
+        self.paused_until = 0.0  # monotonic; nach 429 mit Retry-After
+        self.reserved = 0        # geschätzte Tokens laufender Requests
+        self.used_tokens = 0
+        self.cost_usd = 0.0
+        self.rate_limited = 0
+        self.waited = 0.0
+    
+    @staticmethod
+    def estimate(batch: List[str]) -> int:
+        """Geschätzte Tokens (Eingabe + Ausgabe) eines Batches, grob 4 Zeichen pro Token
+        
+        Die Antwort wiederholt jeden Text als Key, ist also etwa doppelt so lang
+        wie die Texte im Prompt.
+        """
+        chars = sum(len(text) + 4 for text in batch)
+        return 3 * (chars // 4) + 100
+    
+    def trip(self, reason: str, cooldown: float = None):
+        """Öffnet den Scheduler; mit cooldown ist danach ein Probe-Request erlaubt"""
+        self.probing = False
+        if self.open_reason is None:
+            self.open_reason = reason
+            self.reopen_at = time.monotonic() + cooldown if cooldown is not None else None
+            retry = f", neuer Versuch in {cooldown:g}s" if cooldown is not None else ""
+            print(f"⚡ KI abgeschaltet ({reason}{retry}) - weiter nur mit Glossar und Translation Memory")
+    
+    def ready(self) -> bool:
+        """True, wenn Requests erlaubt sind; nach der Cooldown-Zeit wird der Breaker halb offen"""
+        if self.open_reason is not None and self.reopen_at is not None and time.monotonic() >= self.reopen_at:
+            self.open_reason = None
+            self.reopen_at = None
+            self.probing = True
+        return self.open_reason is None
+    
+    def _budget_exceeded(self, tokens: int) -> Optional[str]:
+        """Grund, falls weitere tokens das Token-Limit oder Budget überschreiten"""
+        if self.max_tokens is not None and self.used_tokens + tokens > self.max_tokens:
+            return f"Token-Limit {self.max_tokens} erreicht"
+        # Geschätzt: ein Drittel Eingabe, zwei Drittel Ausgabe
+        if self.budget_usd is not None and self.cost_usd + ai_cost(tokens / 3, tokens * 2 / 3) > self.budget_usd:
+            return f"Budget ${self.budget_usd:.2f} erreicht"
+        return None
+    
+    async def sleep(self, seconds: float):
+        """Wartet seconds, endet aber sofort, wenn der Scheduler öffnet"""
+        import asyncio
+        deadline = time.monotonic() + seconds
+        while self.open_reason is None:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                break
+            await asyncio.sleep(min(left, 0.1))
+    
+    async def acquire(self, estimate: int) -> bool:
+        """Wartet auf freie Kapazität; False, wenn keine Requests mehr erlaubt sind"""
+        while self.ready():
+            exceeded = self._budget_exceeded(estimate)
+            if exceeded:
+                self.trip(exceeded)
+                break
+            if self.reserved and (self.probing or self._budget_exceeded(self.reserved + estimate)):
+                # Erst abrechnen, was gerade läuft (halb offen: den Probe-Request)
+                await self.sleep(0.05)
+                continue
+            wait = max(self.paused_until - time.monotonic(),
+                       self.requests.delay(1), self.tokens.delay(estimate))
+            if wait <= 0:
+                break
+            start = time.monotonic()
+            await self.sleep(wait)
+            self.waited += time.monotonic() - start
+        if self.open_reason is not None:
+            return False
+        self.requests.take(1)
+        self.tokens.take(estimate)
+        self.reserved += estimate
+        return True
+    
+    def success(self, estimate: int, usage=None):
+        """Rechnet einen erfolgreichen Request mit den tatsächlichen Tokens ab"""
+        self.failures = 0
+        if self.probing:
+            self.probing = False
+            print("🔌 KI wieder erreichbar - Breaker geschlossen")
+        self.reserved -= estimate
+        input_tokens = getattr(usage, "input_tokens", 0) or 0
+        output_tokens = getattr(usage, "output_tokens", 0) or 0
+        used = input_tokens + output_tokens if usage is not None else estimate
+        self.tokens.take(used - estimate)
+        self.used_tokens += used
+        self.cost_usd += ai_cost(input_tokens, output_tokens) if usage is not None else ai_cost(estimate, 0)
+    
+    def failure(self, estimate: int, error: Exception, attempt: int = 0) -> Optional[float]:
+        """Bucht einen Fehlschlag; liefert die Wartezeit bis zum Retry oder None (aufgeben)"""
+        self.reserved -= estimate
+        status = getattr(error, "status_code", None)
+        if status in (401, 403):
+            self.trip(f"Zugriff verweigert ({status})")
+            return None
+        self.failures += 1
+        if self.probing or self.failures >= self.breaker_threshold:
+            self.trip(f"{self.failures} Fehlschläge in Folge", self.breaker_cooldown)
+            return None
+        if status is not None and status != 429 and status < 500:
+            return None  # Fehler im Request selbst, ein Retry hilft nicht
+        retry_after = retry_after_seconds(error)
+        if status == 429:
+            self.rate_limited += 1
+            self.requests.drain()
+            if retry_after is not None:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+        # Exponentielles Backoff mit Jitter, mindestens Retry-After
+        return max(retry_after or 0.0, AI_BACKOFF * 2 ** attempt * (0.5 + random.random()))
+
+
+class MessagesHttpClient:
+    """Minimaler Messages-API-Client über urllib (z.B. gegen einen Fake-Server, ohne anthropic-Paket)
+    
+    Gleiche Schnittstelle wie anthropic.Anthropic für messages.create; HTTP-Fehler
+    werden als HttpStatusError mit Status und Retry-After geworfen.
+    """
+    
+    def __init__(self, base_url: str, api_key: str = "", timeout: float = 60.0):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.timeout = timeout
+        self.messages = self
+    
+    def create(self, model: str, max_tokens: int, messages: list):
+        data = post_json(self.base_url + "/v1/messages",
+                         json.dumps({"model": model, "max_tokens": max_tokens, "messages": messages}).encode('utf-8'),
+                         {"x-api-key": self.api_key, "anthropic-version": "2023-06-01"}, self.timeout)
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=block["text"]) for block in data["content"] if block.get("type") == "text"],
+            usage=SimpleNamespace(**data.get("usage", {})))
+
+
+# Standard-Glossar Englisch -> Deutsch, einmal beim Import aufgebaut
+GLOSSARY_DE = MappingProxyType({
+    # Auth
+    "Login": "Anmelden",
+    "Login successful!": "Anmeldung erfolgreich!",
+    "Email address": "E-Mail-Adresse",
+    "Email": "E-Mail",
+    "Password": "Passwort",
+    "Repeat Email": "E-Mail wiederholen",
+    "Repeat Password": "Passwort wiederholen",
+    "Please enter an email address": "Bitte E-Mail-Adresse eingeben",
+    "Please enter a password": "Bitte Passwort eingeben",
+    "Registration": "Registrierung",
+    "Register": "Registrieren",
+    "Registration successful!": "Registrierung erfolgreich!",
+    "Username": "Benutzername",
+    "Confirm password": "Passwort bestätigen",
+    "Confirm with password": "Mit Passwort bestätigen",
+    "Enter your password": "Gib dein Passwort ein",
+    "Please enter your password": "Bitte gib dein Passwort ein",
+    
+    # Deck Management
+    "Create New Deck": "Neues Deck erstellen",
+    "Edit Deck": "Deck bearbeiten",
+    "Delete Deck": "Deck löschen",
+    "Delete Account": "Account löschen",
+    "You haven't created a deck yet": "Du hast noch kein Deck erstellt",
+    "Deck successfully deleted!": "Deck erfolgreich gelöscht!",
+    "Do you really want to delete this deck?": "Möchtest du dieses Deck wirklich löschen?",
+    "Do you really want to delete the deck": "Möchtest du das Deck wirklich löschen",
+    "This action cannot be undone": "Diese Aktion kann nicht rückgängig gemacht werden",
+    "Deck name...": "Deckname...",
+    "deckname...": "Deckname...",
+    "No decks found": "Keine Decks gefunden",
+    "Your Decks": "Deine Decks",
+    "Deck Configuration": "Deck-Konfiguration",
+    "Deck Size": "Deckgröße",
+    "Hand Size": "Handgröße",
+    "Main Deck": "Hauptdeck",
+    "Extra Deck": "Extradeck",
+    "Side Deck": "Sidedeck",
+    "MAIN": "HAUPT",
+    "EXTRA": "EXTRA",
+    "SIDE": "SEITE",
+    "Main": "Main",
+    "Extra": "Extra",
+    "Side": "Side",
+    "is empty": "ist leer",
+    
+    # Cards
+    "Add Card": "Karte hinzufügen",
+    "No Cards found": "Keine Karten gefunden",
+    "No Cardss found": "Keine Karten gefunden",
+    "Search for cards": "Karten suchen",
+    "search Card...": "Karte suchen...",
+    "Card name...": "Kartenname...",
+    "Cardname...": "Kartenname...",
+    "Write a Cardname or use the filters": "Gib einen Kartennamen ein oder nutze die Filter",
+    "This card is forbidden": "Diese Karte ist verboten",
+    "This card is limited": "Diese Karte ist limitiert",
+    "This card is semi-limited": "Diese Karte ist semi-limitiert",
+    "Diese Karte ist limitiert": "Diese Karte ist limitiert",
+    "Diese Karte ist semi-limitiert": "Diese Karte ist semi-limitiert",
+    "Target Cards": "Zielkarten",
+    "Copies": "Kopien",
+    "Required": "Erforderlich",
+    "Card": "Karte",
+    "Cards": "Karten",
+    "cards": "Karten",
+    "card": "Karte",
+    "unknown Card": "Unbekannte Karte",
+    "unknown": "Unbekannt",
+    
+    # Actions
+    "Cancel": "Abbrechen",
+    "cancel": "Abbrechen",
+    "Delete": "Löschen",
+    "Save": "Speichern",
+    "Search": "Suchen",
+    "search": "Suchen",
+    "Filter": "Filter",
+    "Show Filter": "Filter anzeigen",
+    "Reset": "Zurücksetzen",
+    "reset": "Zurücksetzen",
+    "Add": "Hinzufügen",
+    "Edit": "Bearbeiten",
+    "Continue editing": "Weiter bearbeiten",
+    "discard changes?": "Änderungen verwerfen?",
+    
+    # Status
+    "Loading...": "Lädt...",
+    "loading...": "Lädt...",
+    "loading App...": "App wird geladen...",
+    "Error": "Fehler",
+    "Success": "Erfolg",
+    "Error loading": "Fehler beim Laden",
+    "Error deleting": "Fehler beim Löschen",
+    "Error on logout:": "Fehler beim Abmelden:",
+    "Error on saving:": "Fehler beim Speichern:",
+    "Successfully logged out!": "Erfolgreich abgemeldet!",
+    "Logout": "Abmelden",
+    
+    # Navigation
+    "Welcome": "Willkommen",
+    "Home": "Startseite",
+    "home": "Startseite",
+    "Profile": "Profil",
+    "profile": "Profil",
+    "Settings": "Einstellungen",
+    "Comments": "Kommentare",
+    "Comment": "Kommentar",
+    "Write a Comment": "Schreibe einen Kommentar",
+    "Comment added": "Kommentar hinzugefügt",
+    "comment deleted": "Kommentar gelöscht",
+    "No Comments": "Keine Kommentare",
+    
+    # Filter/Search
+    "Filter Search": "Filtersuche",
+    "Type": "Typ",
+    "Race": "Kategorie",
+    "Attribute": "Attribut",
+    "Archetype": "Archetyp",
+    "Level": "Level",
+    "Scale": "Skala",
+    "Link Rating": "Link-Bewertung",
+    "ATK": "ATK",
+    "DEF": "DEF",
+    "TCG Banlist": "TCG Bannliste",
+    "OCG Banlist": "OCG Bannliste",
+    "TCG Bannliste": "TCG Bannliste",
+    "OCG Bannliste": "OCG Bannliste",
+    "Forbidden": "Verboten",
+    "Limited": "Limitiert",
+    "Semi-Limited": "Semi-Limitiert",
+    "Enter a keyword.": "Gib ein Suchwort ein.",
+    "Enter a deck name or select an archetype": "Gib einen Decknamen ein oder wähle einen Archetyp",
+    "Filter by archetype": "Nach Archetyp filtern",
+    "All archetypes": "Alle Archetypen",
+    "Pls choose at least one Filter.": "Bitte wähle mindestens einen Filter.",
+    "Filter reseted": "Filter zurückgesetzt",
+    "Filter get loaded...": "Filter werden geladen...",
+    
+    # Calculator
+    "Probability": "Wahrscheinlichkeit",
+    "Probability Calculator": "Wahrscheinlichkeitsrechner",
+    "AND Mode": "UND-Modus",
+    "OR Mode": "ODER-Modus",
+    
+    # Account
+    "Account Settings": "Kontoeinstellungen",
+    "Account successfully deleted!": "Account erfolgreich gelöscht!",
+    "Do you really want to permanently delete your account?": "Möchtest du deinen Account wirklich dauerhaft löschen?",
+    
+    # Errors
+    "User not found": "Benutzer nicht gefunden",
+    "Benutzer nicht gefunden": "Benutzer nicht gefunden",
+    "User isn't logged in": "Benutzer ist nicht angemeldet",
+    "Not logged in": "Nicht angemeldet",
+    "Kein Benutzer angemeldet": "Kein Benutzer angemeldet",
+    "Deck ID missing! Editing not possible": "Deck-ID fehlt! Bearbeitung nicht möglich",
+    "error: deckid not found to load comments.": "Fehler: Deck-ID nicht gefunden, um Kommentare zu laden.",
+    
+    # Deck Actions
+    "how often adding?": "Wie oft hinzufügen?",
+    "Card deleted": "Karte gelöscht",
+    "How many Cards do you want to delete from": "Wie viele Karten möchtest du löschen von",
+    "Pls choose a deckcoverimage": "Bitte wähle ein Deck-Coverbild",
+    "No Image available for:": "Kein Bild verfügbar für:",
+    "Cover-has been set to": "Cover wurde gesetzt auf",
+    "no working image url found for": "Keine funktionierende Bild-URL gefunden für",
+    "added": "hinzugefügt",
+    "Limit over!": "Limit überschritten!",
+    "you are only allowed to play": "du darfst nur spielen",
+    "copies": "Kopien",
+    "successfully deleted!": "erfolgreich gelöscht!",
+    "Error deleting deck:": "Fehler beim Löschen des Decks:",
+    "Deck sucessfull saved!": "Deck erfolgreich gespeichert!",
+    
+    # Images
+    "loading Cardimages...": "Kartenbilder werden geladen...",
+    "loading Filteroptions..": "Filteroptionen werden geladen...",
+    "TCG Banlist is loading..": "TCG Bannliste wird geladen...",
+    "OCG Banlist is loading...": "OCG Bannliste wird geladen...",
+})
+
+GLOSSARY_TRAILING = ' \t.!?:;…'
+
+
+def normalize_glossary_key(text: str) -> str:
+    """Vergleichsschlüssel ohne Groß-/Kleinschreibung, Mehrfach-Whitespace und Satzzeichen am Ende"""
+    return ' '.join(text.casefold().split()).rstrip(GLOSSARY_TRAILING)
+
+
+def _build_index(glossary, normalize) -> MappingProxyType:
+    """Index normalisierter Schlüssel; wie beim alten linearen Scan gewinnt der erste Eintrag"""
+    index = {}
+    for key, value in glossary.items():
+        index.setdefault(normalize(key), value)
+    return MappingProxyType(index)
+
+
+class Glossary:
+    """Unveränderliches Glossar mit vorberechneten Indizes (O(1)-Lookups)"""
+    
+    def __init__(self, entries):
+        self.entries = MappingProxyType(dict(entries))
+        self.casefold = _build_index(self.entries, str.casefold)
+        self.normalized = _build_index(self.entries, normalize_glossary_key)
+    
+    @classmethod
+    def layered(cls, layers: List[Tuple[dict, dict, dict]]) -> "Glossary":
+        """Glossar aus den Indizes mehrerer Schichten (höchste Priorität zuerst), ohne Neuberechnung"""
+        merged = ({}, {}, {})
+        for layer in reversed(layers):
+            for index, part in zip(merged, layer):
+                index.update(part)
+        glossary = cls.__new__(cls)
+        glossary.entries, glossary.casefold, glossary.normalized = (MappingProxyType(index) for index in merged)
+        return glossary
+    
+    def indexes(self) -> Tuple[dict, dict, dict]:
+        """Die drei Indizes als einfache Dicts (für Cache und Schichten)"""
+        return dict(self.entries), dict(self.casefold), dict(self.normalized)
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def lookup(self, text: str, fuzzy: bool = False) -> Optional[str]:
+        # Versuche exakte Übereinstimmung
+        translated = self.entries.get(text)
+        if translated is not None:
+            return translated
+        
+        # Versuche case-insensitive
+        translated = self.casefold.get(text.casefold())
+        if translated is not None:
+            return translated
+        
+        # Optional: Whitespace und Satzzeichen am Ende ignorieren
+        if fuzzy:
+            translated = self.normalized.get(normalize_glossary_key(text))
+            if translated is not None:
+                # Satzzeichen des Originals übernehmen ("loading.." -> "Lädt..")
+                suffix = text[len(text.rstrip(GLOSSARY_TRAILING)):]
+                return translated.rstrip(GLOSSARY_TRAILING) + suffix.strip()
+        
+        return None
+
+
+# Glossare pro Ziel-Locale; Locales ohne Glossar gehen direkt an TM/KI
+GLOSSARIES = {
+    "de": Glossary(GLOSSARY_DE),
+}
+
+# Glossar-Schichten im Projekt (glossaries/<schicht>/<locale>.tsv|json), höchste Priorität zuerst;
+# darunter liegen die eingebauten Glossare
+GLOSSARY_LAYERS = ("project", "domain", "locale")
+GLOSSARY_SUFFIXES = (".tsv", ".json")
+GLOSSARY_CACHE_VERSION = 1
+
+
+def read_glossary_file(path: Path) -> Dict[str, str]:
+    """Liest ein Glossar: TSV (englisch<TAB>übersetzung, # für Kommentare) oder flaches JSON-Objekt"""
+    if path.suffix == ".json":
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or not all(isinstance(v, str) for v in data.values()):
+            raise ValueError(f"{path}: erwartet ein JSON-Objekt englisch -> übersetzung")
+        return data
+    
+    entries = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.rstrip('\r\n')
+            if not line.strip() or line.startswith('#'):
+                continue
+            source, tab, target = line.partition('\t')
+            if not tab or not source or not target:
+                raise ValueError(f"{path}:{line_num}: erwartet 'englisch<TAB>übersetzung'")
+            entries[source] = target
+    return entries
+
+
+def load_glossary_file(path: Path, cache_dir: Path, read_only: bool = False) -> Tuple[dict, dict, dict]:
+    """Indizes einer Glossar-Datei, kompiliert im marshal-Cache (gültig solange mtime/Größe passen)
+    
+    read_only=True (Dry-Run): vorhandenen Cache lesen, aber keinen schreiben.
+    """
+    stat = os.stat(path)
+    stamp = (GLOSSARY_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+    cache_file = cache_dir / (hashlib.sha1(str(path.resolve()).encode('utf-8')).hexdigest()[:16] + ".marshal")
+    try:
+        # loads(read()) statt load(f): load liest Objekt für Objekt aus der Datei
+        with open(cache_file, 'rb') as f:
+            cached_stamp, indexes = marshal.loads(f.read())
+        if cached_stamp == stamp:
+            return indexes
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    
+    indexes = Glossary(read_glossary_file(path)).indexes()
+    if read_only:
+        return indexes
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(marshal.dumps((stamp, indexes)))
+        os.replace(tmp_path, cache_file)
+    except OSError:
+        pass  # z.B. schreibgeschützt: dann eben ohne Cache
+    return indexes
+
+
+def load_glossaries(layer_dirs: List[Path], locales: List[str], cache_dir: Path,
+                    read_only: bool = False) -> Dict[str, Glossary]:
+    """Glossare pro Locale aus Schicht-Ordnern (höchste Priorität zuerst) über den eingebauten"""
+    glossaries = dict(GLOSSARIES)
+    for locale in locales:
+        layers = []
+        for folder in layer_dirs:
+            for suffix in GLOSSARY_SUFFIXES:
+                path = folder / f"{locale}{suffix}"
+                if path.is_file():
+                    layers.append(load_glossary_file(path, cache_dir, read_only))
+        if not layers:
+            continue
+        source = f"{len(layers)} Dateien"
+        if locale in GLOSSARIES:
+            layers.append(GLOSSARIES[locale].indexes())
+            source += " + eingebaut"
+        glossaries[locale] = Glossary.layered(layers)
+        print(f"📚 Glossar [{locale}]: {len(glossaries[locale])} Einträge ({source})")
+    return glossaries
+
+
+# Quellsprache der Dart-Texte
+SOURCE_LOCALE = "en"
+
+# Englische Sprachnamen: für KI-Prompts und die Keys language.<name>
+LANGUAGE_NAMES = {
+    "en": "English",
+    "de": "German",
+    "fr": "French",
+    "es": "Spanish",
+    "it": "Italian",
+    "ja": "Japanese",
+    "nl": "Dutch",
+    "pt": "Portuguese",
+    "pl": "Polish",
+    "ko": "Korean",
+    "zh": "Chinese",
+}
+
+# Anrede für KI-Übersetzungen
+AI_STYLE = {
+    "de": " (informal 'du')",
+    "fr": " (informal 'tu')",
+    "es": " (informal 'tú')",
+    "it": " (informal 'tu')",
+}
+
+# Feste Übersetzungen der speziellen Keys; fehlende laufen durch Glossar/TM/KI
+SPECIAL_TRANSLATIONS = {
+    "de": {
+        "app.title": "Cardbase",
+        "app.loading": "Lädt...",
+        "language.english": "Englisch",
+        "language.german": "Deutsch",
+        "language.switch": "Sprache wechseln",
+        "language.switched_to_english": "Sprache zu Englisch gewechselt",
+        "language.switched_to_german": "Sprache zu Deutsch gewechselt",
+    },
+}
+
+
+def language_key_name(locale: str) -> str:
+    """Name im Key language.<name>, z.B. 'de' -> 'german'"""
+    return LANGUAGE_NAMES.get(locale, locale).lower()
+
+
+def algolia_index_name(locale: str) -> str:
+    """Algolia-Index pro Sprache: 'cards' für die Quellsprache, sonst 'cards_<lang>'"""
+    return "cards" if locale == SOURCE_LOCALE else f"cards_{locale}"
+
+
+def special_keys(locales: List[str]) -> Dict[str, str]:
+    """Spezielle Keys (englischer Text) für alle Locales"""
+    keys = {
+        "app.title": "Cardbase",
+        "app.loading": "Loading...",
+    }
+    for locale in locales:
+        name = LANGUAGE_NAMES.get(locale, locale)
+        keys[f"language.{language_key_name(locale)}"] = name
+    keys["language.switch"] = "Switch Language"
+    for locale in locales:
+        name = LANGUAGE_NAMES.get(locale, locale)
+        keys[f"language.switched_to_{language_key_name(locale)}"] = f"Language switched to {name}"
+    return keys
+
+
+# Watch-Modus: Bursts von Speichervorgängen werden zusammengefasst
+WATCH_DEBOUNCE = 0.03
+WATCH_POLL_INTERVAL = 0.05
+
+
+class PollingWatcher:
+    """Fallback ohne inotify: vergleicht mtime und Größe aller .dart-Dateien"""
+    
+    def __init__(self, root: Path, interval: float = WATCH_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.snapshot = self._snapshot()
+    
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for path in self.root.rglob("*.dart"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[str(path)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+    
+    def wait(self, timeout: Optional[float] = None) -> set:
+        """Geänderte, neue oder gelöschte Dateien; leer nach Ablauf von timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._snapshot()
+            changed = {path for path in current.keys() | self.snapshot.keys()
+                       if current.get(path) != self.snapshot.get(path)}
+            self.snapshot = current
+            if changed:
+                return changed
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(self.interval, remaining))
+            else:
+                time.sleep(self.interval)
+    
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux: inotify über ctypes (kein Zusatzpaket), rekursiv über alle Ordner"""
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    
+    def __init__(self, root: Path):
+        import ctypes
+        import ctypes.util
+        import select
+        import struct
+        
+        self.root = root
+        self._select = select.select
+        self._event = struct.Struct('iIII')
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        # AttributeError ohne inotify (macOS, Windows) -> PollingWatcher
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | getattr(os, 'O_CLOEXEC', 0))
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 fehlgeschlagen")
+        self.dirs = {}  # watch-deskriptor -> ordner
+        self._add_tree(root)
+    
+    def _add_tree(self, folder: Path) -> set:
+        """Beobachtet folder rekursiv; liefert die bereits vorhandenen .dart-Dateien"""
+        found = set()
+        for dirpath, _, filenames in os.walk(folder):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(dirpath), self.MASK)
+            if wd >= 0:
+                self.dirs[wd] = dirpath
+            found.update(os.path.join(dirpath, name) for name in filenames if name.endswith('.dart'))
+        return found
+    
+    def wait(self, timeout: Optional[float] = None) -> set:
+        """Geänderte, neue oder gelöschte Dateien; leer nach Ablauf von timeout"""
+        if not self._select([self.fd], [], [], timeout)[0]:
+            return set()
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self._event.unpack_from(data, offset)
+            offset += self._event.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+            
+            if mask & self.IN_Q_OVERFLOW:
+                # Events verloren: alles als geändert melden
+                changed.update(str(path) for path in self.root.rglob("*.dart"))
+                continue
+            folder = self.dirs.get(wd)
+            if folder is None:
+                continue
+            path = os.path.join(folder, name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    changed.update(self._add_tree(Path(path)))
+            elif name.endswith('.dart'):
+                changed.add(path)
+        return changed
+    
+    def close(self):
+        os.close(self.fd)
+
+
+def create_watcher(root: Path, poll_interval: float = WATCH_POLL_INTERVAL):
+    """InotifyWatcher wo verfügbar, sonst PollingWatcher"""
+    try:
+        return InotifyWatcher(root)
+    except (OSError, AttributeError):
+        return PollingWatcher(root, poll_interval)
+
+
+# Karten-Export für die Algolia-Indizes cards_<sprache> (Befehl `cards`).
+# Felder wie in CardData.updateAlgoliaWithImages (getCardData.dart): Facetten
+# und Namen nur per Glossar/Translation Memory (offizielle Begriffe, keine
+# KI-Erfindungen), Beschreibungen per Translation Memory und KI-Batches.
+CARD_FACET_FIELDS = ("type", "race", "attribute", "archetype")
+CARD_NAME_FIELDS = ("name",)
+CARD_TEXT_FIELDS = ("desc",)
+CARD_CHUNK = 2000
+# Algolia empfiehlt Batches um 1000 Objekte (höchstens ~10 MB pro Request)
+ALGOLIA_BATCH = 1000
+ALGOLIA_CONCURRENCY = 4
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Teilt einen (auch unendlichen) Iterator in Listen zu je size Elementen"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_card_records(path: Path, read_size: int = 1 << 16) -> Iterator[dict]:
+    """Karten aus einem Dump, gestreamt: NDJSON, JSON-Array oder {"data": [...]} (YGOPRODeck)"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        buffer = f.read(read_size).lstrip()
+        data = re.match(r'\{\s*"data"\s*:\s*\[', buffer)
+        if data is not None:
+            pos = data.end()
+        elif buffer.startswith('['):
+            pos = 1
+        elif buffer.startswith('{'):
+            # NDJSON: ein Objekt pro Zeile (angeschnittene letzte Zeile vervollständigen)
+            for line_num, line in enumerate(chain((buffer + f.readline()).splitlines(True), f), 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{path}:{line_num}: {e}") from None
+            return
+        else:
+            raise ValueError(f"{path}: weder NDJSON noch JSON-Array noch {{\"data\": [...]}}")
+        
+        # Array-Elemente einzeln dekodieren; der Puffer hält nur ein Stück der Datei
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos == len(buffer):
+                more = f.read(read_size)
+                if not more:
+                    raise ValueError(f"{path}: unerwartetes Dateiende")
+                buffer, pos = more, 0
+                continue
+            if buffer[pos] == ']':
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except ValueError as e:
+                more = f.read(read_size)
+                if not more:
+                    raise ValueError(f"{path}: {e}") from None
+                buffer, pos = buffer[pos:] + more, 0
+                continue
+            yield record
+            pos = end
+
+
+def upload_ndjson(path: Path, base_url: str, index: str, headers: Dict[str, str] = None,
+                  batch_size: int = ALGOLIA_BATCH, concurrency: int = ALGOLIA_CONCURRENCY) -> int:
+    """Lädt NDJSON per Algolia-Batch-API hoch (wie saveObjects: updateObject je objectID)
+    
+    Die Datei wird gestreamt; höchstens 2 * concurrency Batches sind gleichzeitig
+    unterwegs. 429/5xx werden mit Backoff wiederholt. Liefert die Zahl der Objekte.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    from urllib.parse import quote
+    endpoint = f"{base_url.rstrip('/')}/1/indexes/{quote(index, safe='')}/batch"
+    
+    def send(lines: List[str]) -> int:
+        # Zeilen sind schon JSON: nur in die Batch-Hülle setzen, nicht neu kodieren
+        data = ('{"requests":[' + ','.join('{"action":"updateObject","body":' + line.strip() + '}'
+                                           for line in lines) + ']}').encode('utf-8')
+        for attempt in range(AI_RETRIES + 1):
+            try:
+                post_json(endpoint, data, headers)
+                return len(lines)
+            except HttpStatusError as e:
+                if attempt == AI_RETRIES or (e.status_code != 429 and e.status_code < 500):
+                    raise
+                time.sleep(max(retry_after_seconds(e) or 0.0,
+                               AI_BACKOFF * 2 ** attempt * (0.5 + random.random())))
+    
+    uploaded = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool, open(path, 'r', encoding='utf-8') as f:
+        pending = set()
+        for lines in chunked((line for line in f if line.strip()), batch_size):
+            if len(pending) >= 2 * concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                uploaded += sum(future.result() for future in done)
+            pending.add(pool.submit(send, lines))
+        uploaded += sum(future.result() for future in pending)
+    return uploaded
+
+
+# Obergrenzen (ms) der Buckets im Latenz-Histogramm der KI-Requests
+API_LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Metrics:
+    """Instrumentierung eines Laufs für --metrics/--profile
+    
+    Phasen messen Wand- und CPU-Zeit (inkl. beendeter Worker-Prozesse) und
+    werden bei Wiederholung aufsummiert; verschachtelte Phasen zählen auch in
+    der äußeren mit. Mit profile_dir läuft jede äußere Phase unter cProfile
+    (nur ein Profiler gleichzeitig) und wird dort als <phase>.pstats abgelegt.
+    """
+    VERSION = 1
+    
+    def __init__(self, profile_dir: Path = None):
+        self.profile_dir = profile_dir
+        self.info = {}      # Befehl, Optionen, ...
+        self.phases = {}    # name -> {"calls", "wall_s", "cpu_s"}
+        self.counters = {}  # name -> anzahl
+        self.api_latencies = []
+        self.api_tokens = {"input": 0, "output": 0}
+        self.profilers = {}
+        self._depth = 0
+        self._lock = threading.Lock()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = self.cpu_time()
+    
+    @staticmethod
+    def cpu_time() -> float:
+        times = os.times()
+        return times.user + times.system + times.children_user + times.children_system
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Misst einen Abschnitt"""
+        profiler = None
+        if self.profile_dir is not None and self._depth == 0:
+            import cProfile
+            profiler = self.profilers.setdefault(name, cProfile.Profile())
+            profiler.enable()
+        wall, cpu = time.perf_counter(), self.cpu_time()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            wall, cpu = time.perf_counter() - wall, self.cpu_time() - cpu
+            if profiler is not None:
+                profiler.disable()
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(str(self.profile_dir / f"{name}.pstats"))
+            entry = self.phases.setdefault(name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0})
+            entry["calls"] += 1
+            entry["wall_s"] += wall
+            entry["cpu_s"] += cpu
+    
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+    
+    def api_call(self, seconds: float, usage=None, error: bool = False):
+        """Ein KI-Request (auch aus Worker-Threads)"""
+        with self._lock:
+            self.api_latencies.append(seconds)
+            self.count("api_errors" if error else "api_calls")
+            if usage is not None:
+                self.api_tokens["input"] += getattr(usage, "input_tokens", 0) or 0
+                self.api_tokens["output"] += getattr(usage, "output_tokens", 0) or 0
+    
+    def rate(self, hits: str, misses: str) -> dict:
+        hit_count, miss_count = self.counters.get(hits, 0), self.counters.get(misses, 0)
+        total = hit_count + miss_count
+        return {"hits": hit_count, "misses": miss_count,
+                "rate": round(hit_count / total, 4) if total else None}
+    
+    def to_dict(self) -> dict:
+        latencies = sorted(seconds * 1000 for seconds in self.api_latencies)
+        
+        def percentile(p: float):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1) if latencies else None
+        
+        histogram = {f"<={bound}ms": 0 for bound in API_LATENCY_BUCKETS_MS}
+        histogram[f">{API_LATENCY_BUCKETS_MS[-1]}ms"] = 0
+        for ms in latencies:
+            bound = next((b for b in API_LATENCY_BUCKETS_MS if ms <= b), None)
+            histogram[f"<={bound}ms" if bound else f">{API_LATENCY_BUCKETS_MS[-1]}ms"] += 1
+        
+        # Durchsatz bezogen auf die Extraktion (Scan + Dedup)
+        scan_s = self.phases.get("scan", {}).get("wall_s")
+        files, strings = self.counters.get("files", 0), self.counters.get("strings", 0)
+        return {
+            "version": self.VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            **self.info,
+            "total": {"wall_s": round(time.perf_counter() - self._wall_start, 4),
+                      "cpu_s": round(self.cpu_time() - self._cpu_start, 4)},
+            "phases": {name: {"calls": entry["calls"], "wall_s": round(entry["wall_s"], 4),
+                              "cpu_s": round(entry["cpu_s"], 4)}
+                       for name, entry in self.phases.items()},
+            "throughput": {
+                "files": files,
+                "strings": strings,
+                "files_per_s": round(files / scan_s, 1) if scan_s else None,
+                "strings_per_s": round(strings / scan_s, 1) if scan_s else None,
+            },
+            "api": {
+                "calls": self.counters.get("api_calls", 0),
+                "errors": self.counters.get("api_errors", 0),
+                "latency_ms": {"p50": percentile(0.5), "p90": percentile(0.9),
+                               "p99": percentile(0.99), "max": round(latencies[-1], 1) if latencies else None},
+                "histogram": histogram,
+                "rate_limited": self.counters.get("api_rate_limited", 0),
+                "tokens": dict(self.api_tokens),
+                "cost_usd": round(ai_cost(self.api_tokens["input"], self.api_tokens["output"]), 6),
+            },
+            "hit_rates": {
+                "glossary": self.rate("glossary_hits", "glossary_misses"),
+                "translation_memory": self.rate("memory_hits", "memory_misses"),
+                "extraction_cache": self.rate("cache_hits", "cache_misses"),
+            },
+            "counters": dict(sorted(self.counters.items())),
+        }
+    
+    def save(self, path: Path):
+        """Schreibt die Metriken als JSON (atomar)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        os.replace(tmp_path, path)
+
 
 class FlutterLocalizer:
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, jobs: int = 1, use_cache: bool = True,
+                 use_memory: bool = True, fuzzy_glossary: bool = False,
+                 locales: List[str] = None, dry_run: bool = False,
+                 nested_json: bool = False, minify_json: bool = False, arb: bool = True,
+                 split_locales: bool = None,
+                 rewrite: bool = False, client=None,
+                 ai_batch_size: int = AI_BATCH_SIZE, ai_concurrency: int = AI_CONCURRENCY,
+                 ai_requests_per_minute: float = AI_REQUESTS_PER_MINUTE,
+                 ai_tokens_per_minute: float = AI_TOKENS_PER_MINUTE,
+                 ai_budget_usd: float = None, ai_max_tokens: int = None,
+                 metrics: Metrics = None, glossary_dirs: List[str] = None):
         self.project_root = Path(project_root)
+        self.metrics = metrics or Metrics()
+        self.jobs = max(1, jobs)
+        self.use_cache = use_cache
+        self.cache_path = self.project_root / ".localize_cache"
+        self.use_memory = use_memory
+        self.fuzzy_glossary = fuzzy_glossary
+        # Zusätzliche Glossar-Ordner vor den Schichten des Projekts
+        self.glossary_dirs = [Path(folder) for folder in glossary_dirs or []] + \
+            [self.project_root / "glossaries" / layer for layer in GLOSSARY_LAYERS]
+        self._glossaries = None
+        self._memory = None
         self.lib_path = self.project_root / "lib"
         self.assets_path = self.project_root / "assets" / "translations"
-        self.translations_en = {}
-        self.translations_de = {}
-        self.key_counter = 0
+        # Ziel-Sprachen; Quellsprache ist immer SOURCE_LOCALE
+        self.locales = [l for l in dict.fromkeys(locales or ["de"]) if l != SOURCE_LOCALE]
+        self.all_locales = [SOURCE_LOCALE] + self.locales
+        self.translations = {locale: {} for locale in self.all_locales}
+        self.nested_json = nested_json
+        self.minify_json = minify_json
+        # ARB für gen-l10n zusätzlich zum JSON, sobald das Projekt eine l10n.yaml hat
+        self.l10n_config = read_l10n_config(self.project_root) if arb else None
+        # Kern + Shards pro Präfix; ohne Angabe wie bisher (manifest.json vorhanden)
+        self.manifest_path = self.assets_path / LOCALE_MANIFEST
+        self.split_locales = self.manifest_path.exists() if split_locales is None else split_locales
+        self.locale_manifest = {}  # locale -> {"core": ..., "shards": ...} der zuletzt abgelegten Dateien
+        self.unguarded_shard_files = {}  # datei -> Keys im Kern, weil ihre Klasse den Shard nicht anfordert
+        self.rewrite = rewrite
+        self.string_sites = {}  # datei -> {(start, ende, klammern): text}
+        self.site_digests = {}  # datei -> inhalts-hash, auf den sich string_sites bezieht
+        self.text_keys = {}     # text -> key
+        self.tr_keys = set()    # Keys, die im Code schon per .tr() genutzt werden
+        self.file_tr_keys = {}  # datei -> tr-keys
+        self.key_locations = {}  # tr-key -> [(datei, zeile)]
+        self.file_count = 0     # Dart-Dateien der letzten Extraktion
+        self.key_index = None
+        self.locale_lines = None  # Watch-Modus: locale -> LocaleLines
+        
+        # Alle Datei-Änderungen werden erst gesammelt und dann gemeinsam geschrieben
+        self.dry_run = dry_run
+        self.pending_writes = {}
+        self.backup_path = self.project_root / "localization_backup"
+        self._backups = None
         
         # Anthropic API für bessere Übersetzungen
-        self.use_ai = False
-        try:
-            api_key = os.environ.get("ANTHROPIC_API_KEY")
-            if api_key:
-                self.client = anthropic.Anthropic(api_key=api_key)
-                self.use_ai = True
-                print("✅ AI-Übersetzung aktiviert")
-        except:
-            print("ℹ️  AI-Übersetzung nicht verfügbar, nutze Standard-Mappings")
+        self.ai_batch_size = max(1, ai_batch_size)
+        self.ai_concurrency = max(1, ai_concurrency)
+        self.ai_requests = 0
+        # Gilt für den ganzen Lauf (auch mehrere Watch-Runden): Limits, Budget, Breaker
+        self.scheduler = AIScheduler(ai_requests_per_minute, ai_tokens_per_minute,
+                                     budget_usd=ai_budget_usd, max_tokens=ai_max_tokens)
+        self.client = client
+        self.api_key = os.environ.get("ANTHROPIC_API_KEY")
+        self.use_ai = client is not None or bool(self.api_key)
+        if self.use_ai:
+            print("✅ AI-Übersetzung aktiviert")
+    
+    def _ai_available(self) -> bool:
+        """Erzeugt den Anthropic-Client erst, wenn wirklich etwas übersetzt werden muss"""
+        if self.use_ai and self.client is None:
+            try:
+                import anthropic
+            except ImportError:
+                print("ℹ️  AI-Übersetzung nicht verfügbar, nutze Standard-Mappings")
+                self.use_ai = False
+                return False
+            # Retries übernimmt der AIScheduler, sonst wartet das SDK Fehler zusätzlich selbst ab
+            self.client = anthropic.Anthropic(api_key=self.api_key, max_retries=0)
+        return self.use_ai
         
     def setup_folders(self):
         """Erstellt Ordnerstruktur für Übersetzungen"""
         self.assets_path.mkdir(parents=True, exist_ok=True)
         print(f"✅ Ordner erstellt: {self.assets_path}")
         
-    def extract_strings(self) -> List[Tuple[Path, str, str, int]]:
-        """Extrahiert alle Text-Strings aus Dart-Dateien"""
-        patterns = [
-            r'Text\([\'"]([^\'"]+)[\'"]\)',
-            r'Text\([\'"]([^\'"]+)[\'"],\s*style:',
-            r'hintText:\s*[\'"]([^\'"]+)[\'"]',
-            r'labelText:\s*[\'"]([^\'"]+)[\'"]',
-            r'label:\s*(?:const\s+)?Text\([\'"]([^\'"]+)[\'"]\)',
-            r'SnackBar\(content:\s*Text\([\'"]([^\'"]+)[\'"]\)',
-            r'Exception\([\'"]([^\'"]+)[\'"]\)',
-            r'child:\s*(?:const\s+)?Text\([\'"]([^\'"]+)[\'"]\)',
-            r'title:\s*(?:const\s+)?Text\([\'"]([^\'"]+)[\'"]\)',
-            r'subtitle:\s*(?:const\s+)?Text\([\'"]([^\'"]+)[\'"]\)',
-            r'tooltip:\s*[\'"]([^\'"]+)[\'"]',
-        ]
+    def read_file(self, path: Path) -> str:
+        """Liest eine Datei; bereits vorgemerkte Änderungen haben Vorrang"""
+        if path in self.pending_writes:
+            if self.pending_writes[path] is None:
+                raise FileNotFoundError(path)
+            return ''.join(self._chunks(self.pending_writes[path]))
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def stage_write(self, path: Path, content):
+        """Merkt neuen Inhalt vor; geschrieben wird erst in commit_writes()
+        
+        content ist ein String oder eine Funktion, die Text-Stücke liefert
+        (wird gestreamt und nie komplett im Speicher gehalten); None löscht
+        die Datei.
+        """
+        self.pending_writes[path] = content
+    
+    @staticmethod
+    def _chunks(content):
+        return content() if callable(content) else iter((content,))
+    
+    def _unchanged_on_disk(self, path: Path, content) -> bool:
+        """Vergleicht Stück für Stück mit der Datei auf der Platte"""
+        if content is None:
+            return not path.exists()
+        try:
+            with open(path, 'rb') as f:
+                for chunk in self._chunks(content):
+                    data = chunk.encode('utf-8')
+                    if f.read(len(data)) != data:
+                        return False
+                return f.read(1) == b''
+        except FileNotFoundError:
+            return False
+    
+    @property
+    def backups(self) -> BackupStore:
+        """Backup-Lauf dieses Prozesses, beim ersten Zugriff angelegt"""
+        if self._backups is None:
+            self._backups = BackupStore(self.backup_path, self.project_root, self.metrics.info.get("command"))
+        return self._backups
+    
+    def commit_writes(self) -> List[Path]:
+        """Schreibt nur geänderte Dateien (atomar); im Dry-Run nur Unified Diff
+        
+        Der bisherige Inhalt jeder geänderten Datei landet vorher im Backup.
+        """
+        changed = [path for path, content in self.pending_writes.items()
+                   if not self._unchanged_on_disk(path, content)]
+        if changed and not self.dry_run:
+            # Erst alles sichern, dann schreiben: auch ein Abbruch ist wiederherstellbar
+            with self.metrics.phase("backup"):
+                for path in changed:
+                    self.backups.save(path)
+                self.backups.flush()
+        
+        removed = 0
+        for path in changed:
+            content = self.pending_writes[path]
+            if content is None:
+                removed += 1
+                if self.dry_run:
+                    print(f"🔎 Dry-Run: {os.path.relpath(path, self.project_root)} würde gelöscht")
+                    continue
+                path.unlink()
+                try:
+                    path.parent.rmdir()  # nur, wenn der Ordner jetzt leer ist
+                except OSError:
+                    pass
+                continue
+            if self.dry_run:
+                text = ''.join(self._chunks(content))
+                exists = path.exists()
+                old_lines = []
+                if exists:
+                    with open(path, 'r', encoding='utf-8', newline='') as f:
+                        old_lines = f.read().splitlines(keepends=True)
+                rel_path = os.path.relpath(path, self.project_root)
+                import difflib
+                diff = difflib.unified_diff(
+                    old_lines, text.splitlines(keepends=True),
+                    fromfile=f"a/{rel_path}" if exists else "/dev/null",
+                    tofile=f"b/{rel_path}",
+                )
+                print(''.join(diff), end='' if text.endswith('\n') else '\n')
+                continue
+            
+            # Temp-Datei im selben Ordner + rename: nie halb geschriebene Dateien
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    for chunk in self._chunks(content):
+                        f.write(chunk.encode('utf-8'))
+                if path.exists():
+                    shutil.copymode(path, tmp_name)
+                else:
+                    # mkstemp legt 0600 an; neue Dateien bekommen die üblichen Rechte
+                    umask = os.umask(0)
+                    os.umask(umask)
+                    os.chmod(tmp_name, 0o666 & ~umask)
+                os.replace(tmp_name, path)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        
+        unchanged = len(self.pending_writes) - len(changed)
+        self.pending_writes = {}
+        deleted = f", {removed} gelöscht" if removed else ""
+        if self.dry_run:
+            print(f"🔎 Dry-Run: {len(changed) - removed} Dateien würden geändert{deleted}, {unchanged} unverändert")
+        else:
+            print(f"💾 {len(changed) - removed} Dateien geschrieben{deleted}, {unchanged} unverändert")
+        return changed
+    
+    def iter_strings(self, sites: bool = False, locations: bool = False,
+                     lines: bool = False) -> Iterator[Tuple]:
+        """Liefert (datei, text, zeile) aller Texte lazy, Datei für Datei
+        
+        Treffer kommen aus dem Cache oder werden gescannt (jobs > 1: im
+        Prozess-Pool) und nicht gesammelt. Nur auf Anfrage bleiben die
+        Literal-Positionen (sites, für --rewrite/Watch) und die Fundstellen der
+        tr-Keys (locations, für verify) erhalten; lines=True hängt die
+        Quelltextzeile als viertes Element an.
+        """
+        # Sortiert, damit seriell und parallel dieselbe Reihenfolge entsteht
+        dart_files = sorted(str(p) for p in self.lib_path.rglob("*.dart"))
+        
+        cache = None
+        if self.use_cache:
+            cache = ExtractionCache(self.cache_path, DartStringScanner().fingerprint, read_only=self.dry_run)
+            cache.load()
+        
+        # rglob liefert Pfade unterhalb von project_root: relativer Pfad per Slicing
+        root = str(self.project_root)
+        prefix = len(os.path.join(root, '')) if root != '.' else 0
         
-        found_strings = []
+        # Erst nur Metadaten prüfen; gescannt werden neue oder geänderte Dateien
+        fresh = {}  # pfad -> inhalts-hash der Treffer im Cache
+        stats = {}
+        to_scan = []
+        known_digests = []
+        for path in dart_files:
+            if cache is not None:
+                stat = os.stat(path)
+                digest, current = cache.lookup(path[prefix:], stat)
+                if current:
+                    fresh[path] = digest
+                    continue
+                stats[path] = stat
+                known_digests.append(digest)
+            else:
+                known_digests.append(None)
+            to_scan.append(path)
+        
+        pool = None
+        if self.jobs > 1 and len(to_scan) > 1:
+            chunksize = max(1, len(to_scan) // (self.jobs * 4))
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(max_workers=self.jobs)
+            scanned = pool.map(scan_dart_file, to_scan, known_digests, chunksize=chunksize)
+        else:
+            scanned = map(scan_dart_file, to_scan, known_digests)
         
-        for dart_file in self.lib_path.rglob("*.dart"):
-            with open(dart_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                lines = content.split('\n')
+        self.string_sites = {}
+        self.site_digests = {}
+        self.file_tr_keys = {}
+        self.key_locations = {}
+        self.file_count = len(dart_files)
+        found = 0
+        try:
+            for path in dart_files:
+                if path in fresh:
+                    digest, result, stat = fresh[path], None, None
+                else:
+                    _, digest, result = next(scanned)
+                    stat = stats.get(path)
+                if cache is not None:
+                    if result is None:
+                        # Unverändert bzw. nur mtime geändert: Treffer per Inhalts-Hash
+                        result = cache.read_hits(digest)
+                        if result is None:
+                            # Treffer-Datei inzwischen verschwunden
+                            stat = os.stat(path)
+                            _, digest, result = scan_dart_file(path)
+                            cache.misses += 1
+                        else:
+                            cache.hits += 1
+                    else:
+                        cache.misses += 1
+                    if stat is not None:
+                        cache.store(path[prefix:], stat, digest, result)
                 
-                for line_num, line in enumerate(lines, 1):
-                    for pattern in patterns:
-                        matches = re.finditer(pattern, line)
-                        for match in matches:
-                            text = match.group(1)
-                            # Filter: Nur Texte mit Buchstaben und keine Variablen
-                            if re.search(r'[a-zA-Z]', text) and not text.startswith('$'):
-                                found_strings.append((dart_file, line, text, line_num))
-        
-        print(f"✅ {len(found_strings)} Texte gefunden")
-        return found_strings
+                dart_file = Path(path)
+                hits, tr_refs = result
+                if tr_refs:
+                    self.file_tr_keys[dart_file] = {key for key, _ in tr_refs}
+                    # Invertierter Index key -> [(datei, zeile)]
+                    if locations:
+                        for key, line_num in tr_refs:
+                            self.key_locations.setdefault(key, []).append((dart_file, line_num))
+                if not hits:
+                    continue
+                if sites:
+                    self.string_sites[dart_file] = {(start, end, tuple(opens)): text
+                                                    for text, _, start, end, opens in hits}
+                    self.site_digests[dart_file] = digest
+                found += len(hits)
+                if lines:
+                    source_lines = self.read_file(dart_file).split('\n')
+                    for text, line_num, *_ in hits:
+                        yield dart_file, text, line_num, source_lines[line_num - 1]
+                else:
+                    for text, line_num, *_ in hits:
+                        yield dart_file, text, line_num
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        self.tr_keys = set().union(*self.file_tr_keys.values())
+        self.metrics.count("files", len(dart_files))
+        self.metrics.count("strings", found)
+        if cache is not None:
+            self.metrics.count("cache_hits", cache.hits)
+            self.metrics.count("cache_misses", cache.misses)
+            cache.save({path[prefix:] for path in dart_files})
+            print(f"💾 Cache: {cache.hits} Dateien unverändert, {cache.misses} neu gescannt")
+        print(f"✅ {found} Texte gefunden")
+    
+    def extract_strings(self) -> List[Tuple[Path, str, int]]:
+        """Extrahiert alle Text-Strings aus Dart-Dateien (als Liste)"""
+        return list(self.iter_strings(sites=True, locations=True))
     
     def generate_key(self, text: str, context: str = "") -> str:
-        """Generiert eindeutigen Schlüssel für Übersetzung"""
+        """Generiert den Basis-Schlüssel aus Kontext und Text (eindeutig macht ihn KeyIndex)"""
         context_lower = context.lower()
         
         # Bestimme Prefix aus Kontext
@@ -122,10 +2734,10 @@ class FlutterLocalizer:
         key_text = re.sub(r'[^a-zA-Z0-9\s]', '', text.lower())
         key_text = '_'.join(key_text.split()[:4])
         
+        # Ohne Buchstaben/Ziffern: Inhalts-Hash statt Zähler (unabhängig von der Reihenfolge)
         if not key_text:
-            key_text = f"text_{self.key_counter}"
+            key_text = f"text_{hashlib.sha1(text.encode('utf-8')).hexdigest()[:6]}"
         
-        self.key_counter += 1
         return f"{prefix}.{key_text}"
     
     def translate_to_german_ai(self, english_text: str) -> str:
@@ -133,213 +2745,145 @@ class FlutterLocalizer:
         if not self.use_ai:
             return self.translate_to_german(english_text)
         
+        translated = self.translate_batch_ai([english_text])
+        return translated.get(english_text, english_text)
+    
+    @property
+    def memory(self) -> TranslationMemory:
+        """Translation Memory, beim ersten Zugriff geladen und aus den Locale-Dateien ergänzt"""
+        if self._memory is None:
+            self._memory = TranslationMemory(self.cache_path / "translation_memory.jsonl")
+            if self.use_memory:
+                self._memory.load()
+                source = self.load_locale_file(SOURCE_LOCALE)
+                for locale in self.locales:
+                    self._memory.seed(source, self.load_locale_file(locale), locale)
+        return self._memory
+    
+    def translate_batch_ai(self, texts: List[str], locale: str = "de") -> Dict[str, str]:
+        """Übersetzt viele Texte in eine Sprache (Translation Memory, dann KI)"""
+        return self.translate_locales({locale: texts}).get(locale, {})
+    
+    def translate_locales(self, texts_by_locale: Dict[str, List[str]]) -> Dict[str, Dict[str, str]]:
+        """Übersetzt für alle Sprachen: erst Translation Memory, dann KI-Batches aller Sprachen parallel"""
+        translated = {locale: {} for locale in texts_by_locale}
+        missing = {}
+        for locale, texts in texts_by_locale.items():
+            if not texts:
+                continue
+            if not self.use_memory:
+                missing[locale] = list(texts)
+                continue
+            missing[locale] = []
+            for text in texts:
+                remembered = self.memory.get(text, locale, AI_MODEL)
+                if remembered is None:
+                    missing[locale].append(text)
+                else:
+                    translated[locale][text] = remembered
+            self.metrics.count("memory_hits", len(translated[locale]))
+            self.metrics.count("memory_misses", len(missing[locale]))
+            print(f"🧠 Translation Memory [{locale}]: {len(translated[locale])} Treffer, "
+                  f"{len(missing[locale])} Fehlschläge")
+        
+        batches = [
+            (locale, batch)
+            for locale, texts in missing.items()
+            for batch in make_batches(texts, max_items=self.ai_batch_size)
+        ]
+        if batches and self.dry_run and self.use_ai:
+            # Dry-Run: keine bezahlten Requests, nichts ins Translation Memory
+            print(f"🔎 Dry-Run: {sum(len(t) for t in missing.values())} Texte ohne Übersetzung, "
+                  f"{len(batches)} KI-Batches nicht gesendet")
+            return translated
+        if not batches or not self._ai_available():
+            return translated
+        scheduler = self.scheduler
+        if not scheduler.ready():
+            return translated
+        
+        import asyncio
+        requests_before = self.ai_requests
+        waited_before, limited_before = scheduler.waited, scheduler.rate_limited
+        results = asyncio.run(self._translate_batches(batches))
+        
+        ai_translated = 0
+        for (locale, _), batch_result in zip(batches, results):
+            translated[locale].update(batch_result)
+            ai_translated += len(batch_result)
+        print(f"🤖 {ai_translated}/{sum(len(t) for t in missing.values())} Texte per KI übersetzt "
+              f"({len(batches)} Batches, {len(missing)} Sprachen, "
+              f"{self.ai_requests - requests_before} Requests, ${scheduler.cost_usd:.4f})")
+        if scheduler.rate_limited > limited_before or scheduler.waited - waited_before >= 1:
+            print(f"⏳ Rate-Limit: {scheduler.rate_limited - limited_before}x 429, Worker zusammen "
+                  f"{scheduler.waited - waited_before:.1f}s gedrosselt")
+        self.metrics.count("api_rate_limited", scheduler.rate_limited - limited_before)
+        if scheduler.open_reason is not None and scheduler.reopen_at is None:
+            # Budget/Zugriff: Glossar-only für den Rest des Laufs (auch Einzelübersetzungen)
+            self.use_ai = False
+        return translated
+    
+    async def _translate_batches(self, batches: List[Tuple[str, List[str]]]) -> List[Dict[str, str]]:
+        import asyncio
+        semaphore = asyncio.Semaphore(self.ai_concurrency)
+        scheduler = self.scheduler
+        
+        async def worker(locale: str, batch: List[str]) -> Dict[str, str]:
+            estimate = scheduler.estimate(batch)
+            async with semaphore:
+                for attempt in range(AI_RETRIES + 1):
+                    if not await scheduler.acquire(estimate):
+                        return {}
+                    self.ai_requests += 1
+                    try:
+                        result, usage = await asyncio.to_thread(self._request_batch, batch, locale)
+                    except Exception as e:
+                        delay = scheduler.failure(estimate, e, attempt)
+                        if delay is None or attempt == AI_RETRIES:
+                            if scheduler.open_reason is None:
+                                print(f"⚠️  KI-Batch [{locale}] fehlgeschlagen ({len(batch)} Texte): {e}")
+                            return {}
+                        await scheduler.sleep(delay)
+                        continue
+                    scheduler.success(estimate, usage)
+                    # Sofort sichern, damit ein Abbruch keine bezahlten Übersetzungen verliert
+                    if self.use_memory and not self.dry_run:
+                        self.memory.add(result, locale, AI_MODEL)
+                    return result
+        
+        return await asyncio.gather(*(worker(locale, batch) for locale, batch in batches))
+    
+    def _request_batch(self, batch: List[str], locale: str = "de") -> Tuple[Dict[str, str], object]:
+        """Ein Request für einen Batch; Antwort ist ein JSON-Objekt Original -> Übersetzung
+        
+        Liefert die Übersetzungen und den Token-Verbrauch (usage, falls gemeldet).
+        """
+        chars = sum(len(text) for text in batch)
+        language = LANGUAGE_NAMES.get(locale, locale) + AI_STYLE.get(locale, "")
+        start = time.perf_counter()
         try:
             message = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=100,
+                model=AI_MODEL,
+                max_tokens=min(8192, 256 + chars * 3),
                 messages=[{
                     "role": "user",
-                    "content": f"Translate this UI text to German (informal 'du'). Only return the translation, nothing else: {english_text}"
+                    "content": f"Translate these UI texts to {language} (locale '{locale}'). "
+                               "Return only a JSON object mapping each input string to its translation:\n"
+                               + json.dumps(batch, ensure_ascii=False)
                 }]
             )
-            return message.content[0].text.strip()
-        except:
-            return self.translate_to_german(english_text)
+        except Exception:
+            self.metrics.api_call(time.perf_counter() - start, error=True)
+            raise
+        usage = getattr(message, "usage", None)
+        self.metrics.api_call(time.perf_counter() - start, usage)
+        return parse_batch_response(message.content[0].text, batch), usage
     
     def translate_to_german(self, english_text: str) -> str:
-        """Standard-Übersetzungs-Mappings"""
-        translations = {
-            # Auth
-            "Login": "Anmelden",
-            "Login successful!": "Anmeldung erfolgreich!",
-            "Email address": "E-Mail-Adresse",
-            "Email": "E-Mail",
-            "Password": "Passwort",
-            "Repeat Email": "E-Mail wiederholen",
-            "Repeat Password": "Passwort wiederholen",
-            "Please enter an email address": "Bitte E-Mail-Adresse eingeben",
-            "Please enter a password": "Bitte Passwort eingeben",
-            "Registration": "Registrierung",
-            "Register": "Registrieren",
-            "Registration successful!": "Registrierung erfolgreich!",
-            "Username": "Benutzername",
-            "Confirm password": "Passwort bestätigen",
-            "Confirm with password": "Mit Passwort bestätigen",
-            "Enter your password": "Gib dein Passwort ein",
-            "Please enter your password": "Bitte gib dein Passwort ein",
-            
-            # Deck Management
-            "Create New Deck": "Neues Deck erstellen",
-            "Edit Deck": "Deck bearbeiten",
-            "Delete Deck": "Deck löschen",
-            "Delete Account": "Account löschen",
-            "You haven't created a deck yet": "Du hast noch kein Deck erstellt",
-            "Deck successfully deleted!": "Deck erfolgreich gelöscht!",
-            "Do you really want to delete this deck?": "Möchtest du dieses Deck wirklich löschen?",
-            "Do you really want to delete the deck": "Möchtest du das Deck wirklich löschen",
-            "This action cannot be undone": "Diese Aktion kann nicht rückgängig gemacht werden",
-            "Deck name...": "Deckname...",
-            "deckname...": "Deckname...",
-            "No decks found": "Keine Decks gefunden",
-            "Your Decks": "Deine Decks",
-            "Deck Configuration": "Deck-Konfiguration",
-            "Deck Size": "Deckgröße",
-            "Hand Size": "Handgröße",
-            "Main Deck": "Hauptdeck",
-            "Extra Deck": "Extradeck",
-            "Side Deck": "Sidedeck",
-            "MAIN": "HAUPT",
-            "EXTRA": "EXTRA",
-            "SIDE": "SEITE",
-            "Main": "Main",
-            "Extra": "Extra",
-            "Side": "Side",
-            "is empty": "ist leer",
-            
-            # Cards
-            "Add Card": "Karte hinzufügen",
-            "No Cards found": "Keine Karten gefunden",
-            "No Cardss found": "Keine Karten gefunden",
-            "Search for cards": "Karten suchen",
-            "search Card...": "Karte suchen...",
-            "Card name...": "Kartenname...",
-            "Cardname...": "Kartenname...",
-            "Write a Cardname or use the filters": "Gib einen Kartennamen ein oder nutze die Filter",
-            "This card is forbidden": "Diese Karte ist verboten",
-            "This card is limited": "Diese Karte ist limitiert",
-            "This card is semi-limited": "Diese Karte ist semi-limitiert",
-            "Diese Karte ist limitiert": "Diese Karte ist limitiert",
-            "Diese Karte ist semi-limitiert": "Diese Karte ist semi-limitiert",
-            "Target Cards": "Zielkarten",
-            "Copies": "Kopien",
-            "Required": "Erforderlich",
-            "Card": "Karte",
-            "Cards": "Karten",
-            "cards": "Karten",
-            "card": "Karte",
-            "unknown Card": "Unbekannte Karte",
-            "unknown": "Unbekannt",
-            
-            # Actions
-            "Cancel": "Abbrechen",
-            "cancel": "Abbrechen",
-            "Delete": "Löschen",
-            "Save": "Speichern",
-            "Search": "Suchen",
-            "search": "Suchen",
-            "Filter": "Filter",
-            "Show Filter": "Filter anzeigen",
-            "Reset": "Zurücksetzen",
-            "reset": "Zurücksetzen",
-            "Add": "Hinzufügen",
-            "Edit": "Bearbeiten",
-            "Continue editing": "Weiter bearbeiten",
-            "discard changes?": "Änderungen verwerfen?",
-            
-            # Status
-            "Loading...": "Lädt...",
-            "loading...": "Lädt...",
-            "loading App...": "App wird geladen...",
-            "Error": "Fehler",
-            "Success": "Erfolg",
-            "Error loading": "Fehler beim Laden",
-            "Error deleting": "Fehler beim Löschen",
-            "Error on logout:": "Fehler beim Abmelden:",
-            "Error on saving:": "Fehler beim Speichern:",
-            "Successfully logged out!": "Erfolgreich abgemeldet!",
-            "Logout": "Abmelden",
-            
-            # Navigation
-            "Welcome": "Willkommen",
-            "Home": "Startseite",
-            "home": "Startseite",
-            "Profile": "Profil",
-            "profile": "Profil",
-            "Settings": "Einstellungen",
-            "Comments": "Kommentare",
-            "Comment": "Kommentar",
-            "Write a Comment": "Schreibe einen Kommentar",
-            "Comment added": "Kommentar hinzugefügt",
-            "comment deleted": "Kommentar gelöscht",
-            "No Comments": "Keine Kommentare",
-            
-            # Filter/Search
-            "Filter Search": "Filtersuche",
-            "Type": "Typ",
-            "Race": "Kategorie",
-            "Attribute": "Attribut",
-            "Archetype": "Archetyp",
-            "Level": "Level",
-            "Scale": "Skala",
-            "Link Rating": "Link-Bewertung",
-            "ATK": "ATK",
-            "DEF": "DEF",
-            "TCG Banlist": "TCG Bannliste",
-            "OCG Banlist": "OCG Bannliste",
-            "TCG Bannliste": "TCG Bannliste",
-            "OCG Bannliste": "OCG Bannliste",
-            "Forbidden": "Verboten",
-            "Limited": "Limitiert",
-            "Semi-Limited": "Semi-Limitiert",
-            "Enter a keyword.": "Gib ein Suchwort ein.",
-            "Enter a deck name or select an archetype": "Gib einen Decknamen ein oder wähle einen Archetyp",
-            "Filter by archetype": "Nach Archetyp filtern",
-            "All archetypes": "Alle Archetypen",
-            "Pls choose at least one Filter.": "Bitte wähle mindestens einen Filter.",
-            "Filter reseted": "Filter zurückgesetzt",
-            "Filter get loaded...": "Filter werden geladen...",
-            
-            # Calculator
-            "Probability": "Wahrscheinlichkeit",
-            "Probability Calculator": "Wahrscheinlichkeitsrechner",
-            "AND Mode": "UND-Modus",
-            "OR Mode": "ODER-Modus",
-            
-            # Account
-            "Account Settings": "Kontoeinstellungen",
-            "Account successfully deleted!": "Account erfolgreich gelöscht!",
-            "Do you really want to permanently delete your account?": "Möchtest du deinen Account wirklich dauerhaft löschen?",
-            
-            # Errors
-            "User not found": "Benutzer nicht gefunden",
-            "Benutzer nicht gefunden": "Benutzer nicht gefunden",
-            "User isn't logged in": "Benutzer ist nicht angemeldet",
-            "Not logged in": "Nicht angemeldet",
-            "Kein Benutzer angemeldet": "Kein Benutzer angemeldet",
-            "Deck ID missing! Editing not possible": "Deck-ID fehlt! Bearbeitung nicht möglich",
-            "error: deckid not found to load comments.": "Fehler: Deck-ID nicht gefunden, um Kommentare zu laden.",
-            
-            # Deck Actions
-            "how often adding?": "Wie oft hinzufügen?",
-            "Card deleted": "Karte gelöscht",
-            "How many Cards do you want to delete from": "Wie viele Karten möchtest du löschen von",
-            "Pls choose a deckcoverimage": "Bitte wähle ein Deck-Coverbild",
-            "No Image available for:": "Kein Bild verfügbar für:",
-            "Cover-has been set to": "Cover wurde gesetzt auf",
-            "no working image url found for": "Keine funktionierende Bild-URL gefunden für",
-            "added": "hinzugefügt",
-            "Limit over!": "Limit überschritten!",
-            "you are only allowed to play": "du darfst nur spielen",
-            "copies": "Kopien",
-            "successfully deleted!": "erfolgreich gelöscht!",
-            "Error deleting deck:": "Fehler beim Löschen des Decks:",
-            "Deck sucessfull saved!": "Deck erfolgreich gespeichert!",
-            
-            # Images
-            "loading Cardimages...": "Kartenbilder werden geladen...",
-            "loading Filteroptions..": "Filteroptionen werden geladen...",
-            "TCG Banlist is loading..": "TCG Bannliste wird geladen...",
-            "OCG Banlist is loading...": "OCG Bannliste wird geladen...",
-        }
-        
-        # Versuche exakte Übereinstimmung
-        if english_text in translations:
-            return translations[english_text]
-        
-        # Versuche case-insensitive
-        for key, value in translations.items():
-            if key.lower() == english_text.lower():
-                return value
+        """Übersetzt einen Text: Glossar, dann KI, sonst Original"""
+        translated = self.lookup_glossary(english_text)
+        if translated is not None:
+            return translated
         
         # Fallback: Nutze KI wenn verfügbar
         if self.use_ai:
@@ -348,59 +2892,424 @@ class FlutterLocalizer:
         # Letzter Fallback: Original-Text
         return english_text
     
-    def build_translations(self, found_strings: List[Tuple[Path, str, str, int]]):
-        """Erstellt JSON-Übersetzungsdateien"""
-        seen_texts = {}  # text -> key mapping
+    @property
+    def glossaries(self) -> Dict[str, Glossary]:
+        """Glossare pro Locale, beim ersten Zugriff aus den Glossar-Ordnern geladen"""
+        if self._glossaries is None:
+            self._glossaries = load_glossaries(self.glossary_dirs, self.locales, self.cache_path / "glossaries",
+                                               read_only=self.dry_run)
+        return self._glossaries
+    
+    def lookup_glossary(self, english_text: str, locale: str = "de") -> Optional[str]:
+        """Standard-Übersetzungs-Mappings"""
+        glossary = self.glossaries.get(locale)
+        if glossary is None:
+            return None
+        return glossary.lookup(english_text, fuzzy=self.fuzzy_glossary)
+    
+    def load_locale_manifest(self) -> Dict[str, dict]:
+        """Shards pro Sprache aus manifest.json (leer ohne --split-locales)"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)["locales"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+    
+    def load_locale_file(self, locale: str, core_only: bool = False) -> Dict[str, str]:
+        """Bestehende Locale-Datei als flache Keys (leer, wenn es sie nicht gibt)
         
-        for file_path, line, text, line_num in found_strings:
-            # Skip bereits gesehene Texte
-            if text in seen_texts:
+        Aufgeteilte Sprachen werden aus Kern und allen Shards im Manifest
+        zusammengesetzt (core_only=True: nur der Kern).
+        """
+        shards = {} if core_only else self.load_locale_manifest().get(locale, {}).get("shards", {})
+        paths = [self.assets_path / f"{locale}.json"] + \
+            [self.assets_path / locale / f"{shard}.json" for shard in sorted(shards)]
+        entries = {}
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entries.update(flatten_locale_json(json.load(f)))
+            except (OSError, ValueError):
                 continue
+        return entries
+    
+    def load_key_index(self, skip=()) -> KeyIndex:
+        """KeyIndex mit den Keys der bestehenden Quell-Locale-Datei"""
+        index = KeyIndex()
+        index.load_existing(self.load_locale_file(SOURCE_LOCALE), skip=skip)
+        return index
+    
+    def build_translations(self, found_strings: Iterable[Tuple], translate: bool = True, stage: bool = True):
+        """Erstellt JSON-Übersetzungsdateien für alle Sprachen (translate=False: nur Quellsprache)
+        
+        found_strings wird lazy konsumiert (z.B. iter_strings()); gehalten werden
+        nur die eindeutigen Texte, denn bestehende Keys werden vor neuen vergeben.
+        stage=False lässt die Dateien für stage_translations() offen (apply --rewrite).
+        """
+        source = self.translations[SOURCE_LOCALE]
+        
+        # Jeder Text nur einmal, Kontext vom ersten Vorkommen
+        with self.metrics.phase("scan"):
+            contexts = dict(unique_texts(found_strings))  # text -> context
+        
+        # Keys: spezielle Keys fest, dann Keys aus en.json, dann neue
+        with self.metrics.phase("keys"):
+            specials = special_keys(self.all_locales)
+            index = self.load_key_index(skip=specials)
             
-            # Generiere Key
-            context = str(file_path.stem)
-            key = self.generate_key(text, context)
-            seen_texts[text] = key
-            
-            # Speichere Übersetzungen
-            self.translations_en[key] = text
-            self.translations_de[key] = self.translate_to_german(text)
+            # Bereits ersetzte Texte ('key'.tr()) bleiben mit ihrem Key erhalten
+            for text, key in sorted(index.existing.items(), key=lambda item: item[1]):
+                if key in self.tr_keys and text not in contexts:
+                    contexts[text] = key.split('.')[0]
+            for key, text in specials.items():
+                index.reserve(key, text)
+            keys = {}
+            for text in contexts:
+                key = index.reuse(text)
+                if key is not None:
+                    keys[text] = key
+            # Neue Keys in Textreihenfolge: wer bei einer Kollision den Basis-Key
+            # bekommt, hängt so nicht von der Scan-Reihenfolge ab
+            for text, context in sorted(contexts.items()):
+                if text not in keys:
+                    keys[text] = index.assign(text, self.generate_key(text, context))
+        
+        for text in contexts:
+            source[keys[text]] = text
+        self.text_keys = keys
+        self.key_index = index
         
         # Füge spezielle Keys hinzu
-        special_keys = {
-            "app.title": ("Cardbase", "Cardbase"),
-            "app.loading": ("Loading...", "Lädt..."),
-            "language.english": ("English", "Englisch"),
-            "language.german": ("German", "Deutsch"),
-            "language.switch": ("Switch Language", "Sprache wechseln"),
-            "language.switched_to_english": ("Language switched to English", "Sprache zu Englisch gewechselt"),
-            "language.switched_to_german": ("Language switched to German", "Sprache zu Deutsch gewechselt"),
-        }
+        source.update(specials)
+        
+        if translate:
+            with self.metrics.phase("translate"):
+                self.translate_entries(source)
         
-        for key, (en, de) in special_keys.items():
-            self.translations_en[key] = en
-            self.translations_de[key] = de
+        if stage:
+            self.stage_translations(self.all_locales if translate else [SOURCE_LOCALE])
+    
+    def stage_translations(self, locales: List[str]):
+        """Legt die Locale-Dateien ab und meldet sie (mit Shard-Übersicht)"""
+        print(f"✅ Übersetzungen gespeichert:")
+        for locale_file, count in self.stage_locale_files(locales):
+            print(f"   📄 {locale_file} ({count} Einträge)")
+        self.report_locale_shards(locales)
+    
+    def translate_entries(self, entries: Dict[str, str]):
+        """Übersetzt Quell-Einträge (key -> text) in alle Zielsprachen"""
+        # Glossar pro Sprache; Lücken werden gesammelt (text -> keys)
+        untranslated = {locale: {} for locale in self.locales}
+        for locale in self.locales:
+            target = self.translations[locale]
+            fixed = SPECIAL_TRANSLATIONS.get(locale, {})
+            for key, text in entries.items():
+                translated = fixed.get(key)
+                if translated is None:
+                    translated = self.lookup_glossary(text, locale)
+                    self.metrics.count("glossary_misses" if translated is None else "glossary_hits")
+                if translated is None:
+                    untranslated[locale].setdefault(text, []).append(key)
+                    translated = text
+                target[key] = translated
         
-        # Speichere als JSON
-        en_file = self.assets_path / "en.json"
-        de_file = self.assets_path / "de.json"
+        # Alle Lücken aller Sprachen gesammelt aus Translation Memory / per KI übersetzen
+        if any(untranslated.values()):
+            results = self.translate_locales({l: list(t) for l, t in untranslated.items()})
+            for locale, translated_texts in results.items():
+                for text, translated in translated_texts.items():
+                    for key in untranslated[locale][text]:
+                        self.translations[locale][key] = translated
+    
+    def json_entries(self, locale: str) -> Dict[str, str]:
+        """Einträge für <locale>.json: ohne interpolierte Texte ('$name ...')
         
-        with open(en_file, 'w', encoding='utf-8') as f:
-            json.dump(self.translations_en, f, indent=2, ensure_ascii=False)
+        easy_localization kann sie nicht darstellen (--rewrite lässt sie als
+        Literal stehen); sie landen nur in den ARB-Dateien für gen-l10n.
+        """
+        source = self.translations[SOURCE_LOCALE]
+        arb_only = {key for key, text in source.items() if '$' in text}
+        entries = self.translations[locale]
+        if not arb_only:
+            return entries
+        return {key: value for key, value in entries.items() if key not in arb_only}
+    
+    def stage_locale_files(self, locales: List[str] = None, arb: bool = True) -> List[Tuple[Path, int]]:
+        """Legt Locale-Dateien (Standard: alle) zum Schreiben ab; liefert (datei, einträge)
         
-        with open(de_file, 'w', encoding='utf-8') as f:
-            json.dump(self.translations_de, f, indent=2, ensure_ascii=False)
+        Mit split_locales enthält <locale>.json nur den Kern, jedes weitere
+        Präfix kommt nach <locale>/<präfix>.json; manifest.json hält Keys und
+        Bytes pro Datei. Keys, die eine Datei ohne Anforderung ihres Shards
+        nutzt, bleiben im Kern. Nicht mehr benötigte Shards werden gelöscht.
+        arb=False lässt die ARB-Dateien unverändert.
+        """
+        manifest = self.load_locale_manifest()
+        pinned = self.pinned_shard_keys() if self.split_locales else set()
+        staged = []
+        for locale in locales or self.all_locales:
+            locale_file = self.assets_path / f"{locale}.json"
+            entries = self.json_entries(locale)
+            core, shards = split_locale(entries, pinned) if self.split_locales else (entries, {})
+            files = [(locale_file, core)] + \
+                [(self.assets_path / locale / f"{shard}.json", shards[shard]) for shard in sorted(shards)]
+            sizes = []
+            for path, part in files:
+                write = lambda part=part: iter_locale_json(part, nested=self.nested_json, minify=self.minify_json)
+                self.stage_write(path, write)
+                if self.split_locales:
+                    sizes.append({"keys": len(part), "bytes": sum(len(chunk.encode('utf-8')) for chunk in write())})
+            for shard in sorted(set(manifest.get(locale, {}).get("shards", ())) - set(shards)):
+                self.stage_write(self.assets_path / locale / f"{shard}.json", None)
+            
+            if self.split_locales:
+                manifest[locale] = {"core": sizes[0], "shards": dict(zip(sorted(shards), sizes[1:]))}
+            else:
+                manifest.pop(locale, None)
+            staged.append((locale_file, len(core)))
         
-        print(f"✅ Übersetzungen gespeichert:")
-        print(f"   📄 {en_file} ({len(self.translations_en)} Einträge)")
-        print(f"   📄 {de_file} ({len(self.translations_de)} Einträge)")
+        self.locale_manifest = manifest
+        if manifest:
+            self.stage_write(self.manifest_path, json.dumps(
+                {"version": 1, "locales": dict(sorted(manifest.items()))}, indent=2) + '\n')
+        elif self.manifest_path.exists():
+            self.stage_write(self.manifest_path, None)
+        return staged + (self.stage_arb_files(locales) if arb else [])
+    
+    def shard_key_users(self) -> Dict[Path, Set[str]]:
+        """Datei -> genutzte Keys mit Shard: .tr()-Keys und (bei --rewrite) ersetzte Literale"""
+        users = {}
+        for dart_file, keys in self.file_tr_keys.items():
+            shard_keys = {key for key in keys if locale_shard(key) is not None}
+            if shard_keys:
+                users[dart_file] = shard_keys
+        if self.rewrite:
+            for dart_file, sites in self.string_sites.items():
+                for text in sites.values():
+                    key = self.text_keys.get(text)
+                    if key is not None and '$' not in text and locale_shard(key) is not None:
+                        users.setdefault(dart_file, set()).add(key)
+        return users
+    
+    def unguarded_shard_keys(self) -> Dict[Path, Set[str]]:
+        """Datei -> Keys, deren Shard ihre Klasse nicht anfordert (Inhalt inkl. abgelegter Änderungen)"""
+        unguarded = {}
+        for dart_file, keys in self.shard_key_users().items():
+            try:
+                missing = unrequested_shard_keys(self.read_file(dart_file), keys)
+            except OSError:
+                missing = {key for key in keys if locale_shard(key) is not None}
+            if missing:
+                unguarded[dart_file] = missing
+        return unguarded
+    
+    def pinned_shard_keys(self) -> Set[str]:
+        """Keys, die trotz Shard-Präfix im Kern bleiben (siehe unguarded_shard_keys)"""
+        self.unguarded_shard_files = self.unguarded_shard_keys()
+        return set().union(*self.unguarded_shard_files.values())
+    
+    def report_locale_shards(self, locales: List[str] = None):
+        """Größe jedes Shards und die beim Start gesparten Bytes (nur --split-locales)"""
+        locales = [locale for locale in locales or self.all_locales if locale in self.locale_manifest]
+        if not self.split_locales or not locales:
+            return
+        # Wer welchen Shard braucht
+        users = {}
+        for dart_file, keys in self.shard_key_users().items():
+            for shard in map(locale_shard, keys):
+                users.setdefault(shard, set()).add(dart_file)
+        unguarded = self.unguarded_shard_files
+        if unguarded:
+            files = sorted(os.path.relpath(path, self.project_root) for path in unguarded)
+            print(f"📌 {len(set().union(*unguarded.values()))} Keys bleiben im Kern: genutzt in Klassen ohne "
+                  f"Shard-Anforderung ({len(files)} Dateien: {', '.join(files[:3])}{' …' if len(files) > 3 else ''}); "
+                  f"apply --rewrite setzt Guards in build(), sonst LocaleShards(shards: ...)")
+        
+        shards = sorted(set().union(*(self.locale_manifest[locale]["shards"] for locale in locales)))
+        if not shards:
+            print(f"ℹ️  Keine Locale-Shards: alle Keys haben Kern-Präfixe ({', '.join(sorted(LOCALE_CORE_PREFIXES))})")
+            return
+        print(f"📦 {len(shards)} Locale-Shards (assets/translations/<sprache>/<shard>.json):")
+        for shard in shards:
+            info = {locale: self.locale_manifest[locale]["shards"].get(shard) for locale in locales}
+            keys = max(part["keys"] for part in info.values() if part)
+            sizes = "  ".join(f"{locale} {part['bytes'] / 1024:5.1f} KB" if part else f"{locale}      -   "
+                              for locale, part in info.items())
+            files = sorted(os.path.relpath(path, self.project_root) for path in users.get(shard, ()))
+            shown = ", ".join(files[:2]) + (f" (+{len(files) - 2})" if len(files) > 2 else "")
+            print(f"   {shard:<12} {keys:>5} Keys  {sizes}  {shown}")
+        for locale in locales:
+            core = self.locale_manifest[locale]["core"]["bytes"]
+            lazy = sum(part["bytes"] for part in self.locale_manifest[locale]["shards"].values())
+            saved = lazy / (core + lazy) * 100 if core + lazy else 0
+            print(f"🚀 Start ({locale}): {core / 1024:.1f} KB statt {(core + lazy) / 1024:.1f} KB "
+                  f"(-{lazy / 1024:.1f} KB, {saved:.0f}% weniger), Rest per LocaleShards nachgeladen")
+    
+    def stage_arb_files(self, locales: List[str] = None) -> List[Tuple[Path, int]]:
+        """Legt ARB-Dateien für gen-l10n aus denselben Keys ab (nur mit l10n.yaml)
+        
+        Ordner und Vorlage kommen aus arb-dir/template-arb-file; geschrieben
+        werden wie beim JSON nur Dateien, deren Inhalt sich ändert.
+        """
+        if self.l10n_config is None:
+            return []
+        arb_dir = self.project_root / self.l10n_config.get("arb-dir", "lib/l10n")
+        template = self.l10n_config.get("template-arb-file", f"app_{SOURCE_LOCALE}.arb")
+        names = arb_identifiers(self.translations[SOURCE_LOCALE])
+        arbs, skipped = build_arb(self.translations, locales or self.all_locales, names)
+        if skipped:
+            print(f"⚠️  {len(skipped)} Texte mit {{ }} nicht als ARB darstellbar (z.B. {skipped[0]})")
+        staged = []
+        for locale, arb in arbs.items():
+            path = arb_dir / (template if locale == SOURCE_LOCALE else arb_file_name(template, locale))
+            self.stage_write(path, json.dumps(arb, ensure_ascii=False, indent=2) + '\n')
+            staged.append((path, sum(1 for name in arb if not name.startswith('@'))))
+        return staged
+    
+    def refresh_files(self, paths) -> Tuple[int, int]:
+        """Scannt geänderte Dateien neu und patcht die Übersetzungen inkrementell
+        
+        Neue Texte bekommen Keys und Übersetzungen, Texte ohne Vorkommen (und
+        ohne 'key'.tr()) fallen heraus. Liefert (neue, entfernte) Texte.
+        """
+        for path in paths:
+            dart_file = Path(path)
+            try:
+                _, digest, (hits, tr_refs) = scan_dart_file(str(dart_file))
+            except FileNotFoundError:
+                self.string_sites.pop(dart_file, None)
+                self.site_digests.pop(dart_file, None)
+                self.file_tr_keys.pop(dart_file, None)
+                continue
+            except (OSError, ValueError):
+                continue  # z.B. halb geschrieben; kommt mit dem nächsten Event
+            self.string_sites[dart_file] = {(start, end, tuple(opens)): text
+                                            for text, _, start, end, opens in hits}
+            self.site_digests[dart_file] = digest
+            self.file_tr_keys[dart_file] = {key for key, _ in tr_refs}
+        self.tr_keys = set().union(*self.file_tr_keys.values())
+        
+        # Kontext vom ersten Vorkommen, wie in build_translations
+        contexts = {}
+        for dart_file in sorted(self.string_sites):
+            for text in self.string_sites[dart_file].values():
+                contexts.setdefault(text, dart_file.stem)
+        
+        removed = [text for text, key in self.text_keys.items()
+                   if text not in contexts and key not in self.tr_keys]
+        for text in removed:
+            key = self.text_keys.pop(text)
+            self.key_index.key_to_text.pop(key, None)
+            self.key_index.text_to_key.pop(text, None)
+            for locale in self.all_locales:
+                self.translations[locale].pop(key, None)
+                if self.locale_lines is not None:
+                    self.locale_lines[locale].remove(key)
+        
+        added = {}
+        for text, context in contexts.items():
+            if text not in self.text_keys:
+                key = self.key_index.reuse(text) or self.key_index.assign(text, self.generate_key(text, context))
+                self.text_keys[text] = key
+                added[key] = text
+        if added:
+            self.translations[SOURCE_LOCALE].update(added)
+            self.translate_entries(added)
+            if self.locale_lines is not None:
+                for locale in self.all_locales:
+                    for key, text in added.items():
+                        if '$' not in text:  # interpolierte Texte nur im ARB
+                            self.locale_lines[locale].set(key, self.translations[locale][key])
+        
+        if added or removed:
+            if self.locale_lines is None:
+                self.stage_locale_files()  # verschachtelt/aufgeteilt: komplett neu
+            else:
+                for locale, lines in self.locale_lines.items():
+                    self.stage_write(self.assets_path / f"{locale}.json", lines.text())
+                self.stage_arb_files()
+            self.commit_writes()
+        return len(added), len(removed)
+    
+    def watch(self, debounce: float = WATCH_DEBOUNCE, stop: threading.Event = None):
+        """Beobachtet lib/ und aktualisiert die Locale-Dateien bei jeder Änderung"""
+        self.build_translations(self.iter_strings(sites=True))
+        self.commit_writes()
+        if not self.nested_json and not self.split_locales:
+            self.locale_lines = {locale: LocaleLines(self.json_entries(locale), minify=self.minify_json)
+                                 for locale in self.all_locales}
+        
+        watcher = create_watcher(self.lib_path)
+        print(f"👀 Beobachte {self.lib_path} ({type(watcher).__name__}) - Strg+C beendet")
+        try:
+            while stop is None or not stop.is_set():
+                changed = watcher.wait(None if stop is None else 0.1)
+                if not changed:
+                    continue
+                # Burst von Speichervorgängen abwarten
+                more = watcher.wait(debounce)
+                while more:
+                    changed |= more
+                    more = watcher.wait(debounce)
+                
+                start = time.perf_counter()
+                with self.metrics.phase("refresh"):
+                    added, removed = self.refresh_files(sorted(changed))
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"🔄 {len(changed)} Datei(en) geändert: +{added} / -{removed} Texte ({elapsed:.0f} ms)")
+        except KeyboardInterrupt:
+            print("\n👋 Watch beendet")
+        finally:
+            watcher.close()
+    
+    def rewrite_sources(self):
+        """Ersetzt gefundene Literale in lib/ durch 'key'.tr() (ein Splice pro Datei)
+        
+        Nutzt die Offsets der Extraktion; Dateien, deren Inhalt sich seitdem
+        geändert hat, bleiben unangetastet. Mit split_locales bekommt build()
+        jeder Klasse, die Keys aus Shards nutzt, einen Guard (die Keys dürfen
+        dann aus <locale>.json heraus).
+        """
+        files = 0
+        sites_total = 0
+        changed = []
+        for dart_file, sites in self.string_sites.items():
+            try:
+                digest, content = read_dart_source(dart_file)
+            except FileNotFoundError:
+                digest, content = None, None
+            if digest != self.site_digests.get(dart_file):
+                changed.append(dart_file)
+                continue
+            new_content, count = rewrite_dart_source(content, sites, self.text_keys)
+            if count:
+                self.stage_write(dart_file, new_content)
+                files += 1
+                sites_total += count
+        print(f"✅ {sites_total} Literale in {files} Dateien durch .tr() ersetzt")
+        
+        if self.split_locales:
+            guarded = 0
+            for dart_file, keys in self.shard_key_users().items():
+                if dart_file in changed:
+                    continue
+                content = self.read_file(dart_file)
+                new_content, count = guard_build_methods(content, keys)
+                if new_content != content:
+                    self.stage_write(dart_file, new_content)
+                    guarded += 1
+            if guarded:
+                print(f"✅ Shard-Guards in {guarded} Dateien: build() lädt die Shards vor dem ersten Frame")
+        
+        changed = [os.path.relpath(path, self.project_root) for path in changed]
+        if changed:
+            print(f"⚠️  {len(changed)} Dateien seit der Extraktion geändert, nicht ersetzt "
+                  f"(apply erneut ausführen): {', '.join(sorted(changed)[:3])}")
     
     def update_pubspec(self):
         """Fügt easy_localization zu pubspec.yaml hinzu"""
         pubspec_path = self.project_root / "pubspec.yaml"
         
-        with open(pubspec_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = self.read_file(pubspec_path)
         
         # Füge Dependency hinzu
         if "easy_localization" not in content:
@@ -425,8 +3334,21 @@ class FlutterLocalizer:
                 content += "\n\nflutter:\n  assets:\n    - assets/translations/\n"
             print("✅ assets/translations/ zu flutter.assets hinzugefügt")
         
-        with open(pubspec_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Asset-Ordner gelten nicht rekursiv: Shard-Ordner einzeln eintragen
+        if self.split_locales:
+            shard_dirs = [f"    - assets/translations/{l}/\n" for l in self.all_locales
+                          if f"assets/translations/{l}/" not in content]
+            if shard_dirs:
+                content = re.sub(r'( *- assets/translations/\n)', lambda m: m.group(1) + ''.join(shard_dirs),
+                                 content, count=1)
+                print(f"✅ {len(shard_dirs)} Shard-Ordner zu flutter.assets hinzugefügt")
+        else:
+            # Fehlende Asset-Ordner sind für flutter ein Build-Fehler
+            content, removed = re.subn(r'(?m)^ *- assets/translations/[\w-]+/\n', '', content)
+            if removed:
+                print(f"✅ {removed} Shard-Ordner aus flutter.assets entfernt")
+        
+        self.stage_write(pubspec_path, content)
         
         print("✅ pubspec.yaml aktualisiert")
     
@@ -436,22 +3358,48 @@ class FlutterLocalizer:
 // AUTO-GENERATED by auto_localize_flutter.py
 // DO NOT EDIT MANUALLY - Run script again to regenerate
 
+import 'dart:convert';
+
 import 'package:flutter_riverpod/flutter_riverpod.dart';
 import 'package:easy_localization/easy_localization.dart';
 import 'package:flutter/material.dart';
+import 'package:tcg_app/class/Firebase/YugiohCard/getCardData.dart';
 import 'package:tcg_app/class/sharedPreference.dart';
 
+/// Unterstützte Sprachen (die erste ist der Standard)
+const supportedLanguages = <String>[__SUPPORTED_LANGUAGES__];
+
+/// Algolia-Index pro Sprache
+const algoliaIndexNames = <String, String>{
+__ALGOLIA_INDEX_NAMES__
+};
+
+/// Namen für die Übersetzungs-Keys language.<name>
+const languageKeyNames = <String, String>{
+__LANGUAGE_KEY_NAMES__
+};
+
+/// Übersetzungs-Key der Meldung nach dem Sprachwechsel
+String languageSwitchedKey(Locale locale) =>
+    'language.switched_to_${languageKeyNames[locale.languageCode]}';
+
+/// Nächste Sprache in der Reihenfolge von supportedLanguages
+Locale nextLanguage(Locale current) {
+  final index = supportedLanguages.indexOf(current.languageCode);
+  return Locale(supportedLanguages[(index + 1) % supportedLanguages.length]);
+}
+
 /// Notifier für Sprach-Management
 class LanguageNotifier extends StateNotifier<Locale> {
   final SaveData _saveData;
 
-  LanguageNotifier(this._saveData) : super(const Locale('en')) {
+  LanguageNotifier(this._saveData) : super(Locale(supportedLanguages.first)) {
     _loadLanguage();
   }
 
   Future<void> _loadLanguage() async {
     final savedLang = await _saveData.loadWithKey('app_language');
-    if (savedLang != null && (savedLang == 'en' || savedLang == 'de')) {
+    if (savedLang != null && supportedLanguages.contains(savedLang)) {
       state = Locale(savedLang);
     }
   }
@@ -462,10 +3410,7 @@ class LanguageNotifier extends StateNotifier<Locale> {
   }
 
   Future<void> toggleLanguage() async {
-    final newLocale = state.languageCode == 'en' 
-        ? const Locale('de') 
-        : const Locale('en');
-    await setLanguage(newLocale);
+    await setLanguage(nextLanguage(state));
   }
 }
 
@@ -478,24 +3423,187 @@ final languageNotifierProvider = StateNotifierProvider<LanguageNotifier, Locale>
 /// Provider für Algolia Index basierend auf Sprache
 final algoliaIndexProvider = Provider<String>((ref) {
   final locale = ref.watch(languageNotifierProvider);
-  return locale.languageCode == 'de' ? 'cards_de' : 'cards';
+  return algoliaIndexNames[locale.languageCode] ?? 'cards';
+});
+
+/// Eine CardData pro Algolia-Index: nach dem Sprachwechsel zurück dieselbe
+/// Instanz (samt ihrer Facetten-/Bannlisten-Caches) statt einer neuen
+final cardDataForIndexProvider = Provider.family<CardData, String>((ref, indexName) {
+  return CardData(customIndexName: indexName);
+});
+
+/// Maximal gemerkte Suchergebnisse pro Algolia-Index
+const searchCacheCapacity = __SEARCH_CACHE_SIZE__;
+
+/// Zuletzt genutzte Suchergebnisse eines Index (LRU); Key sind Suche + Query/Filter
+class SearchResultCache {
+  SearchResultCache({this.capacity = searchCacheCapacity});
+
+  final int capacity;
+  // LinkedHashMap: Reihenfolge = letzte Nutzung, der erste Eintrag fliegt zuerst
+  final _results = <String, Future<List<Map<String, dynamic>>>>{};
+
+  Future<List<Map<String, dynamic>>> get(
+    List<Object?> key,
+    Future<List<Map<String, dynamic>>> Function() search,
+  ) {
+    final id = jsonEncode(key);
+    final cached = _results.remove(id);
+    final result = cached ?? search();
+    _results[id] = result;
+    if (_results.length > capacity) {
+      _results.remove(_results.keys.first);
+    }
+    if (cached == null) {
+      // Fehlgeschlagene Suchen nicht merken
+      result.then((_) {}, onError: (Object _) {
+        if (identical(_results[id], result)) _results.remove(id);
+      });
+    }
+    return result;
+  }
+}
+
+/// Such-Cache pro Algolia-Index (bleibt über Sprachwechsel erhalten)
+final searchResultCacheProvider = Provider.family<SearchResultCache, String>((ref, indexName) {
+  return SearchResultCache();
 });
+
+/// Suche über den Cache des aktuellen Index: gleiche Suche in gleicher Sprache
+/// kommt ohne Algolia-Request zurück
+Future<List<Map<String, dynamic>>> cachedCardSearch(
+  Ref ref,
+  List<Object?> key,
+  Future<List<Map<String, dynamic>>> Function() search,
+) {
+  final algoliaIndex = ref.watch(algoliaIndexProvider);
+  return ref.watch(searchResultCacheProvider(algoliaIndex)).get(key, search);
+}
 '''
+        provider_code = (provider_code
+            .replace("__SUPPORTED_LANGUAGES__", ", ".join(f"'{l}'" for l in self.all_locales))
+            .replace("__ALGOLIA_INDEX_NAMES__", "\n".join(
+                f"  '{l}': '{algolia_index_name(l)}'," for l in self.all_locales))
+            .replace("__LANGUAGE_KEY_NAMES__", "\n".join(
+                f"  '{l}': '{language_key_name(l)}'," for l in self.all_locales))
+            .replace("__SEARCH_CACHE_SIZE__", str(CARD_SEARCH_CACHE_SIZE)))
         
         provider_path = self.lib_path / "providers" / "language_provider.dart"
-        provider_path.parent.mkdir(exist_ok=True)
         
-        with open(provider_path, 'w', encoding='utf-8') as f:
-            f.write(provider_code)
+        self.stage_write(provider_path, provider_code)
         
         print(f"✅ Language Provider erstellt: {provider_path}")
     
+    def create_locale_shard_loader(self):
+        """Erstellt den AssetLoader, der Locale-Shards erst bei Bedarf lädt (--split-locales)
+        
+        Ohne aufgeteilte Locale-Dateien wird ein früher erzeugter Loader entfernt.
+        """
+        loader_path = self.lib_path / "class" / "locale_shards.dart"
+        if not self.split_locales:
+            if loader_path.exists():
+                self.stage_write(loader_path, None)
+            return
+        
+        loader_code = '''// lib/class/locale_shards.dart
+// AUTO-GENERATED by auto_localize_flutter.py
+// DO NOT EDIT MANUALLY - Run script again to regenerate
+
+import 'dart:convert';
+
+import 'package:easy_localization/easy_localization.dart';
+import 'package:flutter/services.dart';
+import 'package:flutter/widgets.dart';
+
+/// Lädt beim Start nur <sprache>.json (Kern); <sprache>/<shard>.json kommt
+/// erst dazu, wenn ein Screen den Shard anfordert (localeShardsReady, LocaleShards)
+class ShardedAssetLoader extends AssetLoader {
+  const ShardedAssetLoader();
+
+  static final _requested = <String>{};
+  static final _loaded = <String>{};
+  static final _loading = <String, Future<void>>{};
+  static final _files = <String, Map<String, dynamic>>{};
+  // Sprache -> die von load() gelieferte Map; easy_localization liest weiter
+  // daraus, nachgeladene Shards landen direkt darin (setLocale mit derselben
+  // Sprache lädt nicht neu)
+  static final _maps = <String, Map<String, dynamic>>{};
+  static String _path = 'assets/translations';
+
+  static Future<Map<String, dynamic>> _read(String file) async {
+    final cached = _files[file];
+    if (cached != null) return cached;
+    Map<String, dynamic> data;
+    try {
+      data = json.decode(await rootBundle.loadString(file)) as Map<String, dynamic>;
+    } on FlutterError {
+      data = const {}; // Shard gibt es in dieser Sprache (noch) nicht
+    }
+    return _files[file] = data;
+  }
+
+  static Future<void> _add(String shard) async {
+    for (final entry in _maps.entries) {
+      entry.value.addAll(await _read('$_path/${entry.key}/$shard.json'));
+    }
+    _loaded.add(shard);
+  }
+
+  @override
+  Future<Map<String, dynamic>> load(String path, Locale locale) async {
+    _path = path;
+    final code = locale.languageCode;
+    final translations = <String, dynamic>{...await _read('$path/$code.json')};
+    for (final shard in _requested) {
+      translations.addAll(await _read('$path/$code/$shard.json'));
+    }
+    return _maps[code] = translations;
+  }
+}
+
+/// Fordert Shards an; neue Shards werden in alle geladenen Sprachen gemischt, bekannte kosten nichts
+Future<void> loadLocaleShards(Iterable<String> shards) {
+  for (final shard in shards) {
+    if (ShardedAssetLoader._requested.add(shard)) {
+      ShardedAssetLoader._loading[shard] = ShardedAssetLoader._add(shard);
+    }
+  }
+  return Future.wait(shards.map((shard) => ShardedAssetLoader._loading[shard]!));
+}
+
+/// Guard für build() (von apply --rewrite eingefügt):
+/// if (!localeShardsReady(context, const ['deck'])) return const SizedBox.shrink();
+/// false, solange die Shards laden; danach wird das Widget neu gebaut
+bool localeShardsReady(BuildContext context, List<String> shards) {
+  if (shards.every(ShardedAssetLoader._loaded.contains)) return true;
+  loadLocaleShards(shards).then((_) {
+    if (context.mounted) (context as Element).markNeedsBuild();
+  });
+  return false;
+}
+
+/// Baut child, sobald die Shards geladen sind, z.B.
+/// LocaleShards(shards: const ['deck'], child: DeckScreen())
+class LocaleShards extends StatelessWidget {
+  const LocaleShards({super.key, required this.shards, required this.child});
+
+  final List<String> shards;
+  final Widget child;
+
+  @override
+  Widget build(BuildContext context) =>
+      localeShardsReady(context, shards) ? child : const SizedBox.shrink();
+}
+'''
+        self.stage_write(loader_path, loader_code)
+        
+        print(f"✅ Shard-Loader erstellt: {loader_path}")
+    
     def update_main_dart(self):
         """Aktualisiert main.dart mit EasyLocalization"""
         main_path = self.lib_path / "main.dart"
         
-        with open(main_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = self.read_file(main_path)
         
         # Füge Imports hinzu
         imports_to_add = []
@@ -506,6 +3614,11 @@ final algoliaIndexProvider = Provider<String>((ref) {
         if "import 'package:tcg_app/providers/language_provider.dart';" not in content:
             imports_to_add.append("import 'package:tcg_app/providers/language_provider.dart';")
         
+        if self.split_locales and LOCALE_SHARDS_IMPORT not in content:
+            imports_to_add.append(LOCALE_SHARDS_IMPORT)
+        elif not self.split_locales:
+            content = content.replace(LOCALE_SHARDS_IMPORT + '\n', '')
+        
         if imports_to_add:
             # Finde letzte import-Zeile
             import_matches = list(re.finditer(r'^import .*?;$', content, re.MULTILINE))
@@ -515,7 +3628,8 @@ final algoliaIndexProvider = Provider<String>((ref) {
                 content = content[:insert_pos] + '\n' + '\n'.join(imports_to_add) + content[insert_pos:]
         
         # Ersetze main() Funktion
-        main_pattern = r'void main\(\) async \{.*?runApp\([^)]+\);\s*\}'
+        # runApp(...) enthält verschachtelte Klammern: bis zum ersten ");" + "}" matchen
+        main_pattern = r'void main\(\) async \{.*?runApp\(.*?\);\s*\}'
         
         new_main = '''void main() async {
   WidgetsFlutterBinding.ensureInitialized();
@@ -525,7 +3639,7 @@ final algoliaIndexProvider = Provider<String>((ref) {
   
   runApp(
     EasyLocalization(
-      supportedLocales: const [Locale('en'), Locale('de')],
+      supportedLocales: const [__SUPPORTED_LOCALES__],
       path: 'assets/translations',
       fallbackLocale: const Locale('en'),
       child: const ProviderScope(child: MainApp()),
@@ -533,8 +3647,25 @@ final algoliaIndexProvider = Provider<String>((ref) {
   );
 }'''
         
+        supported_locales = ", ".join(f"Locale('{l}')" for l in self.all_locales)
+        new_main = new_main.replace("__SUPPORTED_LOCALES__", supported_locales)
+        
         if not re.search(r'EasyLocalization\(', content):
             content = re.sub(main_pattern, new_main, content, flags=re.DOTALL)
+        else:
+            # Sprachliste bei erneutem Lauf aktualisieren (--locales)
+            content = re.sub(
+                r'supportedLocales: const \[[^\]]*\]',
+                f'supportedLocales: const [{supported_locales}]',
+                content
+            )
+        
+        # Aufgeteilte Locale-Dateien: Kern beim Start, Shards über den eigenen AssetLoader
+        if self.split_locales and "assetLoader: const ShardedAssetLoader()" not in content:
+            content = re.sub(r"(\n( *)path: 'assets/translations',)",
+                             r"\1\n\2assetLoader: const ShardedAssetLoader(),", content, count=1)
+        elif not self.split_locales:
+            content = re.sub(r"\n *assetLoader: const ShardedAssetLoader\(\),", "", content)
         
         # Aktualisiere MaterialApp in build-Methode
         if "localizationsDelegates: context.localizationDelegates" not in content:
@@ -546,8 +3677,7 @@ final algoliaIndexProvider = Provider<String>((ref) {
       '''
             content = re.sub(material_app_pattern, material_app_replacement, content)
         
-        with open(main_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        self.stage_write(main_path, content)
         
         print("✅ main.dart aktualisiert")
     
@@ -555,8 +3685,7 @@ final algoliaIndexProvider = Provider<String>((ref) {
         """Fügt Sprach-Button zur AppBar hinzu"""
         appbar_path = self.lib_path / "class" / "common" / "appbar.dart"
         
-        with open(appbar_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = self.read_file(appbar_path)
         
         # Füge Imports hinzu
         imports_to_add = []
@@ -579,13 +3708,9 @@ final algoliaIndexProvider = Provider<String>((ref) {
         // 🌍 Language Switch Button
         IconButton(
           icon: const Icon(Icons.language),
-          tooltip: context.locale.languageCode == 'en' 
-              ? 'Switch to German' 
-              : 'Zu Englisch wechseln',
+          tooltip: 'language.switch'.tr(),
           onPressed: () async {
-            final newLocale = context.locale.languageCode == 'en' 
-                ? const Locale('de') 
-                : const Locale('en');
+            final newLocale = nextLanguage(context.locale);
             
             await context.setLocale(newLocale);
             ref.read(languageNotifierProvider.notifier).setLanguage(newLocale);
@@ -594,9 +3719,7 @@ final algoliaIndexProvider = Provider<String>((ref) {
               ScaffoldMessenger.of(context).showSnackBar(
                 SnackBar(
                   content: Text(
-                    newLocale.languageCode == 'de' 
-                        ? 'Sprache zu Deutsch gewechselt' 
-                        : 'Language switched to English'
+                    languageSwitchedKey(newLocale).tr(),
                   ),
                   duration: const Duration(seconds: 1),
                 ),
@@ -626,8 +3749,7 @@ final algoliaIndexProvider = Provider<String>((ref) {
             appbar_pattern = r'(AppBar\([^{]*\{)'
             content = re.sub(appbar_pattern, r'\1\n      ' + new_actions, content)
         
-        with open(appbar_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        self.stage_write(appbar_path, content)
         
         print("✅ AppBar mit Sprach-Button aktualisiert")
     
@@ -635,8 +3757,7 @@ final algoliaIndexProvider = Provider<String>((ref) {
         """Aktualisiert CardData für dynamischen Algolia-Index"""
         card_data_path = self.lib_path / "class" / "Firebase" / "YugiohCard" / "getCardData.dart"
         
-        with open(card_data_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = self.read_file(card_data_path)
         
         # 1. Füge customIndexName-Property hinzu
         if "final String? customIndexName;" not in content:
@@ -663,109 +3784,384 @@ final algoliaIndexProvider = Provider<String>((ref) {
             content
         )
         
-        with open(card_data_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # 4. Ergebnis-Caches pro Instanz statt static: es gibt eine CardData pro Index
+        #    (cardDataForIndexProvider), sonst liefert cards_de die Treffer aus 'cards'.
+        #    Der Zeitstempel ebenso, sonst verlängert ein clearAllCaches() auf einem
+        #    Index die Gültigkeit der Caches aller anderen
+        content = re.sub(
+            r'^( *)static ((?:final )?[A-Z][^=;\n]*?\b(?:' + '|'.join(CARD_DATA_INDEX_CACHES) + r')\b)',
+            r'\1\2', content, flags=re.MULTILINE
+        )
+        
+        self.stage_write(card_data_path, content)
         
         print("✅ CardData für dynamischen Algolia-Index aktualisiert")
     
     def update_app_providers(self):
-        """Aktualisiert app_providers.dart für dynamischen CardData-Index"""
+        """Aktualisiert app_providers.dart: eine CardData pro Algolia-Index, Suchen über deren Cache
+        
+        Danach wird die Verdrahtung statisch geprüft (check_app_providers).
+        """
         providers_path = self.lib_path / "providers" / "app_providers.dart"
         
-        with open(providers_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = self.read_file(providers_path)
         
         # Füge Import hinzu
-        if "import 'package:tcg_app/providers/language_provider.dart';" not in content:
+        if LANGUAGE_PROVIDER_IMPORT not in content:
             import_matches = list(re.finditer(r'^import .*?;$', content, re.MULTILINE))
             if import_matches:
                 last_import = import_matches[-1]
                 insert_pos = last_import.end()
-                content = content[:insert_pos] + '\nimport \'package:tcg_app/providers/language_provider.dart\';\n' + content[insert_pos:]
+                content = content[:insert_pos] + '\n' + LANGUAGE_PROVIDER_IMPORT + '\n' + content[insert_pos:]
         
-        # Ersetze cardDataProvider
-        old_provider_pattern = r'final cardDataProvider = Provider<CardData>\(\(ref\) \{\s*return CardData\(\);\s*\}\);'
+        # Ersetze cardDataProvider (Block- oder Pfeil-Form, auch ältere generierte Fassung):
+        # die CardData kommt aus der Family, ein Sprachwechsel zurück liefert dieselbe Instanz
+        provider = CARD_DATA_PROVIDER.search(content)
+        definition = provider and dart_call_arguments(content, provider.start(1))
+        if definition:
+            end = definition[0] + content.startswith(';', definition[0])
+            content = content[:provider.start()] + CARD_DATA_PROVIDER_CODE + content[end:]
         
-        new_provider = '''final cardDataProvider = Provider<CardData>((ref) {
-  final algoliaIndex = ref.watch(algoliaIndexProvider);
-  return CardData(customIndexName: algoliaIndex);
-});'''
+        # Algolia-Suchen über den LRU-Cache des Index
+        content, cached = cache_card_searches(content)
+        
+        self.stage_write(providers_path, content)
         
-        if re.search(old_provider_pattern, content):
-            content = re.sub(old_provider_pattern, new_provider, content)
+        problems = check_app_providers(content)
+        if problems:
+            print(f"⚠️  app_providers.dart: {len(problems)} Probleme in der CardData-Verdrahtung")
+            for problem in problems:
+                print(f"   • {problem}")
         else:
-            # Falls Pattern nicht gefunden, suche nach einfacherer Version
-            simple_pattern = r'(final cardDataProvider = Provider<CardData>\(\(ref\) \{)\s*return CardData\(\);'
-            if re.search(simple_pattern, content):
-                content = re.sub(
-                    simple_pattern,
-                    r'\1\n  final algoliaIndex = ref.watch(algoliaIndexProvider);\n  return CardData(customIndexName: algoliaIndex);',
-                    content
-                )
+            print(f"✅ app_providers.dart aktualisiert ({cached} Suchen neu über den Ergebnis-Cache)")
+    
+    def run_extract(self, list_strings: bool = False):
+        """extract: Texte finden, Keys vergeben, nur die Quell-Locale-Datei schreiben
+        
+        list_strings=True gibt zusätzlich jede Fundstelle mit Quelltextzeile aus.
+        """
+        print("🔍 Extrahiere Texte aus Dart-Dateien...")
+        found_strings = self.iter_strings(lines=list_strings)
+        if list_strings:
+            found_strings = self.list_strings(found_strings)
+        self.build_translations(found_strings, translate=False)
+        with self.metrics.phase("write"):
+            self.commit_writes()
+    
+    def list_strings(self, found_strings: Iterable[Tuple]) -> Iterator[Tuple]:
+        """Gibt Fundstellen (datei:zeile: quelltext) aus und reicht sie weiter"""
+        root = str(self.project_root)
+        for hit in found_strings:
+            dart_file, text, line_num, line = hit
+            print(f"   {os.path.relpath(dart_file, root)}:{line_num}: {line.strip()}")
+            yield hit
+    
+    def run_translate(self):
+        """translate: alle Locale-Dateien schreiben, Dart-Code bleibt unverändert"""
+        print("🔍 Extrahiere Texte aus Dart-Dateien...")
+        print("🌍 Erstelle Übersetzungsdateien...")
+        self.build_translations(self.iter_strings())
+        with self.metrics.phase("write"):
+            self.commit_writes()
+    
+    def verify(self, prune: bool = False) -> bool:
+        """verify: gleicht Code und Locale-Dateien ab, ohne zu schreiben (außer prune)
         
-        with open(providers_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        Fehlende Keys/Texte machen die Prüfung ungültig; ungenutzte Keys und
+        unübersetzte Einträge (Zielsprache == Quellsprache) sind Warnungen.
+        prune=True entfernt die ungenutzten Keys aus allen Locale-Dateien.
+        """
+        start = time.perf_counter()
+        with self.metrics.phase("scan"):
+            code_texts = {text for text, _ in unique_texts(self.iter_strings(locations=True))}
+        files = {locale: self.load_locale_file(locale) for locale in self.all_locales}
+        source = files[SOURCE_LOCALE]
+        specials = special_keys(self.all_locales)
         
-        print("✅ app_providers.dart aktualisiert")
+        # Genutzt: per .tr() referenziert, als Literal noch im Code (Key wie in
+        # build_translations über den Text) oder spezieller Key der App
+        text_keys = self.load_key_index(skip=specials).existing
+        used = set(self.key_locations) | set(specials)
+        used.update(text_keys[text] for text in code_texts if text in text_keys)
+        
+        def where(key: str) -> str:
+            locations = self.key_locations.get(key, [])
+            shown = ", ".join(f"{os.path.relpath(path, self.project_root)}:{line}" for path, line in locations[:3])
+            return shown + (f" (+{len(locations) - 3})" if len(locations) > 3 else "")
+        
+        # Interpolierte Texte stehen nur im ARB (siehe json_entries)
+        errors = [(f"Texte im Code ohne Key in {SOURCE_LOCALE}.json",
+                   sorted(text for text in code_texts - set(source.values()) if '$' not in text))]
+        for locale in self.all_locales:
+            errors.append((f"per .tr() genutzte Keys fehlen in {locale}.json",
+                           [f"{key}  ({where(key)})" for key in sorted(self.key_locations) if key not in files[locale]]))
+        # Aufgeteilt: Keys aus Shards nur in Klassen, die den Shard anfordern
+        if SOURCE_LOCALE in self.load_locale_manifest():
+            core = self.load_locale_file(SOURCE_LOCALE, core_only=True)
+            sharded = {}  # datei -> Keys aus Shards
+            for key, locations in self.key_locations.items():
+                if key in source and key not in core:
+                    for path, _ in locations:
+                        sharded.setdefault(path, set()).add(key)
+            missing = {path: unrequested_shard_keys(self.read_file(path), keys) for path, keys in sharded.items()}
+            unloaded = [f"{key}  ({os.path.relpath(path, self.project_root)}:{line})"
+                        for key in sorted(self.key_locations) for path, line in self.key_locations[key]
+                        if key in missing.get(path, ())]
+            errors.append(("Keys aus Locale-Shards ohne localeShardsReady in build() ihrer Klasse bzw. LocaleShards "
+                           "(apply --rewrite setzt Guards)", unloaded))
+        # Nach apply: CardData-Verdrahtung wie generiert (eine Instanz pro Index, Suchen gecacht)
+        try:
+            providers = self.read_file(self.lib_path / "providers" / "app_providers.dart")
+        except OSError:
+            providers = ""
+        if LANGUAGE_PROVIDER_IMPORT in providers:
+            errors.append(("Probleme in der CardData-Verdrahtung (app_providers.dart)",
+                           check_app_providers(providers)))
+        unused = sorted(key for key in source if key not in used)
+        warnings = [(f"ungenutzte Keys in {SOURCE_LOCALE}.json", unused)]
+        for locale in self.locales:
+            fixed = SPECIAL_TRANSLATIONS.get(locale, {})
+            warnings.append((f"unübersetzt in {locale}.json ({locale} == {SOURCE_LOCALE})", [
+                key for key, text in sorted(source.items())
+                if files[locale].get(key) == text and re.search(r'[a-zA-Z]', text)
+                and fixed.get(key) != text and self.lookup_glossary(text, locale) != text
+            ]))
+        
+        problems = 0
+        for (label, items), symbol in [(item, '❌') for item in errors] + [(item, '⚠️ ') for item in warnings]:
+            print(f"{symbol if items else '✅'} {len(items)} {label}")
+            for item in items[:20]:
+                print(f"   • {item}")
+            if len(items) > 20:
+                print(f"   … und {len(items) - 20} weitere")
+            if symbol == '❌':
+                problems += len(items)
+        calls = sum(len(locations) for locations in self.key_locations.values())
+        print(f"⏱️  verify: {self.file_count} Dateien, {len(self.key_locations)} Keys "
+              f"({calls} .tr()-Aufrufe) in {(time.perf_counter() - start) * 1000:.0f} ms")
+        
+        if prune and unused:
+            dead = set(unused)
+            for locale in self.all_locales:
+                self.translations[locale] = {key: value for key, value in files[locale].items() if key not in dead}
+            # ARB bleibt: die interpolierten Texte dort fehlen in den Locale-Dateien
+            self.stage_locale_files(arb=False)
+            print(f"🧹 {len(unused)} ungenutzte Keys werden entfernt")
+            with self.metrics.phase("write"):
+                self.commit_writes()
+        return problems == 0
     
-    def create_backup(self):
-        """Erstellt Backup der wichtigsten Dateien"""
-        backup_dir = self.project_root / "localization_backup"
-        backup_dir.mkdir(exist_ok=True)
+    def restore(self, run_id: str = None, list_runs: bool = False) -> bool:
+        """restore: stellt den Stand vor einem Lauf wieder her (ohne run_id: letzter Lauf)
         
-        files_to_backup = [
-            self.lib_path / "main.dart",
-            self.lib_path / "class" / "common" / "appbar.dart",
-            self.lib_path / "providers" / "app_providers.dart",
-            self.lib_path / "class" / "Firebase" / "YugiohCard" / "getCardData.dart",
-            self.project_root / "pubspec.yaml",
-        ]
+        Der aktuelle Stand wird dabei selbst wieder gesichert, ein Restore
+        lässt sich also rückgängig machen.
+        """
+        store = self.backups
+        if list_runs:
+            runs = store.list_runs()
+            print(f"📦 {len(runs)} Backup-Läufe in {self.backup_path}")
+            for manifest in runs:
+                print(f"   {manifest['id']}  {manifest.get('command') or '-':<9} {len(manifest['files'])} Dateien")
+            return True
+        
+        manifest = store.load_run(run_id)
+        if manifest is None:
+            print(f"❌ Backup-Lauf nicht gefunden: {run_id or '(keine Läufe vorhanden)'}")
+            return False
+        
+        print(f"♻️  Stelle Lauf {manifest['id']} wieder her ({len(manifest['files'])} Dateien)")
+        created = []
+        for rel_path, digest in manifest["files"].items():
+            path = self.project_root / rel_path
+            if digest is None:
+                if path.exists():
+                    created.append(path)  # vom Lauf neu angelegt
+            else:
+                self.stage_write(path, store.read_blob(digest).decode('utf-8'))
+        with self.metrics.phase("write"):
+            self.commit_writes()
+        
+        for path in created:
+            rel_path = os.path.relpath(path, self.project_root)
+            if self.dry_run:
+                print(f"🔎 Dry-Run: {rel_path} würde gelöscht")
+                continue
+            store.save(path)
+            path.unlink()
+            print(f"🗑️  {rel_path} gelöscht")
+        store.flush()
+        if store.run_id:
+            print(f"📂 Vorheriger Stand gesichert als Lauf {store.run_id}")
+        return True
+    
+    def translate_cards(self, records: List[dict],
+                        known: Dict[Tuple[str, str], Dict[str, Optional[str]]]) -> Dict[str, List[dict]]:
+        """Übersetzt einen Block Karten in alle Zielsprachen
+        
+        known merkt sich pro (Sprache, Feld) die Übersetzung jedes Facetten-
+        und Namenswerts (None: weder im Glossar noch im Translation Memory)
+        über alle Blöcke eines Exports; Beschreibungen gehen gesammelt an
+        translate_locales (Translation Memory, dann KI-Batches).
+        """
+        for locale in self.locales:
+            for field in CARD_FACET_FIELDS + CARD_NAME_FIELDS:
+                cache = known.setdefault((locale, field), {})
+                for record in records:
+                    value = record.get(field)
+                    if isinstance(value, str) and value and value not in cache:
+                        translated = self.lookup_glossary(value, locale)
+                        if translated is None and self.use_memory:
+                            translated = self.memory.get(value, locale, AI_MODEL)
+                        self.metrics.count("glossary_misses" if translated is None else "glossary_hits")
+                        cache[value] = translated
+        
+        descriptions = list(dict.fromkeys(
+            record[field] for record in records for field in CARD_TEXT_FIELDS
+            if isinstance(record.get(field), str) and record[field].strip()))
+        translated_texts = self.translate_locales({locale: descriptions for locale in self.locales})
+        
+        localized = {}
+        for locale in self.locales:
+            texts = translated_texts.get(locale, {})
+            localized[locale] = []
+            for record in records:
+                record = dict(record)
+                for field in CARD_FACET_FIELDS + CARD_NAME_FIELDS:
+                    value = record.get(field)
+                    translated = known[locale, field].get(value) if isinstance(value, str) else None
+                    if translated:
+                        record[field] = translated
+                for field in CARD_TEXT_FIELDS:
+                    value = record.get(field)
+                    if isinstance(value, str) and value in texts:
+                        record[field] = texts[value]
+                localized[locale].append(record)
+        return localized
+    
+    def export_cards(self, dump: Path, out_dir: Path = None, upload_url: str = None,
+                     upload_headers: Dict[str, str] = None, chunk_size: int = CARD_CHUNK,
+                     batch_size: int = ALGOLIA_BATCH, concurrency: int = ALGOLIA_CONCURRENCY):
+        """cards: Karten-Dump übersetzen, als NDJSON pro Index (cards_<sprache>) schreiben, optional hochladen
         
-        for file_path in files_to_backup:
-            if file_path.exists():
-                import shutil
-                backup_path = backup_dir / file_path.name
-                shutil.copy2(file_path, backup_path)
+        Der Dump wird in Blöcken zu chunk_size Karten gestreamt, der Speicher
+        hängt also nicht von der Größe des Dumps ab. Karten ohne objectID
+        bekommen die "id" des Dumps, ohne beides werden sie übersprungen.
+        """
+        out_dir = Path(out_dir) if out_dir else self.project_root / "build" / "algolia"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        paths = {locale: out_dir / f"{algolia_index_name(locale)}.ndjson" for locale in self.locales}
+        known = {}
+        exported = skipped = 0
         
-        print(f"✅ Backup erstellt in: {backup_dir}")
+        # Erst nach vollständigem Export an die Zielnamen verschieben
+        outputs = {locale: open(path.with_name(path.name + ".tmp"), 'w', encoding='utf-8')
+                   for locale, path in paths.items()}
+        start = time.perf_counter()
+        try:
+            with self.metrics.phase("cards"):
+                for chunk in chunked(iter_card_records(dump), chunk_size):
+                    records = []
+                    for record in chunk:
+                        if isinstance(record, dict) and record.get("objectID") in (None, "") and "id" in record:
+                            record["objectID"] = str(record["id"])
+                        if isinstance(record, dict) and record.get("objectID") not in (None, ""):
+                            records.append(record)
+                        else:
+                            skipped += 1
+                    for locale, localized in self.translate_cards(records, known).items():
+                        outputs[locale].writelines(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+                                                   for record in localized)
+                    exported += len(records)
+                    print(f"🃏 {exported} Karten übersetzt ({exported / (time.perf_counter() - start):.0f}/s)")
+        except BaseException:
+            for output in outputs.values():
+                output.close()
+                os.unlink(output.name)
+            raise
+        for locale, path in paths.items():
+            outputs[locale].close()
+            os.replace(outputs[locale].name, path)
+        elapsed = time.perf_counter() - start
+        self.metrics.count("cards", exported)
+        self.metrics.count("cards_skipped", skipped)
+        
+        print(f"✅ {exported} Karten in {elapsed:.1f}s exportiert ({exported / elapsed:.0f} Karten/s)"
+              + (f", {skipped} ohne objectID/id übersprungen" if skipped else ""))
+        for locale, path in paths.items():
+            print(f"   📄 {path}")
+            # Facetten-Lücken als Vorlage für das Domänen-Glossar (Kartennamen bleiben oft original)
+            missing = sorted({value for field in CARD_FACET_FIELDS
+                              for value, translated in known.get((locale, field), {}).items() if translated is None})
+            missing_path = out_dir / f"missing_{locale}.tsv"
+            if missing:
+                with open(missing_path, 'w', encoding='utf-8') as f:
+                    f.writelines(f"{value}\t\n" for value in missing)
+                print(f"   ⚠️  {len(missing)} Facettenwerte ohne Übersetzung: {missing_path} "
+                      f"(ergänzt nach glossaries/domain/{locale}.tsv übernehmen)")
+            elif missing_path.exists():
+                missing_path.unlink()
+        
+        if upload_url:
+            with self.metrics.phase("upload"):
+                for locale, path in paths.items():
+                    index = algolia_index_name(locale)
+                    start = time.perf_counter()
+                    uploaded = upload_ndjson(path, upload_url, index, upload_headers, batch_size, concurrency)
+                    elapsed = time.perf_counter() - start
+                    self.metrics.count("cards_uploaded", uploaded)
+                    print(f"☁️  {uploaded} Objekte nach '{index}' hochgeladen in {elapsed:.1f}s "
+                          f"({uploaded / elapsed:.0f} Objekte/s)")
     
     def run(self):
-        """Führt komplette Lokalisierung durch"""
+        """apply: Führt komplette Lokalisierung durch"""
         print("=" * 60)
         print("🚀 VOLLAUTOMATISCHE FLUTTER LOKALISIERUNG")
         print("=" * 60)
         print()
         
-        # 0. Backup
-        print("📦 Erstelle Backup...")
-        self.create_backup()
-        print()
-        
-        # 1. Setup
-        print("📁 Erstelle Ordnerstruktur...")
-        self.setup_folders()
-        print()
+        if not self.dry_run:
+            # 1. Setup (Backup: automatisch vor jedem Schreiben)
+            print("📁 Erstelle Ordnerstruktur...")
+            with self.metrics.phase("setup"):
+                self.setup_folders()
+            print()
         
-        # 2. Extrahiere Strings
+        # 2./3. Extrahiere Strings und erstelle Übersetzungen (als Pipeline)
         print("🔍 Extrahiere Texte aus Dart-Dateien...")
-        found_strings = self.extract_strings()
-        print()
-        
-        # 3. Erstelle Übersetzungen
         print("🌍 Erstelle Übersetzungsdateien...")
-        self.build_translations(found_strings)
+        self.build_translations(self.iter_strings(sites=self.rewrite), stage=not self.rewrite)
         print()
         
+        # 3b. Ersetze Literale im Quellcode (optional); die Locale-Dateien erst
+        #     danach, denn welche Keys in Shards dürfen, hängt an den Guards
+        if self.rewrite:
+            print("✏️  Ersetze Texte im Quellcode durch .tr()...")
+            with self.metrics.phase("rewrite"):
+                self.rewrite_sources()
+            self.stage_translations(self.all_locales)
+            print()
+        
         # 4. Aktualisiere Dateien
         print("🔧 Aktualisiere Flutter-Dateien...")
-        self.update_pubspec()
-        self.create_language_provider()
-        self.update_main_dart()
-        self.update_appbar()
-        self.update_card_data()
-        self.update_app_providers()
+        with self.metrics.phase("update"):
+            self.update_pubspec()
+            self.create_language_provider()
+            self.create_locale_shard_loader()
+            self.update_main_dart()
+            self.update_appbar()
+            self.update_card_data()
+            self.update_app_providers()
+        print()
+        
+        # 5. Schreibe nur tatsächlich geänderte Dateien
+        with self.metrics.phase("write"):
+            self.commit_writes()
         print()
         
+        if self.dry_run:
+            return
+        
         print("=" * 60)
         print("✅ LOKALISIERUNG ERFOLGREICH ABGESCHLOSSEN!")
         print("=" * 60)
@@ -777,24 +4173,138 @@ final algoliaIndexProvider = Provider<String>((ref) {
         print("3️⃣  Klicke auf 🌍-Button in der AppBar zum Testen")
         print()
         print("⚠️  WICHTIG: Algolia Setup")
-        print("   → Erstelle einen Index 'cards_de' in Algolia")
-        print("   → Importiere deutsche Kartendaten")
+        for locale in self.locales:
+            print(f"   → Erstelle einen Index '{algolia_index_name(locale)}' in Algolia")
+        print("   → Importiere übersetzte Kartendaten: python auto_localize_flutter.py cards --dump <karten.json> --upload")
         print("   → Konfiguriere gleiche Searchable Attributes wie 'cards'")
         print()
-        print("📂 Backup-Ordner: localization_backup/")
-        print("   (Falls etwas schiefgeht, kannst du Dateien wiederherstellen)")
+        if self.backups.run_id:
+            print(f"📂 Backup: localization_backup/ (Lauf {self.backups.run_id})")
+            print(f"   Falls etwas schiefgeht: python auto_localize_flutter.py restore --run {self.backups.run_id}")
         print()
         print("=" * 60)
 
+
+COMMANDS = ("extract", "translate", "apply", "verify", "restore", "cards")
+
+
 def main():
     """Hauptfunktion"""
     import sys
+    import argparse
+    
+    # Gemeinsame Optionen aller Projekt-Befehle
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("project_root", nargs="?", default=".", help="Pfad zum Flutter-Projekt")
+    common.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Anzahl paralleler Prozesse für die Extraktion")
+    common.add_argument("--locales", default="de",
+                        help="Zielsprachen, kommagetrennt (z.B. de,fr,es,it,ja)")
+    common.add_argument("--no-cache", action="store_true",
+                        help="Extraktions-Cache (.localize_cache/) ignorieren")
+    common.add_argument("--glossary", action="append", metavar="ORDNER",
+                        help="Glossar-Ordner mit <locale>.tsv/.json (vor glossaries/project|domain|locale; mehrfach möglich)")
+    common.add_argument("--metrics", metavar="DATEI",
+                        help="Phasen-Zeiten, Durchsatz, KI-Latenzen und Trefferquoten als JSON schreiben")
+    common.add_argument("--profile", action="store_true",
+                        help="Phasen unter cProfile ausführen (.localize_cache/profile/<phase>.pstats)")
+    
+    # Optionen für alles, was Dateien schreibt bzw. übersetzt
+    writing = argparse.ArgumentParser(add_help=False)
+    writing.add_argument("--dry-run", action="store_true",
+                         help="Nichts schreiben, nur Unified Diff der Änderungen ausgeben")
+    writing.add_argument("--nested-json", action="store_true",
+                         help="Locale-Dateien verschachtelt schreiben (login.email -> {login: {email}})")
+    writing.add_argument("--minify", action="store_true",
+                         help="Locale-Dateien minifiziert schreiben (Produktions-Build)")
+    writing.add_argument("--no-arb", action="store_true",
+                         help="Keine ARB-Dateien für gen-l10n schreiben (sonst automatisch mit l10n.yaml)")
+    writing.add_argument("--split-locales", action="store_true",
+                         help="Locale-Dateien pro Key-Präfix aufteilen (Kern + Shards, lazy geladen); "
+                              "bleibt aktiv, solange assets/translations/manifest.json existiert")
+    writing.add_argument("--no-split-locales", action="store_true",
+                         help="Aufgeteilte Locale-Dateien wieder zu einer Datei pro Sprache zusammenführen")
+    
+    translating = argparse.ArgumentParser(add_help=False)
+    translating.add_argument("--no-memory", action="store_true",
+                             help="Translation Memory (.localize_cache/translation_memory.jsonl) ignorieren")
+    translating.add_argument("--fuzzy-glossary", action="store_true",
+                             help="Glossar-Treffer auch bei abweichendem Whitespace/Satzzeichen am Ende")
+    translating.add_argument("--ai-batch-size", type=int, default=AI_BATCH_SIZE,
+                             help="Texte pro KI-Request")
+    translating.add_argument("--ai-concurrency", type=int, default=AI_CONCURRENCY,
+                             help="Maximal gleichzeitige KI-Requests")
+    translating.add_argument("--ai-rpm", type=float, default=AI_REQUESTS_PER_MINUTE, metavar="N",
+                             help="Rate-Limit des Accounts: KI-Requests pro Minute")
+    translating.add_argument("--ai-tpm", type=float, default=AI_TOKENS_PER_MINUTE, metavar="N",
+                             help="Rate-Limit des Accounts: Tokens pro Minute")
+    translating.add_argument("--ai-budget-usd", type=float, metavar="USD",
+                             help="Kostenobergrenze pro Lauf; danach nur Glossar/Translation Memory")
+    translating.add_argument("--ai-max-tokens", type=int, metavar="N",
+                             help="Token-Obergrenze pro Lauf; danach nur Glossar/Translation Memory")
+    translating.add_argument("--ai-base-url", metavar="URL",
+                             help="Messages-API unter URL ansprechen, z.B. einen lokalen Fake-Server "
+                                  "(ohne anthropic-Paket)")
+    
+    parser = argparse.ArgumentParser(
+        description="Vollautomatische Flutter Lokalisierung",
+        epilog="Ohne Befehl wird 'apply' ausgeführt.",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="BEFEHL")
+    extract_parser = commands.add_parser("extract", parents=[common, writing],
+                                         help=f"Texte extrahieren und nur {SOURCE_LOCALE}.json schreiben")
+    extract_parser.add_argument("--list", action="store_true",
+                                help="Jede Fundstelle mit Datei, Zeile und Quelltext ausgeben")
+    translate_parser = commands.add_parser("translate", parents=[common, writing, translating],
+                                           help="Alle Locale-Dateien schreiben (Dart-Code bleibt unverändert)")
+    translate_parser.add_argument("--watch", action="store_true",
+                                  help="lib/ beobachten und Locale-Dateien bei jeder Änderung aktualisieren")
+    apply_parser = commands.add_parser("apply", parents=[common, writing, translating],
+                                       help="Komplette Lokalisierung inkl. Dart-Dateien (Standard)")
+    apply_parser.add_argument("--rewrite", action="store_true",
+                              help="Gefundene Texte in lib/ durch 'key'.tr() ersetzen")
+    # Nur für eine klare Fehlermeldung (früher auch bei apply erlaubt)
+    apply_parser.add_argument("--watch", action="store_true", help=argparse.SUPPRESS)
+    verify_parser = commands.add_parser("verify", parents=[common, writing],
+                                        help="Prüfen, ob Locale-Dateien zum Code passen (Exit-Code 1 bei Problemen)")
+    verify_parser.add_argument("--prune", action="store_true",
+                               help="Ungenutzte Keys aus allen Locale-Dateien entfernen")
+    restore_parser = commands.add_parser("restore", parents=[common, writing],
+                                         help="Dateien aus dem Backup (localization_backup/) wiederherstellen")
+    restore_parser.add_argument("--run", metavar="ID",
+                                help="Backup-Lauf (Standard: der letzte)")
+    restore_parser.add_argument("--list", action="store_true",
+                                help="Backup-Läufe auflisten")
+    cards_parser = commands.add_parser("cards", parents=[common, translating],
+                                       help="Karten-Dump für die Algolia-Indizes cards_<sprache> übersetzen (NDJSON)")
+    cards_parser.add_argument("--dump", required=True, metavar="DATEI",
+                              help="Karten als NDJSON, JSON-Array oder {\"data\": [...]} (Felder wie CardData)")
+    cards_parser.add_argument("--out", metavar="ORDNER",
+                              help="Zielordner für <index>.ndjson (Standard: build/algolia)")
+    cards_parser.add_argument("--chunk", type=int, default=CARD_CHUNK,
+                              help="Karten pro Übersetzungsblock (begrenzt den Speicher)")
+    cards_parser.add_argument("--upload", action="store_true",
+                              help="Per Batch-API nach Algolia hochladen (ALGOLIA_APP_ID, ALGOLIA_API_KEY)")
+    cards_parser.add_argument("--algolia-url", metavar="URL",
+                              help="Endpunkt statt https://<ALGOLIA_APP_ID>.algolia.net, z.B. ein lokaler Stand-in")
+    cards_parser.add_argument("--upload-batch", type=int, default=ALGOLIA_BATCH,
+                              help="Objekte pro Batch-Request")
+    cards_parser.add_argument("--upload-concurrency", type=int, default=ALGOLIA_CONCURRENCY,
+                              help="Gleichzeitige Batch-Requests")
+    
+    # Kompatibel zum alten Aufruf: ohne Befehl -> apply
+    argv = sys.argv[1:]
+    if not argv or argv[0] not in COMMANDS + ("-h", "--help"):
+        argv = ["apply"] + argv
+    args = parser.parse_args(argv)
+    if args.command == "apply" and args.watch:
+        # Watch aktualisiert nur Locale- und ARB-Dateien; --rewrite, pubspec,
+        # main.dart und die Provider liefen sonst stillschweigend nicht
+        parser.error("--watch gibt es nur für translate: erst 'apply' (ggf. mit --rewrite), "
+                     "dann 'translate --watch'")
     
     # Ermittle Projekt-Root
-    if len(sys.argv) > 1:
-        project_root = sys.argv[1]
-    else:
-        project_root = "."
+    project_root = args.project_root
     
     # Prüfe ob es ein Flutter-Projekt ist
     project_path = Path(project_root)
@@ -803,17 +4313,74 @@ def main():
         print(f"   Gesucht in: {project_path.absolute()}")
         print()
         print("💡 Verwendung:")
-        print("   python auto_localize_flutter.py [projekt-pfad]")
+        print("   python auto_localize_flutter.py [befehl] [projekt-pfad] [--jobs N]")
         print()
         print("   Beispiele:")
         print("   python auto_localize_flutter.py")
         print("   python auto_localize_flutter.py /path/to/flutter/project")
+        print("   python auto_localize_flutter.py translate --locales de,fr")
+        print("   python auto_localize_flutter.py verify")
         sys.exit(1)
     
+    metrics = Metrics(project_path / ".localize_cache" / "profile" if args.profile else None)
+    metrics.info.update(command=args.command, project=str(project_path.resolve()), jobs=args.jobs,
+                        locales=args.locales, python=sys.version.split()[0])
+    
     # Führe Lokalisierung durch
     try:
-        localizer = FlutterLocalizer(project_root)
-        localizer.run()
+        localizer = FlutterLocalizer(
+            project_root,
+            jobs=args.jobs,
+            use_cache=not args.no_cache,
+            use_memory=not getattr(args, "no_memory", False),
+            fuzzy_glossary=getattr(args, "fuzzy_glossary", False),
+            locales=[l.strip() for l in args.locales.split(",") if l.strip()],
+            dry_run=getattr(args, "dry_run", False),
+            nested_json=getattr(args, "nested_json", False),
+            minify_json=getattr(args, "minify", False),
+            arb=not getattr(args, "no_arb", False),
+            split_locales=True if getattr(args, "split_locales", False) else
+            False if getattr(args, "no_split_locales", False) else None,
+            rewrite=getattr(args, "rewrite", False),
+            client=MessagesHttpClient(args.ai_base_url, os.environ.get("ANTHROPIC_API_KEY", ""))
+            if getattr(args, "ai_base_url", None) else None,
+            ai_batch_size=getattr(args, "ai_batch_size", AI_BATCH_SIZE),
+            ai_concurrency=getattr(args, "ai_concurrency", AI_CONCURRENCY),
+            ai_requests_per_minute=getattr(args, "ai_rpm", AI_REQUESTS_PER_MINUTE),
+            ai_tokens_per_minute=getattr(args, "ai_tpm", AI_TOKENS_PER_MINUTE),
+            ai_budget_usd=getattr(args, "ai_budget_usd", None),
+            ai_max_tokens=getattr(args, "ai_max_tokens", None),
+            metrics=metrics,
+            glossary_dirs=args.glossary,
+        )
+        if args.command == "extract":
+            localizer.run_extract(list_strings=args.list)
+        elif args.command == "verify":
+            if not localizer.verify(prune=args.prune):
+                sys.exit(1)
+        elif args.command == "restore":
+            if not localizer.restore(args.run, list_runs=args.list):
+                sys.exit(1)
+        elif args.command == "cards":
+            app_id = os.environ.get("ALGOLIA_APP_ID", "")
+            upload_url = None
+            if args.upload:
+                upload_url = args.algolia_url or (f"https://{app_id}.algolia.net" if app_id else None)
+                if upload_url is None:
+                    print("❌ --upload braucht ALGOLIA_APP_ID (oder --algolia-url)")
+                    sys.exit(1)
+            localizer.export_cards(
+                Path(args.dump), args.out, upload_url,
+                {"X-Algolia-Application-Id": app_id,
+                 "X-Algolia-API-Key": os.environ.get("ALGOLIA_API_KEY", "")},
+                max(1, args.chunk), max(1, args.upload_batch), max(1, args.upload_concurrency))
+        elif args.command == "translate":
+            if args.watch:
+                localizer.watch()
+            else:
+                localizer.run_translate()
+        else:
+            localizer.run()
     except Exception as e:
         print()
         print("=" * 60)
@@ -825,11 +4392,18 @@ def main():
         print("🔧 Mögliche Lösungen:")
         print("1. Stelle sicher, dass alle Dart-Dateien gültigen Syntax haben")
         print("2. Prüfe, ob du Schreibrechte im Projekt-Ordner hast")
-        print("3. Stelle Dateien aus dem Backup wieder her")
+        print("3. Stelle Dateien aus dem Backup wieder her (restore --list, restore --run <id>)")
         print()
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        # Auch bei Fehlern/Exit-Code 1, damit Regressionen sichtbar bleiben
+        if args.metrics:
+            metrics.save(Path(args.metrics))
+            print(f"📊 Metriken: {args.metrics}")
+        if args.profile:
+            print(f"🔬 Profile: {metrics.profile_dir}/<phase>.pstats")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
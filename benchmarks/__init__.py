@@ -0,0 +1,10 @@
+"""Benchmarks für auto_localize_flutter.py
+
+Aus dem Repo-Root: python -m benchmarks [--only NAME]; Ergebnisse der Suite
+landen in .benchmarks/ (nicht eingecheckt).
+"""
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "auto_localize_flutter.py"
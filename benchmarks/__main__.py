@@ -0,0 +1,65 @@
+"""python -m benchmarks [--only NAME] [Suite-Optionen] (aus dem Repo-Root)"""
+
+import argparse
+import sys
+
+from benchmarks.micro import (
+    STARTUP_BUDGET_MS, run_benchmark, run_cards_benchmark, run_glossary_benchmark, run_memory_benchmark,
+    run_ratelimit_benchmark, run_scanner_benchmark, run_startup_benchmark, run_watch_benchmark,
+)
+from benchmarks.suite import BENCHMARK_RESULTS, run_benchmark_suite
+
+
+def main():
+    """Führt alle oder einen ausgewählten Benchmark aus; Exit-Code 1 bei Budget-Überschreitung oder Regression"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmarks für auto_localize_flutter.py")
+    parser.add_argument("--only", choices=("startup", "glossary", "scanner", "watch", "ratelimit", "cards", "extract", "memory", "suite"),
+                        help="Nur diesen Benchmark ausführen")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="Prozesse für den Extraktions-Benchmark")
+    parser.add_argument("--startup-budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="Import-Budget für den Start ohne KI")
+    parser.add_argument("--files", type=int, default=500,
+                        help="Suite: Anzahl erzeugter Dart-Dateien")
+    parser.add_argument("--lines", type=int, default=60,
+                        help="Suite: Zeilen pro Datei")
+    parser.add_argument("--density", type=float, default=0.7,
+                        help="Suite: Anteil der Zeilen mit Text")
+    parser.add_argument("--duplicates", type=float, default=0.3,
+                        help="Suite: Anteil doppelter Texte")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Suite: Seed des Generators")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Suite: Durchläufe pro Benchmark")
+    parser.add_argument("--results", default=BENCHMARK_RESULTS,
+                        help="Suite: Ordner für Ergebnisse (JSON pro Lauf, Standard: .benchmarks/)")
+    parser.add_argument("--compare", metavar="DATEI",
+                        help="Suite: mit diesem Ergebnis vergleichen (Standard: letzter Lauf)")
+    args = parser.parse_args()
+    
+    ok = True
+    if args.only in (None, "startup"):
+        ok = run_startup_benchmark(args.startup_budget_ms)
+    if args.only in (None, "glossary"):
+        run_glossary_benchmark()
+    if args.only in (None, "scanner"):
+        run_scanner_benchmark()
+    if args.only in (None, "watch"):
+        run_watch_benchmark()
+    if args.only in (None, "ratelimit"):
+        run_ratelimit_benchmark()
+    if args.only in (None, "cards"):
+        run_cards_benchmark()
+    if args.only in (None, "extract"):
+        run_benchmark(jobs=args.jobs)
+    if args.only in (None, "memory"):
+        ok = run_memory_benchmark() and ok
+    if args.only in (None, "suite"):
+        ok = run_benchmark_suite(args.files, args.lines, args.density, args.duplicates, args.seed,
+                                 args.repeat, args.results, args.compare) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
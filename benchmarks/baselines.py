@@ -0,0 +1,123 @@
+"""Frühere Implementierungen als Vergleichsbasis für die Benchmarks (nicht im Script)"""
+
+import hashlib
+import re
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+
+# Muster des bisherigen Regex-Scanners.
+# Die Gruppe "text" enthält den String; alle Muster sind auf eine Zeile beschränkt.
+STRING_PATTERNS = (
+    r'Text\([\'"](?P<text>[^\'"\n]+)[\'"]\)',
+    r'Text\([\'"](?P<text>[^\'"\n]+)[\'"],[^\S\n]*style:',
+    r'hintText:[^\S\n]*[\'"](?P<text>[^\'"\n]+)[\'"]',
+    r'labelText:[^\S\n]*[\'"](?P<text>[^\'"\n]+)[\'"]',
+    r'label:[^\S\n]*(?:const[^\S\n]+)?Text\([\'"](?P<text>[^\'"\n]+)[\'"]\)',
+    r'SnackBar\(content:[^\S\n]*Text\([\'"](?P<text>[^\'"\n]+)[\'"]\)',
+    r'Exception\([\'"](?P<text>[^\'"\n]+)[\'"]\)',
+    r'child:[^\S\n]*(?:const[^\S\n]+)?Text\([\'"](?P<text>[^\'"\n]+)[\'"]\)',
+    r'title:[^\S\n]*(?:const[^\S\n]+)?Text\([\'"](?P<text>[^\'"\n]+)[\'"]\)',
+    r'subtitle:[^\S\n]*(?:const[^\S\n]+)?Text\([\'"](?P<text>[^\'"\n]+)[\'"]\)',
+    r'tooltip:[^\S\n]*[\'"](?P<text>[^\'"\n]+)[\'"]',
+)
+
+# Bereits lokalisierte Stellen: 'key'.tr(...)
+TR_CALL = re.compile(r'''['"]([^'"\n$]+)['"]\.tr\(''')
+
+
+class RegexStringScanner:
+    """Bisheriger Scanner: findet alle STRING_PATTERNS in einem Durchlauf"""
+    VERSION = "3"
+    
+    def __init__(self, patterns=STRING_PATTERNS):
+        self.patterns = [re.compile(p) for p in patterns]
+        # Eine Alternation; die benannte Gruppe p<i> verrät das Muster
+        self.combined = re.compile('|'.join(
+            p.replace('(?P<text>', f'(?P<p{i}>')
+            for i, p in enumerate(patterns)
+        ))
+        self.has_letter = re.compile(r'[a-zA-Z]')
+        # Ändert sich das Musterset oder die Trefferlogik, wird der Extraktions-Cache ungültig
+        self.fingerprint = hashlib.sha1(
+            '\n'.join((self.VERSION,) + tuple(patterns)).encode('utf-8')
+        ).hexdigest()
+    
+    def scan(self, content: str) -> Tuple[List[Tuple[str, int, int, int]], List[str]]:
+        """Liefert ([(text, zeilennummer, start, ende)], [tr-keys])
+        
+        Treffer in der Reihenfolge des alten Zeilen-Scans; start/ende umfassen
+        das String-Literal inklusive Anführungszeichen. Bereits übersetzte
+        Literale ('key'.tr()) landen stattdessen sortiert in den tr-keys.
+        """
+        # Zeilenanfänge einmal vorberechnen, Zeilennummer per Binärsuche
+        line_starts = [0]
+        pos = content.find('\n')
+        while pos != -1:
+            line_starts.append(pos + 1)
+            pos = content.find('\n', pos + 1)
+        
+        hits = []
+        last_end = [0] * len(self.patterns)
+        search = self.combined.search
+        pos = 0
+        
+        while True:
+            match = search(content, pos)
+            if match is None:
+                break
+            start = match.start()
+            first = int(match.lastgroup[1:])
+            
+            # Weitere Muster können an derselben Stelle treffen
+            for index in range(first, len(self.patterns)):
+                if index == first:
+                    hit, group = match, match.lastgroup
+                else:
+                    hit = self.patterns[index].match(content, start)
+                    if hit is None:
+                        continue
+                    group = 'text'
+                text = hit.group(group)
+                # Wie re.finditer: Treffer eines Musters überlappen sich nicht
+                if start < last_end[index]:
+                    continue
+                last_end[index] = hit.end()
+                literal_start, literal_end = hit.start(group) - 1, hit.end(group) + 1
+                if content.startswith('.tr(', literal_end):
+                    continue
+                if self.has_letter.search(text) and not text.startswith('$'):
+                    hits.append((bisect_right(line_starts, start), index, start, text,
+                                 literal_start, literal_end))
+            
+            # Ab der nächsten Position weitersuchen, um verschachtelte Treffer
+            # (z.B. Text(...) innerhalb von child: Text(...)) zu finden
+            pos = start + 1
+        
+        hits.sort()
+        results = [(text, line_num, literal_start, literal_end)
+                   for line_num, _, _, text, literal_start, literal_end in hits]
+        tr_keys = sorted({m.group(1) for m in TR_CALL.finditer(content)})
+        return results, tr_keys
+
+
+class LinearGlossary:
+    """Bisheriges Glossar: Mapping pro Aufruf neu aufgebaut, Case-Treffer per linearer .lower()-Suche"""
+    
+    def __init__(self, translations: Dict[str, str]):
+        self.translations = dict(translations)
+    
+    def lookup(self, english_text: str) -> Optional[str]:
+        # Früher ein Dict-Literal im Methodenrumpf, also bei jedem Aufruf neu gebaut
+        translations = dict(self.translations)
+        
+        # Versuche exakte Übereinstimmung
+        if english_text in translations:
+            return translations[english_text]
+        
+        # Versuche case-insensitive
+        for key, value in translations.items():
+            if key.lower() == english_text.lower():
+                return value
+        
+        return None
@@ -0,0 +1,264 @@
+"""Einzel-Benchmarks: Start, Glossar, Scanner, Watch, KI-Scheduler, Karten, Extraktion, Speicher"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from auto_localize_flutter import (
+    CARD_CHUNK, GLOSSARIES, GLOSSARY_DE, SOURCE_LOCALE, DartStringScanner, FlutterLocalizer, Glossary,
+    MessagesHttpClient, load_glossary_file, upload_ndjson,
+)
+from benchmarks import SCRIPT
+from benchmarks.baselines import LinearGlossary, RegexStringScanner
+from benchmarks.synthetic import (
+    SYNTHETIC_CARD_FACETS, create_synthetic_project, iter_synthetic_cards, synthetic_dart_source,
+)
+from tests.fakes import FakeAlgoliaServer, FakeAnthropicServer, FakeTranslationClient
+
+
+def run_benchmark(files: int = 5000, jobs: int = 0):
+    """Vergleicht serielle und parallele Extraktion auf einem künstlichen Projekt"""
+    jobs = jobs if jobs > 1 else max(2, os.cpu_count() or 2)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"🏗️  Erzeuge {files} Dart-Dateien in {tmp}...")
+        create_synthetic_project(Path(tmp), files=files)
+        
+        timings = {}
+        results = {}
+        for label, n in (("seriell", 1), (f"parallel ({jobs} Jobs)", jobs)):
+            localizer = FlutterLocalizer(tmp, jobs=n, use_cache=False)
+            start = time.perf_counter()
+            results[label] = localizer.extract_strings()
+            timings[label] = time.perf_counter() - start
+        
+        serial, parallel = results.values()
+        identical = serial == parallel
+        print()
+        for label, seconds in timings.items():
+            print(f"⏱️  {label}: {seconds:.3f}s ({files / seconds:.0f} Dateien/s)")
+        print(f"{'✅' if identical else '❌'} Ergebnisse identisch: {identical}")
+
+
+def run_scanner_benchmark(megabytes: float = 8.0):
+    """Durchsatz (MB/s) des Dart-Lexers im Vergleich zum Regex-Scanner"""
+    sources = []
+    size = 0
+    while size < megabytes * 1024 * 1024:
+        sources.append(synthetic_dart_source(len(sources)))
+        size += len(sources[-1].encode('utf-8'))
+    
+    for label, scanner in (("Regex-Scanner", RegexStringScanner()), ("Dart-Lexer", DartStringScanner())):
+        start = time.perf_counter()
+        results = [scanner.scan(content)[0] for content in sources]
+        seconds = time.perf_counter() - start
+        # Doppelte Treffer (mehrere Muster an einer Stelle) nur einmal zählen
+        found = sum(len({(line_num, text) for text, line_num, *_ in hits}) for hits in results)
+        print(f"⏱️  {label}: {size / 1024 / 1024 / seconds:.1f} MB/s, {found} Texte ({size / 1024 / 1024:.1f} MB)")
+
+
+def run_watch_benchmark(files: int = 200, edits: int = 10):
+    """Latenz im Watch-Modus: Speichern einer Datei bis zur aktualisierten en.json"""
+    latencies = []
+    with tempfile.TemporaryDirectory() as tmp:
+        create_synthetic_project(Path(tmp), files=files)
+        localizer = FlutterLocalizer(tmp, use_cache=False, use_memory=False,
+                                     client=FakeTranslationClient(latency=0),
+                                     ai_requests_per_minute=1e9, ai_tokens_per_minute=1e9)
+        source_file = localizer.assets_path / f"{SOURCE_LOCALE}.json"
+        dart_file = next(localizer.lib_path.rglob("*.dart"))
+        stop = threading.Event()
+        thread = threading.Thread(target=localizer.watch, kwargs={"stop": stop})
+        thread.start()
+        try:
+            while not source_file.exists():
+                time.sleep(0.01)
+            time.sleep(0.2)  # Watcher steht
+            
+            for i in range(edits):
+                marker = f"Freshly saved text {i}"
+                content = dart_file.read_text(encoding='utf-8')
+                start = time.perf_counter()
+                dart_file.write_text(content.replace("\n}", f"\n      child: Text('{marker}'),\n}}", 1),
+                                     encoding='utf-8')
+                while marker not in source_file.read_text(encoding='utf-8'):
+                    time.sleep(0.001)
+                latencies.append(time.perf_counter() - start)
+        finally:
+            stop.set()
+            thread.join()
+    
+    latencies.sort()
+    print(f"⏱️  Watch: Speichern -> en.json Median {latencies[len(latencies) // 2] * 1000:.0f} ms, "
+          f"max {latencies[-1] * 1000:.0f} ms ({files} Dateien)")
+
+
+def run_ratelimit_benchmark(batches: int = 60, batch_size: int = 10, concurrency: int = 8):
+    """KI-Scheduler gegen FakeAnthropicServer: Drosselung, Circuit Breaker, Budget
+    
+    Der Server erlaubt 1200 Requests/min (eine Sekunde Burst) und lehnt 5 %
+    zufällig mit 429 ab; verglichen werden ein Client ohne Limit und einer,
+    der auf das Account-Limit eingestellt ist.
+    """
+    import io
+    from contextlib import redirect_stdout
+    texts = [f"Benchmark text number {i}" for i in range(batches * batch_size)]
+    
+    def translate(server_options: dict, **options):
+        with FakeAnthropicServer(**server_options) as server, redirect_stdout(io.StringIO()):
+            localizer = FlutterLocalizer(".", use_memory=False, client=MessagesHttpClient(server.url),
+                                         ai_batch_size=batch_size, ai_concurrency=concurrency, **options)
+            start = time.perf_counter()
+            translated = localizer.translate_batch_ai(texts)
+            return (time.perf_counter() - start, len(translated), localizer.ai_requests,
+                    server.rejected, localizer.scheduler)
+    
+    server_options = {"latency": 0.02, "error_rate": 0.05, "requests_per_minute": 1200, "retry_after": 1}
+    for label, rpm in (("ohne Limit", 1e9), ("1200/min", 1200)):
+        seconds, done, requests, rejected, _ = translate(server_options, ai_requests_per_minute=rpm,
+                                                         ai_tokens_per_minute=1e9)
+        print(f"⏱️  KI-Scheduler {label}: {done}/{len(texts)} Texte in {seconds:.1f}s, "
+              f"{requests} Requests, {rejected}x 429")
+    
+    seconds, done, requests, _, scheduler = translate({"latency": 0.02, "error_rate": 1.0},
+                                                      ai_requests_per_minute=1e9, ai_tokens_per_minute=1e9)
+    print(f"⏱️  KI-Scheduler Dauerfehler: Breaker nach {requests} Requests/{seconds:.1f}s offen "
+          f"({scheduler.open_reason}), {done} Texte per KI")
+    
+    seconds, done, requests, _, scheduler = translate({"latency": 0.0}, ai_requests_per_minute=1e9,
+                                                      ai_tokens_per_minute=1e9, ai_budget_usd=0.01)
+    print(f"⏱️  KI-Scheduler Budget $0.01: {requests} Requests, ${scheduler.cost_usd:.4f} ausgegeben, "
+          f"{done}/{len(texts)} Texte per KI")
+
+
+def run_cards_benchmark(cards: int = 20000, chunk_size: int = CARD_CHUNK):
+    """Karten-Export: Übersetzen (Fake-KI ohne Latenz) und Upload gegen FakeAlgoliaServer in Karten/s"""
+    import io
+    from contextlib import redirect_stdout
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        dump = root / "cards.json"
+        with open(dump, 'w', encoding='utf-8') as f:
+            f.write('{"data": [')
+            f.write(','.join(json.dumps(card) for card in iter_synthetic_cards(cards)))
+            f.write(']}')
+        # Facetten im Domänen-Glossar, Archetypen bleiben Lücken
+        domain = root / "glossaries" / "domain"
+        domain.mkdir(parents=True)
+        with open(domain / "de.tsv", 'w', encoding='utf-8') as f:
+            f.writelines(f"{value}\t{value} (de)\n" for values in SYNTHETIC_CARD_FACETS.values() for value in values)
+        
+        with FakeAlgoliaServer(latency=0.005) as server, redirect_stdout(io.StringIO()):
+            localizer = FlutterLocalizer(tmp, use_memory=False, client=FakeTranslationClient(latency=0),
+                                         ai_requests_per_minute=1e9, ai_tokens_per_minute=1e9)
+            start = time.perf_counter()
+            localizer.export_cards(dump, root / "out", chunk_size=chunk_size)
+            export_s = time.perf_counter() - start
+            start = time.perf_counter()
+            uploaded = upload_ndjson(root / "out" / "cards_de.ndjson", server.url, "cards_de")
+            upload_s = time.perf_counter() - start
+        assert uploaded == cards == len(server.objects["cards_de"])
+        sample = server.objects["cards_de"]["10000000"]
+        assert sample["desc"].startswith("[de] ") and sample["type"].endswith(" (de)")
+    print(f"⏱️  Karten-Export: {cards} Karten übersetzt in {export_s:.2f}s ({cards / export_s:.0f} Karten/s), "
+          f"Upload {upload_s:.2f}s ({cards / upload_s:.0f} Karten/s, {server.tasks} Batches)")
+
+
+def run_glossary_benchmark(rounds: int = 20000, entries: int = 50000):
+    """Glossar-Latenz pro Text vorher/nachher (Treffer, Case-Treffer, Fehlschlag) und Laden großer Glossare"""
+    localizer = FlutterLocalizer(".", use_cache=False, use_memory=False, fuzzy_glossary=True)
+    samples = ["Login", "loading...", "Loading..", "Something not in the glossary", "OCG Banlist is loading..."]
+    
+    linear = LinearGlossary(GLOSSARY_DE)
+    latency = {}
+    for label, lookup in (("vorher", linear.lookup), ("nachher", localizer.lookup_glossary)):
+        start = time.perf_counter()
+        for i in range(rounds):
+            lookup(samples[i % len(samples)])
+        latency[label] = (time.perf_counter() - start) / rounds
+    print(f"⏱️  Glossar ({len(GLOSSARY_DE)} Einträge): vorher {latency['vorher'] * 1e6:.2f} µs pro Text "
+          f"(lineare .lower()-Suche), nachher {latency['nachher'] * 1e6:.2f} µs "
+          f"({latency['vorher'] / latency['nachher']:.0f}x schneller)")
+    
+    # Externe Glossar-Datei: erstes Laden (Parsen + Indizes) gegen kompilierten Cache
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        with open(folder / "de.tsv", 'w', encoding='utf-8') as f:
+            f.writelines(f"Card term {i}\tKartenbegriff {i}\n" for i in range(entries))
+        timings = []
+        for _ in range(2):
+            start = time.perf_counter()
+            glossary = Glossary.layered([load_glossary_file(folder / "de.tsv", folder / "cache"),
+                                         GLOSSARIES["de"].indexes()])
+            timings.append((time.perf_counter() - start) * 1000)
+        assert glossary.lookup("card term 7") == "Kartenbegriff 7"
+    print(f"⏱️  Glossar-Datei ({entries} Einträge): {timings[0]:.0f} ms kalt, {timings[1]:.1f} ms aus dem Cache")
+
+
+def run_memory_benchmark(sizes=(25000, 50000, 100000)) -> bool:
+    """Spitzen-RSS von `translate` auf künstlichen Projekten mit wachsender Textzahl
+    
+    Die Zahl eindeutiger Texte ist begrenzt; wächst nur die Zahl der Treffer,
+    soll der Speicherbedarf der Pipeline annähernd gleich bleiben.
+    """
+    import subprocess
+    import sys
+    
+    # Jede künstliche Datei enthält gleich viele Treffer
+    per_file = len(DartStringScanner().scan(synthetic_dart_source(0))[0])
+    env = {key: value for key, value in os.environ.items() if key != "ANTHROPIC_API_KEY"}
+    peaks = []
+    for strings in sizes:
+        files = -(-strings // per_file)
+        with tempfile.TemporaryDirectory() as tmp:
+            create_synthetic_project(Path(tmp), files=files)
+            process = subprocess.Popen([sys.executable, str(SCRIPT), "translate", tmp, "--no-memory"],
+                                       stdout=subprocess.DEVNULL, env=env)
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+        if process.returncode != 0:
+            # Abgebrochener Lauf: Spitzen-RSS wäre nicht vergleichbar
+            print(f"❌ Speicher: translate mit {files * per_file} Texten fehlgeschlagen (Exit-Code {process.returncode})")
+            return False
+        peaks.append(usage.ru_maxrss / 1024)  # Linux: KiB
+        print(f"⏱️  Speicher: {files * per_file} Texte ({files} Dateien): {peaks[-1]:.1f} MB Spitzen-RSS")
+    
+    ok = peaks[-1] <= peaks[0] * 1.25
+    print(f"{'✅' if ok else '❌'} RSS bei {sizes[-1] // sizes[0]}x Texten: {peaks[-1] / peaks[0]:.2f}x")
+    return ok
+
+
+# Start ohne KI (--help, extract, verify): Import-Budget und Module, die dabei nicht geladen werden dürfen
+STARTUP_BUDGET_MS = 100
+STARTUP_FORBIDDEN_MODULES = ("anthropic", "asyncio", "concurrent.futures", "difflib")
+
+
+def run_startup_benchmark(budget_ms: float = STARTUP_BUDGET_MS) -> bool:
+    """Misst den Import-Aufwand von `--help` per python -X importtime und prüft das Budget"""
+    import subprocess
+    import sys
+    
+    result = subprocess.run([sys.executable, "-X", "importtime", str(SCRIPT), "--help"],
+                            capture_output=True, text=True)
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # Kopfzeile
+        modules.add(name.strip())
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative)  # nur Top-Level-Importe, sonst doppelt gezählt
+    
+    heavy = [m for m in STARTUP_FORBIDDEN_MODULES if m in modules]
+    total_ms = total_us / 1000
+    ok = result.returncode == 0 and total_ms <= budget_ms and not heavy
+    print(f"{'✅' if ok else '❌'} Start (--help): {total_ms:.1f} ms Imports, Budget {budget_ms:.0f} ms")
+    if heavy:
+        print(f"   ❌ Unnötig geladen: {', '.join(heavy)}")
+    return ok
@@ -0,0 +1,172 @@
+"""Benchmark-Suite (asv-artig): Kern-Methoden auf einem erzeugten Projekt, Ergebnis pro Lauf als JSON"""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from auto_localize_flutter import GLOSSARY_DE, FlutterLocalizer, unique_texts
+from benchmarks import ROOT, SCRIPT
+from benchmarks.synthetic import create_synthetic_project
+from tests.fakes import FakeTranslationClient
+
+
+# Benchmark-Suite: Ergebnisse pro Lauf als JSON; langsamer als dieser Anteil gegenüber dem Vergleichslauf gilt als Regression
+BENCHMARK_RESULTS = ROOT / ".benchmarks"
+BENCHMARK_REGRESSION = 0.10
+
+
+def time_benchmark(func, setup=None, repeat: int = 5, min_time: float = 0.02) -> dict:
+    """Misst func asv-artig über repeat Messungen (Ausgaben unterdrückt)
+    
+    setup() läuft vor jedem Aufruf außerhalb der Messung; func bekommt ihr
+    Ergebnis. Nach einem Aufwärm-Aufruf wird func pro Messung so oft
+    aufgerufen, dass sie mindestens min_time dauert.
+    """
+    import io
+    from contextlib import redirect_stdout
+    
+    def measure(number: int) -> float:
+        total = 0.0
+        for _ in range(number):
+            state = setup() if setup is not None else None
+            start = time.perf_counter()
+            func(state)
+            total += time.perf_counter() - start
+        return total / number
+    
+    with redirect_stdout(io.StringIO()):
+        first = measure(1)
+        number = max(1, min(1000, int(min_time / first))) if first > 0 else 1000
+        samples = sorted(measure(number) for _ in range(repeat))
+    return {"min_s": samples[0], "median_s": samples[len(samples) // 2],
+            "mean_s": sum(samples) / len(samples), "repeat": repeat, "number": number}
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+def benchmark_revision() -> str:
+    """Kurzer Commit-Hash des Scripts (+dirty bei lokalen Änderungen), sonst 'unknown'"""
+    import subprocess
+    
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                  capture_output=True, text=True, timeout=10).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no", "--", str(SCRIPT)],
+                               cwd=ROOT, capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    return (revision + ("-dirty" if dirty else "")) if revision else "unknown"
+
+
+def run_benchmark_suite(files: int = 500, lines_per_file: int = 60, density: float = 0.7,
+                        duplicate_ratio: float = 0.3, seed: int = 0, repeat: int = 5,
+                        results_dir: Path = BENCHMARK_RESULTS, compare: str = None) -> bool:
+    """Benchmarks der Kern-Methoden auf einem erzeugten Projekt, offline per FakeTranslationClient
+    
+    Das Ergebnis landet als <zeit>_<commit>.json in results_dir und wird mit
+    compare bzw. dem letzten Lauf mit denselben Parametern verglichen.
+    Liefert False bei einer Regression.
+    """
+    import io
+    from contextlib import redirect_stdout
+    
+    params = {"files": files, "lines_per_file": lines_per_file, "density": density,
+              "duplicate_ratio": duplicate_ratio, "seed": seed}
+    benchmarks = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"🏗️  Erzeuge {files} Dart-Dateien (Dichte {density}, Duplikate {duplicate_ratio})...")
+        create_synthetic_project(Path(tmp), files=files, lines_per_file=lines_per_file,
+                                 density=density, duplicate_ratio=duplicate_ratio, seed=seed)
+        
+        def localizer() -> FlutterLocalizer:
+            return FlutterLocalizer(tmp, use_cache=False, use_memory=False,
+                                    client=FakeTranslationClient(latency=0),
+                                    ai_requests_per_minute=1e9, ai_tokens_per_minute=1e9)
+        
+        def extracted() -> FlutterLocalizer:
+            loc = localizer()
+            loc.build_translations(loc.extract_strings(), translate=False)
+            return loc
+        
+        with redirect_stdout(io.StringIO()):
+            found = localizer().extract_strings()
+            key_localizer = localizer()
+            german = localizer()
+        texts = list(unique_texts(found))
+        # Glossar-Treffer und -Fehlschläge (letztere gehen an den Fake-Client)
+        samples = [text for text, _ in texts[:100]] + list(GLOSSARY_DE)[:100]
+        print(f"   {len(found)} Texte, {len(texts)} eindeutig")
+        
+        cases = {
+            "extract_strings": (lambda loc: loc.extract_strings(), localizer),
+            "generate_key": (lambda _: [key_localizer.generate_key(text, context) for text, context in texts], None),
+            "translate_to_german": (lambda _: [german.translate_to_german(text) for text in samples], None),
+            "build_translations": (lambda loc: loc.build_translations(found), localizer),
+            "rewrite_sources": (lambda loc: loc.rewrite_sources(), extracted),
+        }
+        for name in ("update_pubspec", "update_main_dart", "update_appbar", "update_card_data", "update_app_providers"):
+            cases[name] = (lambda loc, name=name: getattr(loc, name)(), localizer)
+        
+        for name, (func, setup) in cases.items():
+            benchmarks[name] = time_benchmark(func, setup, repeat=repeat)
+            print(f"⏱️  {name}: {format_seconds(benchmarks[name]['median_s'])} "
+                  f"(min {format_seconds(benchmarks[name]['min_s'])})")
+    
+    import platform
+    import sys
+    
+    record = {
+        "version": 1,
+        "revision": benchmark_revision(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "machine": platform.machine(),
+        "params": params,
+        "benchmarks": benchmarks,
+    }
+    
+    # Vergleichslauf: angegeben oder der letzte mit denselben Parametern
+    results_path = Path(results_dir)
+    previous = None
+    if compare:
+        with open(compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    else:
+        for path in sorted(results_path.glob("*.json"), reverse=True):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    candidate = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if candidate.get("params") == params:
+                previous = candidate
+                break
+    
+    results_path.mkdir(parents=True, exist_ok=True)
+    result_file = results_path / f"{time.strftime('%Y%m%d-%H%M%S')}_{record['revision']}.json"
+    with open(result_file, 'w', encoding='utf-8') as f:
+        json.dump(record, f, indent=2)
+        f.write('\n')
+    print(f"💾 Ergebnisse: {result_file}")
+    
+    if previous is None:
+        return True
+    regressions = 0
+    print(f"📈 Vergleich mit {previous.get('revision')} ({previous.get('created')}):")
+    for name, result in benchmarks.items():
+        old = previous.get("benchmarks", {}).get(name)
+        if old is None:
+            continue
+        change = result["median_s"] / old["median_s"] - 1 if old["median_s"] else 0.0
+        regressed = change > BENCHMARK_REGRESSION
+        regressions += regressed
+        print(f"   {'❌' if regressed else '✅'} {name}: {format_seconds(old['median_s'])} -> "
+              f"{format_seconds(result['median_s'])} ({change:+.0%})")
+    return regressions == 0
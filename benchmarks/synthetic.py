@@ -0,0 +1,209 @@
+"""Künstliche Flutter-Projekte und Karten-Dumps für die Benchmarks"""
+
+import random
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+
+SYNTHETIC_WIDGETS = (
+    "      child: Text('Welcome to deck {n}'),",
+    "      title: const Text('Card details {n}'),",
+    "      decoration: InputDecoration(hintText: 'Search card {n}...'),",
+    "      labelText: 'Deck name {n}',",
+    "    throw Exception('Error loading deck {n}');",
+    "      tooltip: 'Show filter {n}',",
+    "      final value = computeSomething({n});",
+    "      // Kommentar ohne Treffer {n}",
+    "      Text(\n        'Multi line text {n}',\n        style: style,\n      ),",
+    "      Text('Don\\'t lose deck {n}'),",
+)
+
+
+# Zeilen mit übersetzbarem Text bzw. ohne (für density)
+SYNTHETIC_TEXT_WIDGETS = tuple(widget for widget in SYNTHETIC_WIDGETS if "'" in widget)
+SYNTHETIC_FILLER = tuple(widget for widget in SYNTHETIC_WIDGETS if "'" not in widget)
+
+# Grundgerüst mit den Dateien, die update_pubspec() und die update_*-Methoden anpassen
+SYNTHETIC_SCAFFOLD = {
+    "pubspec.yaml": """name: synthetic
+description: Synthetisches Flutter-Projekt für Benchmarks
+
+dependencies:
+  flutter:
+    sdk: flutter
+  flutter_riverpod: ^2.4.0
+
+flutter:
+  uses-material-design: true
+  assets:
+    - assets/icon/
+""",
+    "lib/main.dart": """import 'package:flutter/material.dart';
+import 'package:flutter_riverpod/flutter_riverpod.dart';
+import 'package:tcg_app/class/sharedPreference.dart';
+
+void main() async {
+  WidgetsFlutterBinding.ensureInitialized();
+  await Firebase.initializeApp(options: DefaultFirebaseOptions.currentPlatform);
+  await SaveData.initPreferences();
+  runApp(const ProviderScope(child: MainApp()));
+}
+
+class MainApp extends StatelessWidget {
+  const MainApp({super.key});
+
+  @override
+  Widget build(BuildContext context) {
+    return MaterialApp(
+      debugShowCheckedModeBanner: false,
+      home: const Scaffold(),
+    );
+  }
+}
+""",
+    "lib/class/common/appbar.dart": """import 'package:flutter/material.dart';
+import 'package:flutter_riverpod/flutter_riverpod.dart';
+import 'package:tcg_app/providers/app_providers.dart';
+
+class Barwidget extends ConsumerWidget {
+  final String title;
+  final Function(bool) onThemeChanged;
+
+  const Barwidget({super.key, this.title = "", required this.onThemeChanged});
+
+  @override
+  Widget build(BuildContext context, WidgetRef ref) {
+    final isDarkMode = Theme.of(context).brightness == Brightness.dark;
+
+    return AppBar(
+      centerTitle: false,
+      actions: [
+        IconButton(
+          icon: isDarkMode
+              ? const Icon(Icons.light_mode)
+              : const Icon(Icons.dark_mode),
+          onPressed: () {
+            ref.read(darkModeProvider.notifier).toggleDarkMode(!isDarkMode);
+          },
+        ),
+      ],
+      title: Text(title),
+    );
+  }
+}
+""",
+    "lib/class/Firebase/YugiohCard/getCardData.dart": """import 'package:algolia_helper_flutter/algolia_helper_flutter.dart';
+import 'package:firebase_storage/firebase_storage.dart';
+
+class CardData implements Dbrepo {
+  final FirebaseStorage storage = FirebaseStorage.instance;
+
+  CardData();
+""" + "".join(f"""
+  Future<List<Map<String, dynamic>>> search{n}(String query) async {{
+    final searcher = HitsSearcher(
+      applicationID: appId,
+      apiKey: apiKey,
+      indexName: 'cards',
+    );
+    searcher.query(query);
+    return (await searcher.responses.first).hits.toList();
+  }}
+""" for n in range(6)) + "}\n",
+    "lib/providers/app_providers.dart": """import 'package:flutter_riverpod/flutter_riverpod.dart';
+import 'package:tcg_app/class/Firebase/YugiohCard/getCardData.dart';
+
+final cardDataProvider = Provider<CardData>((ref) {
+  return CardData();
+});
+
+final cardSearchQueryProvider = StateProvider<String>((ref) => '');
+
+final cardSearchResultsProvider = FutureProvider<List<Map<String, dynamic>>>((ref) async {
+  final query = ref.watch(cardSearchQueryProvider);
+  final cardData = ref.watch(cardDataProvider);
+  final results = await cardData.ergebniseAnzeigen(query);
+  return results;
+});
+""",
+}
+
+
+def synthetic_dart_source(i: int, lines_per_file: int = 60) -> str:
+    """Inhalt der i-ten künstlichen Dart-Datei"""
+    body = [SYNTHETIC_WIDGETS[(i + n) % len(SYNTHETIC_WIDGETS)].format(n=(i * lines_per_file + n) % 997)
+            for n in range(lines_per_file)]
+    return "class Screen%d {\n%s\n}\n" % (i, "\n".join(body))
+
+
+def synthetic_screen_source(i: int, lines_per_file: int, density: float, duplicate_ratio: float,
+                            rng: random.Random, used: List[Tuple[int, int]]) -> str:
+    """Wie synthetic_dart_source, aber mit Text-Dichte und Anteil doppelter Texte
+    
+    used sammelt die bisher erzeugten Texte (widget, nummer) über alle Dateien.
+    """
+    body = []
+    for n in range(lines_per_file):
+        if rng.random() >= density:
+            body.append(SYNTHETIC_FILLER[n % len(SYNTHETIC_FILLER)].format(n=n))
+            continue
+        if used and rng.random() < duplicate_ratio:
+            widget, number = rng.choice(used)
+        else:
+            widget, number = rng.randrange(len(SYNTHETIC_TEXT_WIDGETS)), len(used)
+            used.append((widget, number))
+        body.append(SYNTHETIC_TEXT_WIDGETS[widget].format(n=number))
+    return "class Screen%d {\n%s\n}\n" % (i, "\n".join(body))
+
+
+SYNTHETIC_CARD_FACETS = {
+    "type": ("Effect Monster", "Normal Monster", "Spell Card", "Trap Card", "Fusion Monster",
+             "Synchro Monster", "XYZ Monster", "Link Monster", "Ritual Monster", "Pendulum Effect Monster"),
+    "race": ("Dragon", "Spellcaster", "Warrior", "Fiend", "Machine", "Beast", "Zombie", "Fairy",
+             "Normal", "Continuous", "Quick-Play", "Counter", "Equip", "Field"),
+    "attribute": ("DARK", "LIGHT", "EARTH", "WATER", "FIRE", "WIND", "DIVINE"),
+}
+
+
+def iter_synthetic_cards(count: int, archetypes: int = 300, duplicate_ratio: float = 0.1,
+                         seed: int = 0) -> Iterator[dict]:
+    """Künstliche Karten im Format von CardData (Benchmark `cards`)"""
+    rng = random.Random(seed)
+    for i in range(count):
+        desc_id = rng.randrange(max(1, i)) if i and rng.random() < duplicate_ratio else i
+        yield {
+            "id": 10000000 + i,
+            "name": f"Synthetic Card {i}",
+            "desc": f"When this card is summoned {desc_id}: you can add 1 monster from your Deck to your hand. "
+                    f"You can only use this effect of card {desc_id} once per turn.",
+            **{field: rng.choice(values) for field, values in SYNTHETIC_CARD_FACETS.items()},
+            "archetype": f"Archetype {rng.randrange(archetypes)}",
+            "atk": rng.randrange(0, 5000, 100), "def": rng.randrange(0, 5000, 100),
+            "level": rng.randrange(1, 13), "frameType": "effect",
+            "banlist_info": {}, "card_images": [{"image_url": f"https://images.example/{i}.jpg"}],
+        }
+
+
+def create_synthetic_project(root: Path, files: int = 5000, lines_per_file: int = 60,
+                             density: float = None, duplicate_ratio: float = 0.0, seed: int = 0):
+    """Erzeugt ein künstliches Flutter-Projekt für Benchmarks
+    
+    Ohne density entstehen die festen Dateien aus synthetic_dart_source(). Mit
+    density (Anteil der Zeilen mit Text) und duplicate_ratio (Anteil der Texte,
+    die schon einmal vorkamen) werden sie reproduzierbar aus seed erzeugt.
+    """
+    for relative, content in SYNTHETIC_SCAFFOLD.items():
+        (root / relative).parent.mkdir(parents=True, exist_ok=True)
+        (root / relative).write_text(content, encoding='utf-8')
+    
+    lib = root / "lib"
+    rng = random.Random(seed)
+    used = []
+    for i in range(files):
+        folder = lib / f"feature_{i % 50}"
+        folder.mkdir(parents=True, exist_ok=True)
+        if density is None:
+            source = synthetic_dart_source(i, lines_per_file)
+        else:
+            source = synthetic_screen_source(i, lines_per_file, density, duplicate_ratio, rng, used)
+        (folder / f"screen_{i}.dart").write_text(source, encoding='utf-8')
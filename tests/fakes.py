@@ -0,0 +1,162 @@
+"""Offline-Fakes der Anthropic- und Algolia-APIs für Tests und Benchmarks"""
+
+import json
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+from typing import Tuple
+
+from auto_localize_flutter import TokenBucket
+
+
+class FakeTranslationClient:
+    """Offline-Ersatz für anthropic.Anthropic (Tests, Benchmarks)
+    
+    Antwortet nach `latency` Sekunden mit "[<locale>] <text>" und zählt Requests
+    und Latenzen mit.
+    """
+    
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.requests = 0
+        self.latencies = []
+        self._lock = threading.Lock()
+        self.messages = self
+    
+    def create(self, model: str, max_tokens: int, messages: list):
+        start = time.perf_counter()
+        time.sleep(self.latency)
+        prompt = messages[-1]["content"]
+        locale = re.search(r"\(locale '([^']+)'\)", prompt).group(1)
+        batch = json.loads(prompt[prompt.index('\n') + 1:])
+        text = json.dumps({t: f"[{locale}] {t}" for t in batch}, ensure_ascii=False)
+        with self._lock:
+            self.requests += 1
+            self.latencies.append(time.perf_counter() - start)
+        # Token-Schätzung wie bei der API: grob 4 Zeichen pro Token
+        usage = SimpleNamespace(input_tokens=len(prompt) // 4, output_tokens=len(text) // 4)
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=usage)
+
+
+class FakeHttpServer(ABC):
+    """Lokaler HTTP-Server für Benchmarks und Tests (Basis der Fake-APIs)
+    
+    Antwortet nach `latency` Sekunden über respond(). error_rate ist der
+    Anteil zufälliger 429; requests_per_minute ist ein serverseitiges Limit
+    (Token-Bucket, eine Sekunde Burst), darüber gibt es 429 mit Retry-After.
+    Benutzung als Context-Manager; `url` ist die Basis-URL.
+    """
+    RATE_LIMITED = {"message": "Rate limit exceeded", "status": 429}
+    
+    def __init__(self, latency: float = 0.02, error_rate: float = 0.0,
+                 requests_per_minute: float = None, retry_after: float = 1.0, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.limit = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.rejected = 0
+        self.url = None
+        self._lock = threading.Lock()
+        self._server = None
+    
+    def _admit(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            ok = self.rng.random() >= self.error_rate
+            if ok and self.limit is not None:
+                ok = self.limit.delay(1) <= 0
+                if ok:
+                    self.limit.take(1)
+            if not ok:
+                self.rejected += 1
+            return ok
+    
+    @abstractmethod
+    def respond(self, path: str, request: dict) -> Tuple[int, dict]:
+        """Antwort (Status, JSON) auf einen zugelassenen POST"""
+    
+    def __enter__(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        fake = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, *args):
+                pass
+            
+            def reply(self, status: int, body: dict, headers: dict = None):
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))))
+                time.sleep(fake.latency)
+                if not fake._admit():
+                    self.reply(429, fake.RATE_LIMITED, {"retry-after": f"{fake.retry_after:g}"})
+                    return
+                self.reply(*fake.respond(self.path, request))
+        
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        return self
+    
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class FakeAnthropicServer(FakeHttpServer):
+    """Fake der Messages-API: übersetzt wie FakeTranslationClient ("[<locale>] <text>")
+    
+    `url` als base_url für MessagesHttpClient (--ai-base-url) oder ANTHROPIC_BASE_URL.
+    """
+    RATE_LIMITED = {"type": "error", "error": {"type": "rate_limit_error", "message": "Rate limit exceeded"}}
+    
+    def respond(self, path: str, request: dict) -> Tuple[int, dict]:
+        prompt = request["messages"][-1]["content"]
+        locale = re.search(r"\(locale '([^']+)'\)", prompt).group(1)
+        batch = json.loads(prompt[prompt.index('\n') + 1:])
+        text = json.dumps({t: f"[{locale}] {t}" for t in batch}, ensure_ascii=False)
+        return 200, {"type": "message", "role": "assistant", "model": request.get("model"),
+                     "content": [{"type": "text", "text": text}],
+                     "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4}}
+
+
+class FakeAlgoliaServer(FakeHttpServer):
+    """Fake der Algolia-Batch-API (POST /1/indexes/<index>/batch)
+    
+    Hält die Objekte pro Index im Speicher (objects[index][objectID]);
+    `url` als --algolia-url für `cards --upload`.
+    """
+    
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.objects = {}
+        self.tasks = 0
+    
+    def respond(self, path: str, request: dict) -> Tuple[int, dict]:
+        match = re.fullmatch(r'/1/indexes/([^/]+)/batch', path)
+        if match is None:
+            return 404, {"message": "Not found", "status": 404}
+        from urllib.parse import unquote
+        with self._lock:
+            objects = self.objects.setdefault(unquote(match.group(1)), {})
+            for operation in request["requests"]:
+                objects[operation["body"]["objectID"]] = operation["body"]
+            self.tasks += 1
+            task = self.tasks
+        return 200, {"taskID": task, "objectIDs": [op["body"]["objectID"] for op in request["requests"]]}
@@ -0,0 +1,149 @@
+"""AIScheduler: Retry-After, Circuit Breaker (öffnen, halb offen, schließen) und Budget"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from auto_localize_flutter import AIScheduler, HttpStatusError, MessagesHttpClient, retry_after_seconds
+from tests.fakes import FakeAnthropicServer
+
+
+def scheduler(**options) -> AIScheduler:
+    # Ohne Rate-Limits, damit nur das getestete Verhalten bremst
+    return AIScheduler(requests_per_minute=60000, tokens_per_minute=10 ** 9, **options)
+
+
+def fail(sched: AIScheduler, status: int = 500, attempt: int = 0, retry_after: str = None):
+    estimate = 100
+    assert asyncio.run(sched.acquire(estimate))
+    return sched.failure(estimate, HttpStatusError(status, "Fehler", retry_after), attempt)
+
+
+def test_retry_after_pauses_all_workers():
+    sched = scheduler()
+    delay = fail(sched, 429, retry_after="0.3")
+    assert delay >= 0.3
+    assert sched.rate_limited == 1
+
+    start = time.monotonic()
+    assert asyncio.run(sched.acquire(100))
+    assert time.monotonic() - start >= 0.25
+    assert sched.waited >= 0.25
+
+
+def test_retry_after_is_lower_bound_of_backoff():
+    sched = scheduler()
+    assert fail(sched, 429, attempt=0, retry_after="5") >= 5
+    assert fail(sched, 503, attempt=0) < 5  # ohne Retry-After nur Backoff mit Jitter
+
+
+def test_retry_after_from_headers():
+    assert retry_after_seconds(HttpStatusError(429, "x", "2.5")) == 2.5
+    assert retry_after_seconds(HttpStatusError(429, "x", "bald")) is None
+    response = SimpleNamespace(headers={"retry-after": "7"})
+    assert retry_after_seconds(SimpleNamespace(response=response)) == 7.0
+    assert retry_after_seconds(ValueError()) is None
+
+
+def test_retry_after_from_fake_server():
+    with FakeAnthropicServer(latency=0, error_rate=1.0, retry_after=3) as server:
+        client = MessagesHttpClient(server.url)
+        with pytest.raises(HttpStatusError) as error:
+            client.messages.create(model="m", max_tokens=10,
+                                   messages=[{"role": "user", "content": "(locale 'de')\n[\"Hi\"]"}])
+    assert error.value.status_code == 429
+    assert retry_after_seconds(error.value) == 3.0
+
+
+def test_client_errors_are_not_retried():
+    sched = scheduler()
+    assert fail(sched, 400) is None
+    assert sched.ready()
+
+
+def test_breaker_opens_after_consecutive_failures():
+    sched = scheduler(breaker_threshold=3)
+    assert fail(sched) is not None
+    assert fail(sched) is not None
+    assert fail(sched) is None
+    assert sched.open_reason == "3 Fehlschläge in Folge"
+    assert not asyncio.run(sched.acquire(100))
+
+
+def test_success_resets_failure_count():
+    sched = scheduler(breaker_threshold=2)
+    fail(sched)
+    assert asyncio.run(sched.acquire(100))
+    sched.success(100)
+    fail(sched)
+    assert sched.ready()
+
+
+def test_breaker_closes_after_successful_probe():
+    sched = scheduler(breaker_threshold=1, breaker_cooldown=0.1)
+    fail(sched)
+    assert not sched.ready()
+    time.sleep(0.15)
+
+    assert asyncio.run(sched.acquire(100))
+    assert sched.probing
+    sched.success(100)
+    assert not sched.probing
+    assert sched.open_reason is None
+    assert sched.failures == 0
+
+
+def test_failed_probe_reopens_breaker():
+    sched = scheduler(breaker_threshold=1, breaker_cooldown=0.1)
+    fail(sched)
+    time.sleep(0.15)
+
+    assert fail(sched) is None
+    assert sched.open_reason is not None
+    assert not sched.probing
+    assert not sched.ready()
+
+
+def test_half_open_lets_only_the_probe_through():
+    sched = scheduler(breaker_threshold=1, breaker_cooldown=0.05)
+    fail(sched)
+    time.sleep(0.1)
+
+    async def probe_then_second():
+        assert await sched.acquire(100)
+        second = asyncio.ensure_future(sched.acquire(100))
+        await asyncio.sleep(0.15)
+        assert not second.done()  # wartet, bis der Probe-Request abgerechnet ist
+        sched.success(100)
+        return await second
+
+    assert asyncio.run(probe_then_second())
+
+
+def test_access_denied_stays_open():
+    sched = scheduler(breaker_cooldown=0)
+    assert fail(sched, 401) is None
+    assert not sched.ready()
+    assert sched.reopen_at is None
+
+
+def test_budget_stops_requests():
+    sched = scheduler(budget_usd=0.015)
+    usage = SimpleNamespace(input_tokens=1000, output_tokens=500)
+    assert asyncio.run(sched.acquire(600))  # geschätzt $0.0066
+    sched.success(600, usage)
+    assert sched.cost_usd == pytest.approx(0.0105)
+
+    assert not asyncio.run(sched.acquire(600))  # $0.0105 + $0.0066 > $0.015
+    assert sched.open_reason.startswith("Budget $")
+    assert sched.reopen_at is None
+
+
+def test_token_limit_stops_requests():
+    sched = scheduler(max_tokens=1000)
+    assert asyncio.run(sched.acquire(600))
+    sched.success(600)
+    assert not asyncio.run(sched.acquire(600))
+    assert sched.open_reason == "Token-Limit 1000 erreicht"
@@ -0,0 +1,72 @@
+"""ARB-Ausgabe: interpolierte Texte nur in app_<locale>.arb, nicht in den easy_localization-Dateien"""
+
+import json
+from pathlib import Path
+
+from auto_localize_flutter import FlutterLocalizer, LocaleLines
+from tests.fakes import FakeTranslationClient
+
+SCREEN = """import 'package:flutter/material.dart';
+
+class DeckScreen extends StatelessWidget {
+  Widget build(BuildContext context) => Column(children: [
+    Text('Delete deck'),
+    Text('$deckName is empty.'),
+  ]);
+}
+"""
+
+
+def make_project(root: Path) -> Path:
+    (root / "lib").mkdir()
+    (root / "pubspec.yaml").write_text("name: demo\n", encoding="utf-8")
+    (root / "lib" / "l10n.yaml").write_text("arb-dir: lib/l10n\ntemplate-arb-file: app_en.arb\n", encoding="utf-8")
+    (root / "lib" / "deck_screen.dart").write_text(SCREEN, encoding="utf-8")
+    return root
+
+
+def load(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def localizer(root: Path) -> FlutterLocalizer:
+    return FlutterLocalizer(str(root), use_cache=False, use_memory=False, split_locales=False,
+                            client=FakeTranslationClient(latency=0))
+
+
+def test_interpolated_texts_go_only_to_arb(tmp_path):
+    root = make_project(tmp_path)
+    localizer(root).run_translate()
+
+    for locale in ("en", "de"):
+        texts = load(root / "assets" / "translations" / f"{locale}.json")
+        assert "deck.delete_deck" in texts
+        assert not any('$' in text or "empty" in text for text in texts.values())
+
+    template = load(root / "lib" / "l10n" / "app_en.arb")
+    assert template["deckDeleteDeck"] == "Delete deck"
+    assert template["deckDecknameIsEmpty"] == "{deckName} is empty."
+    assert template["@deckDecknameIsEmpty"]["placeholders"] == {"deckName": {"type": "Object"}}
+    assert "{deckName}" in load(root / "lib" / "l10n" / "app_de.arb")["deckDecknameIsEmpty"]
+
+    # verify vermisst den interpolierten Text nicht in en.json
+    assert localizer(root).verify()
+
+
+def test_watch_refresh_keeps_interpolated_texts_out_of_json(tmp_path):
+    root = make_project(tmp_path)
+    watched = localizer(root)
+    watched.build_translations(watched.iter_strings(sites=True))
+    watched.commit_writes()
+    watched.locale_lines = {locale: LocaleLines(watched.json_entries(locale))
+                            for locale in watched.all_locales}
+
+    screen = root / "lib" / "deck_screen.dart"
+    screen.write_text(SCREEN.replace("  ]);", "    Text('$count cards left'),\n    Text('Rename deck'),\n  ]);"),
+                      encoding="utf-8")
+    assert watched.refresh_files([str(screen)]) == (2, 0)
+
+    texts = load(root / "assets" / "translations" / "en.json")
+    assert "Rename deck" in texts.values()
+    assert not any('$' in text for text in texts.values())
+    assert "{count} cards left" in load(root / "lib" / "l10n" / "app_en.arb").values()
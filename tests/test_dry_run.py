@@ -0,0 +1,55 @@
+"""apply --dry-run: kein Schreiben (Projekt und .localize_cache) und keine KI-Requests"""
+
+import shutil
+from pathlib import Path
+
+from auto_localize_flutter import FlutterLocalizer
+from tests.fakes import FakeTranslationClient
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def copy_project(target: Path) -> Path:
+    shutil.copytree(ROOT / "lib", target / "lib")
+    shutil.copytree(ROOT / "assets" / "translations", target / "assets" / "translations")
+    shutil.copy(ROOT / "pubspec.yaml", target / "pubspec.yaml")
+    return target
+
+
+def snapshot(root: Path) -> dict:
+    return {str(path.relative_to(root)): path.read_bytes() for path in sorted(root.rglob("*")) if path.is_file()}
+
+
+def localizer(root: Path, client, dry_run: bool) -> FlutterLocalizer:
+    return FlutterLocalizer(str(root), dry_run=dry_run, client=client, split_locales=False, rewrite=True)
+
+
+def test_dry_run_on_clean_checkout_writes_nothing(tmp_path):
+    root = copy_project(tmp_path)
+    before = snapshot(root)
+    client = FakeTranslationClient(latency=0)
+
+    localizer(root, client, dry_run=True).run()
+
+    assert snapshot(root) == before
+    assert not (root / ".localize_cache").exists()
+    assert client.requests == 0
+
+
+def test_dry_run_keeps_existing_cache_and_memory(tmp_path):
+    root = copy_project(tmp_path)
+    localizer(root, FakeTranslationClient(latency=0), dry_run=False).run_translate()
+    assert (root / ".localize_cache" / "extract.json").exists()
+    assert (root / ".localize_cache" / "translation_memory.jsonl").exists()
+
+    # Neuer Text: bräuchte die KI und einen neuen Cache-Eintrag
+    home = root / "lib" / "main.dart"
+    home.write_text(home.read_text(encoding="utf-8") + "\nconst probe = Text('A brand new dry run text');\n",
+                    encoding="utf-8")
+    before = snapshot(root)
+    client = FakeTranslationClient(latency=0)
+
+    localizer(root, client, dry_run=True).run()
+
+    assert snapshot(root) == before
+    assert client.requests == 0
@@ -0,0 +1,83 @@
+"""KeyIndex: Kollisions-Suffixe, Wiederverwendung aus en.json und reihenfolge-unabhängige Keys"""
+
+import hashlib
+from pathlib import Path
+
+from auto_localize_flutter import FlutterLocalizer, KeyIndex
+
+
+def suffix(text: str, length: int = 6) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:length]
+
+
+def test_collision_gets_content_hash_suffix():
+    index = KeyIndex()
+    assert index.assign("Save", "general.save") == "general.save"
+    assert index.assign("Save!", "general.save") == f"general.save_{suffix('Save!')}"
+    assert index.assign("SAVE", "general.save") == f"general.save_{suffix('SAVE')}"
+    # Derselbe Text behält seinen Key
+    assert index.assign("Save!", "general.other") == f"general.save_{suffix('Save!')}"
+
+
+def test_suffix_grows_when_short_suffix_is_taken():
+    index = KeyIndex()
+    index.reserve("general.save", "Save")
+    index.reserve(f"general.save_{suffix('Save!')}", "Something else")
+    assert index.assign("Save!", "general.save") == f"general.save_{suffix('Save!', 8)}"
+
+
+def test_reserved_keys_are_never_assigned():
+    index = KeyIndex()
+    index.reserve("app.title", "Cardbase")
+    assert index.assign("App Title", "app.title") == f"app.title_{suffix('App Title')}"
+    assert index.text_to_key == {"App Title": f"app.title_{suffix('App Title')}"}
+
+
+def test_existing_keys_are_reused():
+    index = KeyIndex()
+    index.load_existing({"x.email": "Email", "login.email": "Email", "app.title": "Cardbase", "deck": {"a": "b"}},
+                        skip={"app.title"})
+    assert index.existing == {"Email": "login.email"}  # kleinster Key gewinnt, Gruppen und skip bleiben außen vor
+    assert index.reuse("Email") == "login.email"
+    assert index.reuse("Cardbase") is None
+    assert index.assign("Email", "general.email") == "login.email"
+
+
+def test_reuse_skips_keys_already_taken():
+    index = KeyIndex()
+    index.load_existing({"general.save": "Save"})
+    index.reserve("general.save", "Speichern")
+    assert index.reuse("Save") is None
+    assert index.assign("Save", "general.save") == f"general.save_{suffix('Save')}"
+
+
+def project(root: Path, existing: str = None) -> FlutterLocalizer:
+    (root / "lib").mkdir()
+    (root / "pubspec.yaml").write_text("name: demo\n", encoding="utf-8")
+    if existing is not None:
+        (root / "assets" / "translations").mkdir(parents=True)
+        (root / "assets" / "translations" / "en.json").write_text(existing, encoding="utf-8")
+    return FlutterLocalizer(str(root), use_cache=False, use_memory=False)
+
+
+def test_keys_do_not_depend_on_scan_order(tmp_path):
+    screen = Path("lib/deck_screen.dart")
+    hits = [(screen, text, line) for line, text in enumerate(["Save", "Save!", "save?", "Delete deck", "!!!"], 1)]
+
+    results = []
+    for order, root in ((hits, tmp_path / "a"), (hits[::-1], tmp_path / "b")):
+        root.mkdir()
+        localizer = project(root)
+        localizer.build_translations(order, translate=False, stage=False)
+        results.append(localizer.text_keys)
+
+    assert results[0] == results[1]
+    assert results[0]["Save"] == "deck.save"
+    assert results[0]["Delete deck"] == "deck.delete_deck"
+
+
+def test_keys_from_en_json_survive_new_collisions(tmp_path):
+    localizer = project(tmp_path, '{"deck.save": "Save!"}')
+    hits = [(Path("lib/deck_screen.dart"), text, 1) for text in ("Save", "Save!")]
+    localizer.build_translations(hits, translate=False, stage=False)
+    assert localizer.text_keys == {"Save!": "deck.save", "Save": f"deck.save_{suffix('Save')}"}
@@ -0,0 +1,89 @@
+"""Dart-Lexer: Kommentare, String-Formen, Interpolation, Argument-Regeln und Scanner-Treffer"""
+
+from auto_localize_flutter import DartStringScanner, lex_dart_strings
+
+
+def values(content: str) -> list:
+    return [string.value for string in lex_dart_strings(content)]
+
+
+def texts(content: str) -> list:
+    return [hit[0] for hit in DartStringScanner().scan(content)[0]]
+
+
+def test_line_and_nested_block_comments_are_skipped():
+    assert values("// Text('no')\nText('yes');") == ["yes"]
+    assert values("/* a /* 'inner' */ 'still comment' */ Text('Hi');") == ["Hi"]
+    assert values("/* offen bis zum Ende 'x'") == []
+
+
+def test_raw_strings_keep_backslashes_and_dollars():
+    [string] = lex_dart_strings(r"Text(r'C:\new $path');")
+    assert string.value == r"C:\new $path"
+    assert not string.interpolated
+
+
+def test_triple_quoted_strings_span_lines_and_quotes():
+    assert values("Text('''It's\nfine''');") == ["It's\nfine"]
+    assert values('Text("""Say "hi"\n""");') == ['Say "hi"\n']
+
+
+def test_escapes_are_resolved_except_dollar():
+    assert values(r"Text('Don\'t \u00e9\u{1F600} \x41\n');") == ["Don't \u00e9\U0001F600 A\n"]
+    [string] = lex_dart_strings(r"Text('\$5 only');")
+    assert string.value == r"\$5 only"
+    assert not string.interpolated
+
+
+def test_interpolation_at_depth_hides_inner_strings():
+    content = "Text('a ${m({'k': [1, (2)]})} b'); Text('after');"
+    strings = lex_dart_strings(content)
+    assert [s.value for s in strings] == ["a ${m({'k': [1, (2)]})} b", "after"]
+    assert strings[0].interpolated and not strings[1].interpolated
+
+
+def test_stray_closer_inside_interpolation_does_not_end_it():
+    # Nur } auf Tiefe 0 schließt ${...}; ein überzähliges ) bleibt im Ausdruck
+    assert values("Text('${a)} rest'); Text('after');") == ["${a)} rest", "after"]
+
+
+def test_unterminated_single_line_string_is_dropped_at_newline():
+    assert values("Text('broken\nText('ok');") == ["ok"]
+
+
+def test_adjacent_literals_are_one_string():
+    [string] = lex_dart_strings("Text('Hello ' /* c */ 'world');")
+    assert string.value == "Hello world"
+    assert string.whole and string.call == "Text"
+
+
+def test_call_named_argument_and_enclosing_brackets():
+    content = "Column(children: [TextField(decoration: InputDecoration(hintText: 'Email'))])"
+    [string] = lex_dart_strings(content)
+    assert string.named == "hintText" and string.call is None
+    assert [content[pos] for pos in string.opens] == ["(", "[", "(", "("]
+    [string] = lex_dart_strings("Text(/* Titel */ 'Hi')")
+    assert string.call == "Text"
+
+
+def test_text_must_be_the_whole_argument():
+    assert texts("Text('Hi', style: s);") == ["Hi"]
+    assert texts("Text('Hi' + name);") == []
+    assert texts("Text('Hi'.toUpperCase());") == []
+    assert texts("print('Hi');") == []
+
+
+def test_interpolated_texts_need_visible_letters():
+    assert texts("Text('$count items'); Text('$name'); Text('${a.b}');") == ["$count items"]
+
+
+def test_tr_references_with_line_numbers():
+    hits, tr_refs = DartStringScanner().scan("a\nText('login.email'.tr());\ntr('app.title');\n'x $y'.tr();\nText('Hi');")
+    assert tr_refs == [("login.email", 2), ("app.title", 3)]
+    assert [(text, line) for text, line, *_ in hits] == [("Hi", 5)]
+
+
+def test_hit_offsets_cover_the_literal():
+    content = "Text(  'Hi'  );"
+    [(text, _, start, end, _)] = DartStringScanner().scan(content)[0]
+    assert content[start:end] == "'Hi'"
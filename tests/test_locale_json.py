@@ -0,0 +1,64 @@
+"""iter_locale_json: identisch zu json.dumps, verschachtelte Ausgabe, Konflikte und minify"""
+
+import json
+
+import pytest
+
+from auto_localize_flutter import iter_locale_json
+
+ENTRIES = {
+    "login.email": "Email",
+    "app.title": "Cardbase",
+    "login.password": "Passwort \"geheim\"",
+    "deck.name.hint": "Name des Decks",
+    "deck.delete": "Löschen ✓",
+    "app.loading": "Loading...\nbitte warten",
+}
+
+
+def render(translations, **options) -> str:
+    return ''.join(iter_locale_json(translations, **options))
+
+
+def nest(translations: dict) -> dict:
+    tree = {}
+    for key, text in translations.items():
+        *path, leaf = key.split('.')
+        node = tree
+        for name in path:
+            node = node.setdefault(name, {})
+        node[leaf] = text
+    return tree
+
+
+@pytest.mark.parametrize("translations", [{}, {"a": "b"}, ENTRIES])
+def test_flat_output_matches_json_dumps(translations):
+    expected = json.dumps(dict(sorted(translations.items())), ensure_ascii=False, indent=2)
+    assert render(translations) == expected
+
+
+@pytest.mark.parametrize("translations", [{}, ENTRIES])
+def test_nested_output_matches_json_dumps(translations):
+    expected = json.dumps(nest(translations), ensure_ascii=False, indent=2, sort_keys=True)
+    assert render(translations, nested=True) == expected
+
+
+def test_nested_groups_are_contiguous_despite_flat_sort_order():
+    # Flach sortiert liegt "deck.name-x" zwischen "deck.name" und "deck.name.hint"
+    translations = {"deck.name.hint": "Hint", "deck.name-x": "X", "deck.a": "A"}
+    assert json.loads(render(translations, nested=True)) == {"deck": {"a": "A", "name": {"hint": "Hint"}, "name-x": "X"}}
+
+
+def test_key_that_is_text_and_group_raises():
+    with pytest.raises(ValueError, match="'deck' ist Text und Gruppe"):
+        render({"deck": "Deck", "deck.name": "Name"}, nested=True)
+    # Flach ist das kein Konflikt
+    assert json.loads(render({"deck": "Deck", "deck.name": "Name"})) == {"deck": "Deck", "deck.name": "Name"}
+
+
+def test_minify():
+    assert render(ENTRIES, minify=True) == json.dumps(dict(sorted(ENTRIES.items())), ensure_ascii=False,
+                                                      separators=(',', ':'))
+    assert render(ENTRIES, nested=True, minify=True) == json.dumps(nest(ENTRIES), ensure_ascii=False,
+                                                                   separators=(',', ':'), sort_keys=True)
+    assert render({}, minify=True) == "{}"
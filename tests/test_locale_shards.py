@@ -0,0 +1,83 @@
+"""Locale-Shards: Kern/Shard-Aufteilung, Guards in build() und deren Erkennung"""
+
+from auto_localize_flutter import LOCALE_SHARDS_IMPORT, guard_build_methods, split_locale, unrequested_shard_keys
+
+SCREEN = """import 'package:flutter/material.dart';
+
+class DeckScreen extends StatelessWidget {
+  @override
+  Widget build(BuildContext ctx) {
+    return Text('deck.title'.tr());
+  }
+
+  Widget title(BuildContext context) => Text('deck.name'.tr());
+}
+
+class _CardImage extends StatelessWidget {
+  @override
+  Widget build(BuildContext context) {
+    return Image.network(url);
+  }
+}
+"""
+DECK_KEYS = ["deck.title", "deck.name"]
+DECK_GUARD = "  Widget build(BuildContext ctx) {\n" \
+             "    if (!localeShardsReady(ctx, const ['deck'])) return const SizedBox.shrink();\n"
+
+
+def test_split_keeps_core_prefixes_and_pinned_keys():
+    entries = {"general.ok": "OK", "deck.title": "Deck", "deck.name": "Name", "login.email": "Email"}
+    core, shards = split_locale(entries, pinned={"deck.name"})
+    assert core == {"general.ok": "OK", "deck.name": "Name"}
+    assert shards == {"deck": {"deck.title": "Deck"}, "login": {"login.email": "Email"}}
+
+
+def test_guard_is_inserted_only_into_classes_using_the_keys():
+    content, count = guard_build_methods(SCREEN, DECK_KEYS)
+    assert count == 1
+    assert DECK_GUARD in content
+    assert content.count("localeShardsReady") == 1
+    assert "  Widget build(BuildContext context) {\n    return Image.network(url);" in content
+    assert LOCALE_SHARDS_IMPORT in content
+    assert unrequested_shard_keys(content, DECK_KEYS) == set()
+
+
+def test_guard_is_extended_not_duplicated():
+    content, _ = guard_build_methods(SCREEN, DECK_KEYS)
+    content = content.replace("Text('deck.name'.tr())", "Text('deck.name'.tr() + 'login.email'.tr())")
+    again, count = guard_build_methods(content, ["login.email"])
+    assert count == 1
+    assert again.count("localeShardsReady") == 1
+    assert "const ['deck', 'login']" in again
+    assert guard_build_methods(again, DECK_KEYS)[0] == again
+
+
+def test_keys_outside_the_guarded_class_are_unrequested():
+    content, _ = guard_build_methods(SCREEN, DECK_KEYS)
+    # Gleicher Shard, aber in einer Klasse ohne Guard bzw. in einer Top-Level-Funktion
+    in_other_class = content.replace("Image.network(url)", "Text('deck.empty'.tr())")
+    assert unrequested_shard_keys(in_other_class, DECK_KEYS + ["deck.empty"]) == {"deck.empty"}
+    top_level = content + "\nString label() => 'deck.label'.tr();\n"
+    assert unrequested_shard_keys(top_level, ["deck.label", "deck.title"]) == {"deck.label"}
+    # Nicht (mehr) per .tr() genutzt, z.B. Literal nicht ersetzt; Kern-Keys zählen nie
+    assert unrequested_shard_keys(content, ["deck.missing", "general.ok"]) == {"deck.missing"}
+
+
+def test_key_used_in_guarded_and_unguarded_class_is_unrequested():
+    content, _ = guard_build_methods(SCREEN, DECK_KEYS)
+    content = content.replace("Image.network(url)", "Text('deck.title'.tr())")
+    assert unrequested_shard_keys(content, DECK_KEYS) == {"deck.title"}
+
+
+def test_part_files_and_classes_without_build_are_left_alone():
+    part = "part of 'deck.dart';\n\n" + SCREEN.split("\n", 1)[1]
+    assert guard_build_methods(part, DECK_KEYS) == (part, 0)
+    service = "class DeckService {\n  String label() => 'deck.title'.tr();\n}\n"
+    assert guard_build_methods(service, DECK_KEYS) == (service, 0)
+    assert unrequested_shard_keys(service, DECK_KEYS) == {"deck.title", "deck.name"}
+
+
+def test_locale_shards_widget_covers_the_file():
+    content = SCREEN.replace("Image.network(url)", "LocaleShards(shards: const ['deck', \"search\"], child: Deck())")
+    assert unrequested_shard_keys(content, DECK_KEYS) == set()
+    assert unrequested_shard_keys(SCREEN, DECK_KEYS) == set(DECK_KEYS)
@@ -0,0 +1,92 @@
+"""--rewrite: Literale -> 'key'.tr(), const-Bereinigung, Import, Idempotenz und Hash-Prüfung"""
+
+from pathlib import Path
+
+from auto_localize_flutter import EASY_LOCALIZATION_IMPORT, DartStringScanner, FlutterLocalizer, rewrite_dart_source
+
+KEYS = {"Hi": "general.hi", "Bye": "general.bye", "$n items": "general.items"}
+HEADER = "import 'package:flutter/material.dart';\n\n"
+
+
+def rewrite(content: str, keys=KEYS):
+    hits, _ = DartStringScanner().scan(content)
+    sites = {(start, end, opens): text for text, _, start, end, opens in hits}
+    return rewrite_dart_source(content, sites, keys)
+
+
+def body(content: str) -> str:
+    return content.split("\n\n", 1)[1]
+
+
+def test_const_constructor_is_dropped():
+    content, count = rewrite(HEADER + "final w = const Text('Hi');\n")
+    assert count == 1
+    assert body(content) == "final w = Text('general.hi'.tr());\n"
+
+
+def test_const_on_enclosing_constructor_and_list_is_dropped():
+    source = HEADER + "final w = const Padding(padding: p, child: Text('Hi'));\nfinal l = const [Text('Bye')];\n"
+    content, count = rewrite(source)
+    assert count == 2
+    assert body(content) == ("final w = Padding(padding: p, child: Text('general.hi'.tr()));\n"
+                             "final l = [Text('general.bye'.tr())];\n")
+
+
+def test_const_declaration_becomes_final():
+    content, _ = rewrite(HEADER + "class A {\n  static const title = Text('Hi');\n}\n")
+    assert "  static final title = Text('general.hi'.tr());\n" in content
+    assert "const" not in body(content)
+
+
+def test_other_const_stays():
+    content, _ = rewrite(HEADER + "final w = Column(children: [const Icon(Icons.add), Text('Hi')]);\n")
+    assert "const Icon(Icons.add), Text('general.hi'.tr())" in content
+
+
+def test_comments_and_interpolations_are_left_alone():
+    source = HEADER + "// Text('Hi')\n/* Text('Bye') */\nfinal a = Text('$n items');\nfinal b = Text('${f(Text('Hi'))}');\n"
+    assert rewrite(source) == (source, 0)
+
+
+def test_import_is_added_once():
+    content, count = rewrite(HEADER + "final a = Text('Hi');\nfinal b = Text('Bye');\n")
+    assert count == 2
+    assert content.count(EASY_LOCALIZATION_IMPORT) == 1
+    assert content.startswith(HEADER.rstrip("\n") + "\n" + EASY_LOCALIZATION_IMPORT + "\n")
+
+    already = HEADER + EASY_LOCALIZATION_IMPORT + "\nfinal a = Text('Hi');\n"
+    assert rewrite(already)[0].count(EASY_LOCALIZATION_IMPORT) == 1
+
+    part = "part of 'screen.dart';\n\nfinal a = Text('Hi');\n"
+    assert EASY_LOCALIZATION_IMPORT not in rewrite(part)[0]
+
+
+def test_unknown_texts_are_kept():
+    source = HEADER + "final a = Text('Unknown');\n"
+    assert rewrite(source) == (source, 0)
+
+
+def test_second_run_is_a_no_op():
+    once, _ = rewrite(HEADER + "final w = const Padding(child: Text('Hi'));\nconst t = Text('Bye');\n")
+    assert rewrite(once) == (once, 0)
+
+
+def make_project(root: Path) -> Path:
+    (root / "lib").mkdir()
+    (root / "pubspec.yaml").write_text("name: demo\n", encoding="utf-8")
+    for name, text in (("a", "Hello there"), ("b", "Goodbye now")):
+        (root / "lib" / f"{name}.dart").write_text(HEADER + f"final w = Text('{text}');\n", encoding="utf-8")
+    return root
+
+
+def test_file_changed_since_extraction_is_skipped(tmp_path):
+    root = make_project(tmp_path)
+    localizer = FlutterLocalizer(str(root), use_cache=False, use_memory=False, rewrite=True, split_locales=False)
+    localizer.build_translations(localizer.iter_strings(sites=True), translate=False)
+
+    changed = root / "lib" / "b.dart"
+    changed.write_text(changed.read_text(encoding="utf-8") + "// bearbeitet\n", encoding="utf-8")
+    localizer.rewrite_sources()
+
+    assert changed not in localizer.pending_writes
+    assert ".tr()" in localizer.read_file(root / "lib" / "a.dart")